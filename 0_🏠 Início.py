@@ -1,8 +1,8 @@
 import streamlit as st
 from backend.utils import render_footer
-from backend.services import gerar_nuvem_palavras
-import matplotlib.pyplot as plt
-import pandas as pd
+from backend.nuvem import gerar_png_nuvem_palavras
+from backend.dados import intervalo_datas
+from backend.repositorio import DB_PADRAO
 
 
 st.set_page_config(
@@ -23,25 +23,13 @@ Utilize o menu à esquerda para navegar entre as páginas:
 """)
 
 
-@st.cache_data(show_spinner=False)
-def carregar_intervalo_datas(caminho_csv: str):
-    try:
-        df = pd.read_csv(caminho_csv, usecols=["pub_date"], dtype=str)
-    except (FileNotFoundError, ValueError):
-        return None, None
-    datas = pd.to_datetime(df["pub_date"], errors="coerce", utc=True).dropna()
-    if datas.empty:
-        return None, None
-    return datas.min().date(), datas.max().date()
-
-
-
 #### Nuvem de palavras
-csv_path = "data/noticias/noticias.csv"
+db_path = DB_PADRAO
 stopwords_path = "data/keywords/stopwords.txt"  # Arquivo customizado de stopwords
 mask_path = None  # ou "data/imagens/sua_mascara.png"
 
-data_inicial, data_final = carregar_intervalo_datas(csv_path)
+# Recalculado pela camada de dados só quando a base muda
+data_inicial, data_final = intervalo_datas(db_path)
 
 if not data_inicial or not data_final:
     st.info("Nenhuma noticia encontrada para definir o periodo da nuvem.")
@@ -69,20 +57,18 @@ else:
         st.error("A data inicial nao pode ser posterior a data final.")
     else:
         try:
-            wordcloud = gerar_nuvem_palavras(
-                csv_path,
+            # PNG pronto do cache de nuvens; só é renderizado quando o período ou a base mudam
+            png = gerar_png_nuvem_palavras(
+                db_path,
                 stopwords_path,
                 mask_path,
                 start_date=data_inicio,
                 end_date=data_fim
             )
 
-            fig, ax = plt.subplots(figsize=(8.5, 4.25))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
             col_esquerda, col_centro, col_direita = st.columns([0.075, 0.85, 0.075])
             with col_centro:
-                st.pyplot(fig, use_container_width=True)
+                st.image(png, use_container_width=True)
         except ValueError as e:
             st.warning(str(e))
         except Exception as e:
@@ -0,0 +1,188 @@
+# agendador.py
+"""
+Agendador da rotina de atualização em modo contínuo (daemon).
+
+Cada feed é consultado no seu próprio intervalo, ajustado à taxa de chegada de
+itens novos observada no feed: a taxa (itens por segundo) é suavizada por uma
+média móvel exponencial e o intervalo é escolhido para que cada consulta
+encontre por volta de ITENS_POR_BUSCA itens novos, entre INTERVALO_MINIMO e
+INTERVALO_MAXIMO. Feeds movimentados (G1) são consultados a cada poucos
+minutos; feeds quietos, algumas vezes por dia.
+
+A classificação roda em uma thread separada, que esvazia a fila de pendentes da
+base sempre que a coleta insere notícias novas (ou periodicamente).
+
+SIGINT/SIGTERM encerram o daemon ao fim da operação em andamento (a rodada de
+classificação para entre uma chamada à API e outra). O estado de
+cada feed (intervalo, próxima consulta, taxa e itens já vistos) é gravado em
+JSON após cada consulta, e o agendamento continua de onde parou ao reiniciar.
+
+O agendador não conhece RSS nem a API: recebe as funções de coleta e de
+classificação (ver backend/atualiza_noticias.py, opção --daemon).
+"""
+import os
+import json
+import time
+import signal
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from backend.cache_feeds import escrita_atomica
+
+ESTADO_PADRAO = os.path.join('data', 'cache', 'agendador.json')
+
+INTERVALO_INICIAL = 10 * 60
+INTERVALO_MINIMO = 2 * 60
+INTERVALO_MAXIMO = 4 * 60 * 60
+# Itens novos esperados por consulta (os feeds trazem de 20 a 50 itens, então
+# nenhum item sai do feed antes de ser visto)
+ITENS_POR_BUSCA = 5
+# Peso da observação mais recente na média móvel exponencial da taxa
+ALFA = 0.3
+# Sem itens novos, o intervalo cresce por este fator
+FATOR_CRESCIMENTO = 1.5
+# Intervalo máximo entre duas rodadas de classificação sem notícias novas
+INTERVALO_CLASSIFICACAO = 10 * 60
+# Quantos identificadores de itens guardar por feed
+MAX_VISTOS = 500
+
+
+@dataclass
+class EstadoFeed:
+    feed_url: str
+    intervalo: float = INTERVALO_INICIAL
+    proxima: float = 0.0
+    ultima: Optional[float] = None
+    taxa: Optional[float] = None
+    vistos: List[str] = field(default_factory=list)
+
+
+def ajustar_intervalo(estado: EstadoFeed, novos: int, agora: float) -> None:
+    """
+    Atualiza a taxa de chegada (EWMA) e o intervalo do feed após uma consulta com `novos` itens novos.
+    """
+    if estado.ultima is not None and agora > estado.ultima:
+        taxa_observada = novos / (agora - estado.ultima)
+        estado.taxa = taxa_observada if estado.taxa is None else ALFA * taxa_observada + (1 - ALFA) * estado.taxa
+        if estado.taxa > 0:
+            estado.intervalo = ITENS_POR_BUSCA / estado.taxa
+        else:
+            estado.intervalo *= FATOR_CRESCIMENTO
+        estado.intervalo = min(INTERVALO_MAXIMO, max(INTERVALO_MINIMO, estado.intervalo))
+    estado.ultima = agora
+    estado.proxima = agora + estado.intervalo
+
+
+class AgendadorFeeds:
+    """
+    Laço principal do daemon.
+
+    Args:
+        feed_urls: Feeds a acompanhar.
+        coletar: Recebe as URLs devidas e retorna, por URL, o conjunto de
+            identificadores dos itens presentes no feed (ou None em caso de erro),
+            além do total de notícias inseridas na base.
+        classificar: Classifica uma rodada de pendentes e retorna quantas foram classificadas.
+            Recebe o evento de encerramento, para interromper a rodada entre uma
+            chamada à API e outra.
+        caminho_estado: Arquivo JSON com o estado do agendamento.
+    """
+
+    def __init__(
+        self,
+        feed_urls: List[str],
+        coletar: Callable[[List[str]], Tuple[Dict[str, Optional[Set[str]]], int]],
+        classificar: Callable[[threading.Event], int],
+        caminho_estado: str = ESTADO_PADRAO
+    ):
+        self.coletar = coletar
+        self.classificar = classificar
+        self.caminho_estado = caminho_estado
+        self.parar = threading.Event()
+        self._novas_noticias = threading.Event()
+        anteriores = self._carregar_estado()
+        self.estados = {url: anteriores.get(url) or EstadoFeed(url) for url in feed_urls}
+
+    ##### Estado #####
+    def _carregar_estado(self) -> Dict[str, EstadoFeed]:
+        try:
+            with open(self.caminho_estado, 'r', encoding='utf-8') as f:
+                return {url: EstadoFeed(**dados) for url, dados in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def salvar_estado(self) -> None:
+        os.makedirs(os.path.dirname(self.caminho_estado) or '.', exist_ok=True)
+        dados = {url: asdict(estado) for url, estado in self.estados.items()}
+        escrita_atomica(self.caminho_estado, json.dumps(dados, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    ##### Coleta #####
+    def executar_rodada(self, agora: Optional[float] = None) -> List[str]:
+        """
+        Consulta os feeds cuja próxima consulta já venceu e reagenda cada um. Retorna as URLs consultadas.
+        """
+        agora = time.time() if agora is None else agora
+        devidos = [url for url, estado in self.estados.items() if estado.proxima <= agora]
+        if not devidos:
+            return []
+        try:
+            itens_por_feed, inseridas = self.coletar(devidos)
+        except Exception as e:
+            print("Erro na rodada de coleta:", e)
+            itens_por_feed, inseridas = {}, 0
+        agora = time.time()
+        for url in devidos:
+            estado = self.estados[url]
+            itens = itens_por_feed.get(url)
+            if itens is None:
+                # Erro na consulta: tenta de novo no intervalo atual, sem alterar a taxa
+                estado.proxima = agora + estado.intervalo
+                continue
+            novos = len(itens - set(estado.vistos))
+            ajustar_intervalo(estado, novos, agora)
+            estado.vistos = sorted(itens)[:MAX_VISTOS]
+            print(
+                f"{url}: {novos} itens novos; próxima consulta em {estado.intervalo / 60:.1f} min."
+            )
+        self.salvar_estado()
+        if inseridas:
+            self._novas_noticias.set()
+        return devidos
+
+    def _laco_classificacao(self) -> None:
+        while not self.parar.is_set():
+            self._novas_noticias.clear()
+            try:
+                classificadas = self.classificar(self.parar)
+            except Exception as e:
+                print("Erro na rodada de classificação:", e)
+                classificadas = 0
+            if classificadas == 0:
+                # Nada pendente (ou só falhas): espera notícias novas, o intervalo ou o encerramento
+                self._novas_noticias.wait(INTERVALO_CLASSIFICACAO)
+
+    def _encerrar(self, signum, frame) -> None:
+        print(f"Sinal {signum} recebido; encerrando após a operação em andamento...")
+        self.parar.set()
+        self._novas_noticias.set()
+
+    def executar(self) -> None:
+        """
+        Executa até receber SIGINT/SIGTERM.
+        """
+        signal.signal(signal.SIGINT, self._encerrar)
+        signal.signal(signal.SIGTERM, self._encerrar)
+        classificador = threading.Thread(target=self._laco_classificacao, name="classificacao")
+        classificador.start()
+        try:
+            while not self.parar.is_set():
+                self.executar_rodada()
+                proxima = min(estado.proxima for estado in self.estados.values())
+                self.parar.wait(max(1.0, proxima - time.time()))
+        finally:
+            self.parar.set()
+            self._novas_noticias.set()
+            classificador.join()
+            self.salvar_estado()
+            print("Agendador encerrado; estado salvo em", self.caminho_estado)
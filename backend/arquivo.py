@@ -0,0 +1,191 @@
+# arquivo.py
+"""
+Arquivo colunar (Parquet) das notícias antigas, particionado por mês de publicação.
+
+A base SQLite (backend/repositorio.py) fica só com a partição "quente": os meses
+recentes e as notícias ainda pendentes de classificação. A compactação
+(RepositorioNoticias.compactar) move as notícias já classificadas dos meses
+anteriores para um arquivo por mês (UTC):
+
+    data/noticias/noticias_arquivo/mes=2025-03/noticias.parquet
+
+Cada arquivo é gravado ordenado por 'pub_ts' e comprimido (zstd), com os textos
+repetidos (feed, keywords, respostas) em dicionário. As leituras por período:
+  - descartam os meses fora do período só pelo nome do diretório (sem abrir os arquivos);
+  - leem só as colunas pedidas e usam as estatísticas de 'pub_ts' de cada grupo
+    de linhas para pular o que está fora do intervalo.
+Contagens e limites de datas vêm dos metadados (rodapé) dos arquivos.
+Cada notícia arquivada tem um 'arquivo_id', que é o identificador dela no índice
+de texto das notícias arquivadas mantido na base (ver RepositorioNoticias.buscar).
+
+O pyarrow só é importado quando o arquivo é efetivamente lido ou gravado.
+"""
+import os
+import re
+from datetime import date, datetime, time as dtime, timezone
+from typing import TYPE_CHECKING, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NOME_ARQUIVO = 'noticias.parquet'
+# Chave de deduplicação das notícias (a mesma da base SQLite)
+CHAVE = ['feed_url', 'pub_date', 'title']
+# Colunas inteiras (as demais são texto)
+COLUNAS_INTEIRAS = {'pub_ts', 'arquivo_id'}
+
+_DIRETORIO_MES = re.compile(r'^mes=(\d{4})-(\d{2})$')
+
+
+def mes_de(pub_ts: int) -> str:
+    """
+    Partição (mês UTC, "AAAA-MM") de um timestamp.
+    """
+    return datetime.fromtimestamp(pub_ts, tz=timezone.utc).strftime('%Y-%m')
+
+
+def limites_mes(mes: str) -> Tuple[int, int]:
+    """
+    Timestamps do início do mês e do início do mês seguinte.
+    """
+    ano, numero = int(mes[:4]), int(mes[5:])
+    seguinte = date(ano + numero // 12, numero % 12 + 1, 1)
+    inicio = datetime.combine(date(ano, numero, 1), dtime.min, tzinfo=timezone.utc)
+    fim = datetime.combine(seguinte, dtime.min, tzinfo=timezone.utc)
+    return int(inicio.timestamp()), int(fim.timestamp())
+
+
+class ArquivoNoticias:
+    """
+    Partições mensais em Parquet de um diretório. `colunas` são as colunas
+    gravadas: as de COLUNAS_INTEIRAS como inteiro de 64 bits, as demais como texto.
+    """
+
+    def __init__(self, diretorio: str, colunas: List[str]):
+        self.diretorio = diretorio
+        self.colunas = colunas
+
+    def _caminho(self, mes: str) -> str:
+        return os.path.join(self.diretorio, f"mes={mes}", NOME_ARQUIVO)
+
+    def _schema(self):
+        import pyarrow as pa
+        return pa.schema([(c, pa.int64() if c in COLUNAS_INTEIRAS else pa.string()) for c in self.colunas])
+
+    def meses(self, inicio_ts: Optional[int] = None, fim_ts: Optional[int] = None) -> List[str]:
+        """
+        Meses arquivados (em ordem) que têm alguma parte em [inicio_ts, fim_ts).
+        Só lista o diretório: nenhum arquivo é aberto.
+        """
+        try:
+            nomes = os.listdir(self.diretorio)
+        except OSError:
+            return []
+        meses = []
+        for nome in sorted(nomes):
+            encontrado = _DIRETORIO_MES.match(nome)
+            if not encontrado or not os.path.exists(os.path.join(self.diretorio, nome, NOME_ARQUIVO)):
+                continue
+            mes = f"{encontrado.group(1)}-{encontrado.group(2)}"
+            comeco, termino = limites_mes(mes)
+            if (inicio_ts is None or termino > inicio_ts) and (fim_ts is None or comeco < fim_ts):
+                meses.append(mes)
+        return meses
+
+    def ler(
+        self,
+        inicio_ts: Optional[int] = None,
+        fim_ts: Optional[int] = None,
+        colunas: Optional[List[str]] = None,
+        apenas_inflacao: bool = False,
+        arquivo_ids: Optional[Iterable[int]] = None
+    ) -> "pd.DataFrame":
+        """
+        Notícias arquivadas com 'pub_ts' em [inicio_ts, fim_ts), só com as `colunas`
+        pedidas (padrão: todas), lendo apenas os meses do período. Com `arquivo_ids`,
+        só as notícias com esses identificadores (resultados da busca de texto).
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        colunas = colunas or self.colunas
+        filtros = []
+        if inicio_ts is not None:
+            filtros.append(('pub_ts', '>=', inicio_ts))
+        if fim_ts is not None:
+            filtros.append(('pub_ts', '<', fim_ts))
+        if apenas_inflacao:
+            filtros.append(('aborda_inflacao', '=', 'Sim'))
+        if arquivo_ids is not None:
+            filtros.append(('arquivo_id', 'in', list(arquivo_ids)))
+        tabelas = [
+            pq.read_table(self._caminho(mes), columns=colunas, filters=filtros or None)
+            for mes in self.meses(inicio_ts, fim_ts)
+        ]
+        if not tabelas:
+            return pd.DataFrame({c: pd.Series(dtype='int64' if c in COLUNAS_INTEIRAS else 'object') for c in colunas})
+        return pa.concat_tables(tabelas).to_pandas()
+
+    def acrescentar(self, mes: str, df: "pd.DataFrame") -> int:
+        """
+        Junta as notícias de `df` à partição do mês (criando-a se preciso); se uma
+        notícia já estiver arquivada, fica a versão de `df`. A partição é regravada
+        de forma atômica. Retorna o número de notícias do mês.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        caminho = self._caminho(mes)
+        if os.path.exists(caminho):
+            df = pd.concat([pq.read_table(caminho).to_pandas(), df[self.colunas]], ignore_index=True)
+        df = df.drop_duplicates(subset=CHAVE, keep='last').sort_values('pub_ts', kind='stable')
+        tabela = pa.Table.from_pandas(df[self.colunas], schema=self._schema(), preserve_index=False)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = caminho + '.gravando'
+        pq.write_table(tabela, temporario, compression='zstd')
+        os.replace(temporario, caminho)
+        return tabela.num_rows
+
+    def chaves(self, meses: Iterable[str]) -> Set[Tuple[str, str, str]]:
+        """
+        Chaves (feed_url, pub_date, title) das notícias arquivadas nos meses indicados.
+        """
+        import pyarrow.parquet as pq
+
+        chaves: Set[Tuple[str, str, str]] = set()
+        arquivados = set(self.meses())
+        for mes in set(meses) & arquivados:
+            tabela = pq.read_table(self._caminho(mes), columns=CHAVE).to_pydict()
+            chaves.update(zip(*(tabela[c] for c in CHAVE)))
+        return chaves
+
+    def contar(self) -> int:
+        """
+        Número de notícias arquivadas (lido dos metadados dos arquivos).
+        """
+        import pyarrow.parquet as pq
+        return sum(pq.ParquetFile(self._caminho(mes)).metadata.num_rows for mes in self.meses())
+
+    def limites(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Menor e maior 'pub_ts' arquivados, pelas estatísticas dos grupos de linhas
+        do primeiro e do último mês; (None, None) se o arquivo estiver vazio.
+        """
+        import pyarrow.parquet as pq
+
+        meses = self.meses()
+        if not meses:
+            return None, None
+        valores = []
+        for mes in dict.fromkeys((meses[0], meses[-1])):
+            metadados = pq.ParquetFile(self._caminho(mes)).metadata
+            indice = metadados.schema.to_arrow_schema().get_field_index('pub_ts')
+            for grupo in range(metadados.num_row_groups):
+                estatisticas = metadados.row_group(grupo).column(indice).statistics
+                if estatisticas is not None and estatisticas.has_min_max:
+                    valores += [estatisticas.min, estatisticas.max]
+        if not valores:
+            return None, None
+        return min(valores), max(valores)
@@ -3,110 +3,85 @@
 
 """
 Arquivo: atualiza_noticias.py
-Descrição: Coleta novas notícias a partir de feeds RSS, atualiza o arquivo CSV com as notícias encontradas
-           (evitando duplicatas) e, em seguida, classifica as notícias que ainda não foram avaliadas pela IA.
+Descrição: Coleta novas notícias a partir de feeds RSS, atualiza a base de notícias (SQLite) com as notícias
+           encontradas (evitando duplicatas) e, em seguida, classifica as notícias que ainda não foram avaliadas pela IA.
 """
 
 ##### IMPORTS GERAIS #####
 import os
-import re
-import time
-import requests
-import xml.etree.ElementTree as ET
-import pandas as pd
+import sys
+import argparse
+import threading
 from datetime import datetime
 
+# Permite executar o script diretamente (python backend/atualiza_noticias.py),
+# tornando o pacote 'backend' importável a partir da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 ##### CONFIGURAÇÃO DA API OPENAI #####
 from dotenv import load_dotenv
-import openai
 
 # Carrega as variáveis definidas em .env
 load_dotenv()
 
-# Obtém a chave da API da OpenAI
-api_key = os.getenv("OPENAI_API_KEY")
-if api_key is None:
-    raise ValueError("A chave da API da OpenAI não foi encontrada. Verifique seu arquivo .env.")
+# O cliente da OpenAI é criado no primeiro uso (importar o módulo não exige a chave)
+_client = None
+_client_lock = threading.Lock()
+
 
-# Inicializa o cliente da OpenAI
-client = openai.OpenAI(api_key=api_key)
+def obter_client():
+    """
+    Retorna o cliente da OpenAI, criando-o na primeira chamada.
+    Novas tentativas ficam a cargo de backend/classificacao.py.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Obtém a chave da API da OpenAI
+            api_key = os.getenv("OPENAI_API_KEY")
+            if api_key is None:
+                raise ValueError("A chave da API da OpenAI não foi encontrada. Verifique seu arquivo .env.")
+            import openai
+            _client = openai.OpenAI(api_key=api_key, max_retries=0)
+        return _client
 
-import re
-import requests
-import xml.etree.ElementTree as ET
-from dateutil import parser  # Biblioteca que facilita o parse de datas em formatos variados
+from backend import classificacao, metricas
+from backend.agendador import ESTADO_PADRAO, AgendadorFeeds
+from backend.cache_feeds import CacheFeeds
+from backend.classificacao import MAX_WORKERS_PADRAO as MAX_WORKERS_CLASSIFICACAO, classificar_em_paralelo
+from backend.palavras_chave import CSV_PADRAO, ler_taxonomia, obter_registro
+from backend.pipeline import encadear, etapas_busca, reunir
+from backend.prefiltro import obter_prefiltro
+from backend.repositorio import ORIGEM_PREFILTRO, PERGUNTAS, RepositorioNoticias
+from backend.rss import MAX_WORKERS_PADRAO
 
-def search_keywords_in_rss(feed_urls, keywords):
+##### FUNÇÃO: Buscar keywords nos feeds RSS #####
+def search_keywords_in_rss(feed_urls, keywords, max_workers=MAX_WORKERS_PADRAO,
+                           usar_cache=True, ignorar_nao_modificados=True, dobrar_acentos=False):
     """
     Busca notícias nos feeds RSS que contenham as palavras-chave especificadas.
+    Os feeds são baixados em paralelo e processados à medida que chegam (ver backend/pipeline.py).
     
     Parâmetros:
       feed_urls (list): Lista de URLs de feeds RSS.
-      keywords (list): Lista de palavras-chave a serem procuradas.
+      keywords (RegistroPalavrasChave ou list): Registro de keywords (backend/palavras_chave.py)
+                                                ou lista de palavras-chave a serem procuradas.
+      max_workers (int): Número máximo de feeds baixados simultaneamente (1 = sequencial).
+      usar_cache (bool): Usa requisições condicionais (ETag / Last-Modified) com cache em disco.
+      ignorar_nao_modificados (bool): Pula parse e busca de keywords dos feeds que responderam 304,
+                                      pois seus itens já foram processados na execução anterior.
+      dobrar_acentos (bool): Ignora acentos na comparação ("inflacao" casa com "inflação").
       
     Retorna:
       matches (list): Lista de dicionários contendo os dados dos artigos encontrados,
-                      com 'pub_date' em formato padronizado (ISO 8601).
+                      com 'pub_date' em formato padronizado (ISO 8601), na ordem de feed_urls.
+                      'matched_keyword' traz a primeira keyword encontrada e
+                      'matched_keywords' todas elas, separadas por "; ";
+                      'matched_level' e 'matched_levels' trazem o nível da taxonomia de cada uma.
     """
-    matches = []
-    headers = {'User-Agent': 'Mozilla/5.0 (compatible; RSSBot/1.0)'}
-
-    # Pré-compila expressões regulares para cada keyword
-    keyword_patterns = {
-        keyword: re.compile(rf'\b{re.escape(keyword.lower())}\b', re.IGNORECASE)
-        for keyword in keywords
-    }
-
-    for url in feed_urls:
-        print(f"Analisando feed: {url}")
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                try:
-                    root = ET.fromstring(response.content)
-                except ET.ParseError as e:
-                    print(f"Erro de parse XML no feed {url}: {e}")
-                    continue
-
-                items = root.findall('.//item')
-                print(f"Foram encontrados {len(items)} itens no feed.")
-
-                for item in items:
-                    title = item.find('title').text if item.find('title') is not None else ""
-                    description = item.find('description').text if item.find('description') is not None else ""
-                    link = item.find('link').text if item.find('link') is not None else ""
-                    raw_pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ""
-
-                    # Tenta converter a data para formato ISO-8601
-                    if raw_pub_date:
-                        try:
-                            dt_parsed = parser.parse(raw_pub_date)
-                            pub_date = dt_parsed.isoformat()  # Ex: "2025-03-31T16:30:00-03:00"
-                        except (ValueError, TypeError):
-                            # Se não conseguir fazer o parse, mantemos o texto original
-                            pub_date = raw_pub_date
-                    else:
-                        pub_date = ""
-
-                    # Checagem de keywords
-                    content = f"{title} {description}".lower()
-                    for keyword, pattern in keyword_patterns.items():
-                        if pattern.search(content):
-                            matches.append({
-                                'title': title,
-                                'description': description,
-                                'link': link,
-                                'pub_date': pub_date,      # <-- já padronizado
-                                'feed_url': url,
-                                'matched_keyword': keyword
-                            })
-                            break  # evita duplicação
-            else:
-                print(f"Falha ao acessar feed: {url}, status: {response.status_code}")
-        except requests.RequestException as e:
-            print(f"Erro ao tentar acessar {url}: {e}")
-
-    return matches
+    etapas = etapas_busca(feed_urls, keywords, max_workers, CacheFeeds() if usar_cache else None,
+                          ignorar_nao_modificados, dobrar_acentos)
+    return reunir(encadear(*etapas), feed_urls)[0]
 
 
 ##### FUNÇÃO: Carregar keywords adicionais a partir de um CSV #####
@@ -115,175 +90,187 @@ def load_keywords_from_csv(csv_filepath):
     Carrega e retorna uma lista de keywords adicionais a partir de um CSV.
     O CSV deve conter as colunas: categoria_grupo, categoria_subgrupo, categoria_item, categoria_subitem.
     """
-    df = pd.read_csv(csv_filepath)
-    # Remove duplicatas e valores ausentes
-    keywords_adicionais = pd.unique(df[['categoria_grupo', 'categoria_subgrupo', 'categoria_item', 'categoria_subitem']].values.ravel())
-    keywords_adicionais = [str(keyword).strip() for keyword in keywords_adicionais if pd.notna(keyword)]
-    return keywords_adicionais
-
-##### FUNÇÃO: Atualizar CSV com novas notícias #####
-def update_noticias_csv(resultados):
+    # Sem duplicatas nem valores ausentes, na ordem do arquivo
+    return list(ler_taxonomia(csv_filepath))
+
+##### FUNÇÃO: Atualizar base com novas notícias #####
+def update_noticias_csv(resultados, repositorio=None):
     """
-    Atualiza o arquivo CSV com novas notícias a partir da lista 'resultados', evitando duplicatas
-    e adicionando colunas para a classificação.
-    A chave de verificação é composta por (feed_url, pub_date, title).
+    Insere na base de notícias (data/noticias/noticias.db) as notícias da lista 'resultados'
+    que ainda não estão cadastradas, com as colunas de classificação vazias.
+    A chave de verificação é composta por (feed_url, pub_date, title) e tem índice único,
+    então a inserção é incremental: o histórico não é relido nem regravado.
+
+    Retorna o número de notícias adicionadas.
     """
-    # Define o caminho relativo do arquivo CSV
-    csv_filepath = os.path.join('data', 'noticias', 'noticias.csv')
-    # Garante que a pasta exista
-    os.makedirs(os.path.dirname(csv_filepath), exist_ok=True)
-    
-    # Colunas de classificação a serem incorporadas
-    classification_columns = [
-        "1. O artigo aborda o tema da inflação?",
-        "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?",
-        "3. O artigo aborda especificamente a inflação de alimentos?",
-        "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?"
-    ]
-    
-    # Carrega ou cria o DataFrame
-    if os.path.exists(csv_filepath):
-        df = pd.read_csv(csv_filepath)
-    else:
-        df = pd.DataFrame(columns=['title', 'description', 'link', 'pub_date', 'feed_url', 'matched_keyword'] + classification_columns)
-    
-    # Garante que as colunas de classificação existam
-    for col in classification_columns:
-        if col not in df.columns:
-            df[col] = ""
-    
-    # Cria um conjunto com a chave composta das notícias já existentes
-    existing_keys = set(df.apply(lambda row: (row['feed_url'], row['pub_date'], row['title']), axis=1))
-    new_entries = []
-    
-    for noticia in resultados:
-        composite_key = (noticia['feed_url'], noticia['pub_date'], noticia['title'])
-        if composite_key not in existing_keys:
-            # Inicializa as colunas de classificação com valor vazio
-            for col in classification_columns:
-                noticia[col] = ""
-            new_entries.append(noticia)
-            existing_keys.add(composite_key)
-        else:
-            print(f"Notícia já cadastrada: {noticia['title']}")
-    
-    if new_entries:
-        df_new = pd.DataFrame(new_entries)
-        df = pd.concat([df, df_new], ignore_index=True)
-        df.to_csv(csv_filepath, index=False)
-        print(f"{len(new_entries)} novas notícias adicionadas.")
+    repositorio = repositorio or RepositorioNoticias()
+    inseridas = repositorio.inserir(resultados)
+    metricas.somar(noticias_inseridas=inseridas, noticias_ja_cadastradas=len(resultados) - inseridas)
+
+    if inseridas:
+        print(f"{inseridas} novas notícias adicionadas.")
     else:
         print("Nenhuma nova notícia foi encontrada para adicionar.")
-    
-    return df
+    if len(resultados) > inseridas:
+        print(f"{len(resultados) - inseridas} notícias já estavam cadastradas.")
+
+    return inseridas
 
 ##### FUNÇÃO: Classificar artigo via API da OpenAI #####
 def classificar_artigo(artigo):
     """
     Recebe um dicionário com os dados do artigo, invoca a API da OpenAI para classificação e retorna o artigo atualizado.
+    Consulta antes o cache de classificações (compartilhado com o app), evitando chamadas repetidas.
     """
-    system_message = (
-        "Como economista especializado em inflação de alimentos, sua tarefa é analisar artigos de jornais e classificar "
-        "conforme as seguintes perguntas:\n"
-        "1. O artigo aborda o tema da inflação? (Responda com 'Sim' ou 'Não')\n"
-           "- Se 'Sim':\n"
-           "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral? "
-           "(Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
-        "3. O artigo aborda especificamente a inflação de alimentos? (Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
-           "- Se 'Sim':\n"
-           "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor? "
-           "(Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
-        "Por favor, utilize apenas as palavras 'Sim', 'Não' ou 'Não se aplica' para responder a cada pergunta. "
-        "Não é necessário justificar as respostas.\n"
-        "Em caso de informações insuficientes, responda 'Não'.\n"
-        "Retorne a resposta com cada linha correspondendo a uma pergunta."
-    )
-    
-    user_message = f"Classifique:\nTítulo: {artigo['title']}\n"
-    
+    return classificacao.classificar_artigo(artigo, obter_client())
+
+##### FUNÇÃO: Classificar vários artigos em uma chamada #####
+def classificar_artigos(artigos):
+    """
+    Classifica uma lista de artigos com o mínimo de chamadas à API (resposta em JSON).
+    Retorna uma lista alinhada com 'artigos', com {} nos artigos que não puderam ser classificados.
+    """
+    if len(artigos) == 1:
+        return [classificar_artigo(artigos[0])]
+    return classificacao.classificar_lote(artigos, obter_client())
+
+##### FUNÇÃO: Processar classificação de artigos pendentes #####
+def processar_classificacao_csv(repositorio=None, tamanho_lote=10, limite=None, max_workers=MAX_WORKERS_CLASSIFICACAO,
+                                em_lote=True, usar_prefiltro=True, parar=None):
+    """
+    Classifica via API as notícias pendentes da base (coluna "1. O artigo aborda o tema da inflação?"
+    vazia) e grava os resultados em lotes.
+
+    Com `em_lote`, vários títulos são enviados em cada chamada com resposta em JSON
+    (classificacao.classificar_lote), reduzindo o número de requisições e a repetição do prompt.
+    As chamadas são feitas em paralelo (até `max_workers` simultâneas), dentro dos limites de
+    requisições e tokens por minuto do limitador compartilhado (backend/classificacao.py).
+    Os resultados são gravados à medida que ficam prontos: cada lote de `tamanho_lote` artigos
+    vai para a base em uma única transação, então uma interrupção perde no máximo o lote em
+    andamento. A execução seguinte retoma exatamente dos artigos que continuam pendentes, lidos
+    pelo índice parcial de pendentes, sem percorrer o histórico já classificado.
+
+    Com `usar_prefiltro` e um modelo treinado (backend/prefiltro.py), cada página de pendentes
+    passa antes pelo pré-filtro local: as notícias claramente fora do tema recebem "Não" na
+    pergunta 1 sem chamada à API, e só as incertas são enviadas.
+
+    Parâmetros:
+      repositorio (RepositorioNoticias): Base de notícias (padrão: data/noticias/noticias.db).
+      tamanho_lote (int): Número de artigos classificados por gravação.
+      limite (int): Número máximo de artigos a classificar nesta execução (opcional).
+      max_workers (int): Número máximo de chamadas simultâneas à API.
+      em_lote (bool): Agrupa vários artigos por chamada à API.
+      usar_prefiltro (bool): Descarta localmente as notícias claramente fora do tema.
+      parar (threading.Event): Se sinalizado, encerra entre uma chamada à API e outra,
+                               gravando o que já foi classificado (opcional; modo contínuo).
+
+    Retorna:
+      O número de artigos classificados nesta execução.
+    """
+    repositorio = repositorio or RepositorioNoticias()
+    print(f"{repositorio.contar_pendentes()} artigos aguardando classificação.")
+    prefiltro = obter_prefiltro() if usar_prefiltro else None
+
+    # Páginas maiores que o número de threads (e de lotes) mantêm todas ocupadas
+    itens_por_chamada = classificacao.MAX_ITENS_LOTE if em_lote else 1
+    tamanho_pagina = max(tamanho_lote, max_workers * itens_por_chamada * 2)
+    lote = []
+    classificados = 0
+    descartados = 0
+    ultimo_id = 0
     try:
-        resposta = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0
-        )
-    except Exception as e:
-        print("Erro ao chamar a API:", e)
-        return {}
-    
-    conteudo = resposta.choices[0].message.content
-    
-    # Mapeia as perguntas para as chaves desejadas
-    perguntas = {
-        "1. O artigo aborda o tema da inflação?": None,
-        "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?": None,
-        "3. O artigo aborda especificamente a inflação de alimentos?": None,
-        "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?": None
-    }
-    
-    for i, linha in enumerate(conteudo.strip().splitlines(), start=1):
-        resposta_linha = linha.split('. ', 1)[-1].strip()
-        chave_pergunta = list(perguntas.keys())[i - 1]
-        perguntas[chave_pergunta] = resposta_linha
-    
-    artigo.update(perguntas)
-    return artigo
+        while (limite is None or classificados < limite) and not (parar and parar.is_set()):
+            # Busca os pendentes página a página; artigos cuja chamada falhou ficam para a próxima execução
+            pagina = repositorio.pendentes(limite=tamanho_pagina, apos_id=ultimo_id)
+            if not pagina:
+                break
+            if limite is not None:
+                pagina = pagina[:limite - classificados]
+            ultimo_id = pagina[-1]['id']
+
+            if prefiltro is not None:
+                # Pré-filtro em lote: as notícias descartadas são gravadas sem chamada à API
+                fora_do_tema, pagina = prefiltro.filtrar(pagina)
+                repositorio.salvar_classificacoes(
+                    [(artigo['id'], artigo) for artigo in fora_do_tema], origem=ORIGEM_PREFILTRO
+                )
+                descartados += len(fora_do_tema)
+                classificados += len(fora_do_tema)
+                metricas.somar(prefiltro_descartados=len(fora_do_tema))
 
-##### FUNÇÃO: Processar classificação de artigos no CSV #####
-def processar_classificacao_csv():
+            chamadas = classificacao.montar_lotes(pagina) if em_lote else [[artigo] for artigo in pagina]
+            for indice, resultados in classificar_em_paralelo(chamadas, classificar_artigos, max_workers):
+                if parar and parar.is_set():
+                    # Encerramento: as chamadas ainda não iniciadas são canceladas
+                    break
+                for artigo, artigo_classificado in zip(chamadas[indice], resultados):
+                    if not artigo_classificado:
+                        # Falha na API: o artigo continua pendente
+                        continue
+
+                    lote.append((artigo['id'], artigo_classificado))
+                    classificados += 1
+                    metricas.somar(artigos_classificados_api=1)
+
+                    # Imprime o resultado da classificação para o artigo atual
+                    print(f"Artigo '{artigo['title']}' classificado como:")
+                    for col in PERGUNTAS:
+                        print(f"  {col}: {artigo_classificado.get(col, '')}")
+
+                    if len(lote) >= tamanho_lote:
+                        repositorio.salvar_classificacoes(lote)
+                        lote = []
+    finally:
+        # Checkpoint final: grava o lote parcial mesmo se a execução for interrompida
+        repositorio.salvar_classificacoes(lote)
+
+    if prefiltro is not None:
+        print(f"Pré-filtro: {descartados} artigos descartados sem chamada à API.")
+    print(f"Classificação atualizada na base de notícias ({classificados} artigos).")
+    return classificados
+
+##### FUNÇÃO: Modo contínuo (daemon) #####
+def executar_daemon(feed_urls, keywords, repositorio, caminho_estado=ESTADO_PADRAO, artigos_por_rodada=200,
+                    usar_prefiltro=True):
     """
-    Carrega o CSV 'data/noticias/noticias.csv', filtra os artigos não classificados (baseado na coluna 
-    "1. O artigo aborda o tema da inflação?"), classifica cada artigo via API e atualiza o CSV.
+    Mantém a base atualizada continuamente: cada feed é consultado no seu próprio intervalo,
+    adaptado à frequência com que publica itens novos, e as notícias inseridas são classificadas
+    por uma thread separada, em rodadas de até 'artigos_por_rodada' artigos (ver backend/agendador.py).
+    Encerra com Ctrl+C ou SIGTERM, gravando o estado do agendamento.
     """
-    csv_filepath = os.path.join('data', 'noticias', 'noticias.csv')
-    
-    if not os.path.exists(csv_filepath):
-        print("Arquivo CSV não encontrado:", csv_filepath)
-        return
-    
-    # Lê o CSV forçando todas as colunas como string
-    df = pd.read_csv(csv_filepath, dtype=str)
-    
-    col_classificacao = [
-        "1. O artigo aborda o tema da inflação?",
-        "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?",
-        "3. O artigo aborda especificamente a inflação de alimentos?",
-        "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?"
-    ]
-    
-    # Garante que as colunas de classificação existam e preenche valores ausentes
-    for col in col_classificacao:
-        if col not in df.columns:
-            df[col] = ""
-        else:
-            df[col] = df[col].fillna("").astype(str)
-    
-    # Itera apenas sobre os artigos ainda não classificados
-    for index, row in df.iterrows():
-        if row[col_classificacao[0]] == "":
-            artigo = row.to_dict()
-            print(f"Classificando artigo: {artigo['title']}")
-            artigo_classificado = classificar_artigo(artigo)
-            
-            for col in col_classificacao:
-                valor = artigo_classificado.get(col, "")
-                df.at[index, col] = str(valor)
-            
-            # Imprime o resultado da classificação para o artigo atual
-            print(f"Artigo '{artigo['title']}' classificado como:")
-            for col in col_classificacao:
-                print(f"  {col}: {df.at[index, col]}")
-            
-            time.sleep(1)
-    
-    df.to_csv(csv_filepath, index=False, encoding='utf-8')
-    print("Classificação atualizada no arquivo CSV.")
+    cache = CacheFeeds()
+
+    def coletar(urls):
+        # Feeds que responderam 304 também são lidos (do cache), para contar os itens e
+        # manter a taxa de chegada; as notícias já cadastradas são ignoradas na inserção
+        # Cada rodada de coleta e de classificação é uma execução nas métricas (backend/metricas.py)
+        with metricas.execucao('coleta'):
+            with metricas.cronometro('busca'):
+                etapas = etapas_busca(urls, keywords, cache=cache)
+                noticias, itens_por_feed = reunir(encadear(*etapas), urls)
+            with metricas.cronometro('insercao'):
+                return itens_por_feed, update_noticias_csv(noticias, repositorio)
+
+    def classificar(parar):
+        with metricas.execucao('classificacao'), metricas.cronometro('classificacao'):
+            return processar_classificacao_csv(repositorio, limite=artigos_por_rodada, usar_prefiltro=usar_prefiltro,
+                                               parar=parar)
+
+    AgendadorFeeds(feed_urls, coletar, classificar, caminho_estado).executar()
 
 ##### EXECUÇÃO PRINCIPAL #####
 if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Coleta e classifica notícias dos feeds RSS.")
+    arg_parser.add_argument('--daemon', action='store_true',
+                            help="Executa continuamente, com intervalo de consulta adaptativo por feed.")
+    arg_parser.add_argument('--estado', default=ESTADO_PADRAO, help="Arquivo de estado do modo contínuo.")
+    arg_parser.add_argument('--sem-prefiltro', action='store_true',
+                            help="Envia todas as notícias à API, sem o pré-filtro local (backend/prefiltro.py).")
+    args = arg_parser.parse_args()
+
+    # Falha logo no início se a chave da API não estiver configurada
+    obter_client()
+
     # Lista de feeds RSS
     rss_feed_url = [
         'https://g1.globo.com/rss/g1/',
@@ -298,18 +285,23 @@ if __name__ == '__main__':
     ]
     print("Feeds RSS:", rss_feed_url)
     
-    # Carrega keywords adicionais a partir do CSV
-    keywords_csv = 'data/keywords/ipca_alimentacao_bebidas.csv'
-    keywords_adicionais = load_keywords_from_csv(keywords_csv)
-    
-    # Define as keywords já existentes e combina com as adicionais
-    keywords = ['inflação', 'preço dos alimentos', 'alta dos preços', 'IPCA', 'alimentação', 'bebidas']
-    keywords.extend(keywords_adicionais)
-    print("Palavras-chave utilizadas:", keywords)
+    # Keywords padrão e as do CSV da taxonomia, com o matcher já compilado
+    # (reaproveitado do cache em disco enquanto o CSV não mudar)
+    keywords = obter_registro(CSV_PADRAO)
+    print("Palavras-chave utilizadas:", keywords.keywords)
     
-    # Busca novas notícias e atualiza o CSV
-    resultados = search_keywords_in_rss(rss_feed_url, keywords)
-    df_atualizado = update_noticias_csv(resultados)
-    
-    # Processa a classificação dos artigos que ainda não foram avaliados pela IA
-    processar_classificacao_csv()
+    repositorio = RepositorioNoticias()
+    if args.daemon:
+        executar_daemon(rss_feed_url, keywords, repositorio, args.estado, usar_prefiltro=not args.sem_prefiltro)
+    else:
+        # Métricas por etapa e por feed em data/metricas/ (arquivo do Prometheus e histórico)
+        with metricas.execucao('atualizacao'):
+            # Busca novas notícias e atualiza a base
+            with metricas.cronometro('busca'):
+                resultados = search_keywords_in_rss(rss_feed_url, keywords)
+            with metricas.cronometro('insercao'):
+                update_noticias_csv(resultados, repositorio)
+
+            # Processa a classificação dos artigos que ainda não foram avaliados pela IA
+            with metricas.cronometro('classificacao'):
+                processar_classificacao_csv(repositorio, usar_prefiltro=not args.sem_prefiltro)
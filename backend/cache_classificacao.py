@@ -0,0 +1,167 @@
+# cache_classificacao.py
+"""
+Cache persistente das classificações feitas pela IA (data/cache/classificacoes.db).
+
+A chave é um hash do título normalizado (minúsculas, sem acentos e sem espaços
+repetidos) junto com o modelo e o prompt de sistema usados. Assim:
+  - o mesmo artigo vindo de outro feed, de outra busca ou de outro usuário
+    reaproveita a classificação sem nova chamada à API;
+  - qualquer alteração no prompt ou no modelo gera chaves novas, invalidando
+    automaticamente as classificações antigas.
+
+O arquivo é SQLite, compartilhado entre o app e a rotina de atualização.
+
+Para aproveitar o histórico já classificado na base de notícias (assumindo que
+foi classificado com o prompt atual):
+    python -m backend.cache_classificacao importar
+"""
+import os
+import json
+import sqlite3
+import argparse
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.matcher import normalizar_texto
+
+CACHE_DB_PADRAO = os.path.join('data', 'cache', 'classificacoes.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classificacoes (
+    chave TEXT PRIMARY KEY,
+    versao_prompt TEXT NOT NULL,
+    respostas TEXT NOT NULL,
+    criado_em TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_classificacoes_versao ON classificacoes (versao_prompt);
+"""
+
+
+def normalizar_titulo(titulo: str) -> str:
+    """
+    Forma canônica do título usada na chave: minúsculas, sem acentos e sem espaços repetidos.
+    """
+    return " ".join(normalizar_texto(titulo or "", dobrar_acentos=True).split())
+
+
+def versao_prompt(system_message: str, modelo: str) -> str:
+    """
+    Identificador curto da combinação prompt + modelo.
+    """
+    return hashlib.sha256(f"{modelo}\n{system_message}".encode('utf-8')).hexdigest()[:16]
+
+
+class CacheClassificacao:
+    """
+    Mapeia (título normalizado, prompt, modelo) -> respostas das quatro perguntas.
+    Cada operação abre sua própria conexão, podendo ser usado por várias threads.
+    """
+
+    def __init__(self, caminho: str = CACHE_DB_PADRAO):
+        self.caminho = caminho
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def chave(titulo: str, versao: str) -> str:
+        return hashlib.sha256(f"{versao}\n{normalizar_titulo(titulo)}".encode('utf-8')).hexdigest()
+
+    def obter(self, titulo: str, versao: str) -> Optional[Dict[str, str]]:
+        """
+        Retorna as respostas em cache para o título, ou None.
+        """
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT respostas FROM classificacoes WHERE chave = ?", (self.chave(titulo, versao),)
+            ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def salvar(self, titulo: str, versao: str, respostas: Dict[str, str]) -> None:
+        self.salvar_lote([(titulo, respostas)], versao)
+
+    def salvar_lote(self, itens: List[Tuple[str, Dict[str, str]]], versao: str) -> None:
+        """
+        Grava vários pares (título, respostas) em uma única transação.
+        """
+        linhas = [
+            (self.chave(titulo, versao), versao, json.dumps(respostas, ensure_ascii=False))
+            for titulo, respostas in itens
+        ]
+        with self._conectar() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO classificacoes (chave, versao_prompt, respostas) VALUES (?, ?, ?)",
+                linhas,
+            )
+
+    def remover_obsoletas(self, versao_atual: str) -> int:
+        """
+        Apaga as classificações feitas com outros prompts/modelos. Retorna quantas foram removidas.
+        """
+        with self._conectar() as conn:
+            return conn.execute(
+                "DELETE FROM classificacoes WHERE versao_prompt != ?", (versao_atual,)
+            ).rowcount
+
+
+_cache: Optional[CacheClassificacao] = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_classificacao() -> CacheClassificacao:
+    """
+    Retorna o cache compartilhado do processo, criando-o no primeiro uso.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheClassificacao()
+        return _cache
+
+
+def importar_da_base(cache: CacheClassificacao, caminho_db: Optional[str] = None) -> int:
+    """
+    Copia para o cache as classificações válidas já gravadas na base de notícias,
+    sob a versão atual do prompt. Retorna o número de títulos importados.
+    """
+    from backend.classificacao import MODELO_PADRAO, SYSTEM_MESSAGE, respostas_validas
+    from backend.repositorio import DB_PADRAO, PERGUNTAS, RepositorioNoticias
+
+    versao = versao_prompt(SYSTEM_MESSAGE, MODELO_PADRAO)
+    df = RepositorioNoticias(caminho_db or DB_PADRAO).consultar(colunas=['title'] + PERGUNTAS)
+    # Respostas em texto livre (ex.: do formato antigo por linhas) ficam fora do cache
+    itens = [
+        (registro['title'], {pergunta: registro[pergunta] for pergunta in PERGUNTAS})
+        for registro in df.to_dict('records')
+    ]
+    itens = [(titulo, respostas) for titulo, respostas in itens if respostas_validas(respostas)]
+    cache.salvar_lote(itens, versao)
+    return len(itens)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Ferramentas do cache de classificações.")
+    subcomandos = arg_parser.add_subparsers(dest='comando', required=True)
+    importar = subcomandos.add_parser('importar', help="Importa as classificações já gravadas na base de notícias.")
+    importar.add_argument('--db', default=None)
+    subcomandos.add_parser('limpar', help="Remove classificações feitas com prompts ou modelos anteriores.")
+    args = arg_parser.parse_args()
+
+    cache = CacheClassificacao()
+    if args.comando == 'importar':
+        print(f"{importar_da_base(cache, args.db)} classificações importadas.")
+    elif args.comando == 'limpar':
+        from backend.classificacao import MODELO_PADRAO, SYSTEM_MESSAGE
+        print(f"{cache.remover_obsoletas(versao_prompt(SYSTEM_MESSAGE, MODELO_PADRAO))} classificações removidas.")
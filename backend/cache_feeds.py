@@ -0,0 +1,99 @@
+# cache_feeds.py
+"""
+Cache em disco para o download condicional de feeds RSS (HTTP conditional GET).
+
+Para cada URL são guardados os validadores (ETag / Last-Modified) e o último
+corpo recebido. Nas próximas buscas os validadores são enviados em
+If-None-Match / If-Modified-Since; se o servidor responder 304 o feed não
+mudou e o corpo guardado continua válido.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Optional
+
+CACHE_DIR_PADRAO = os.path.join('data', 'cache', 'feeds')
+
+
+def escrita_atomica(caminho: str, dados: bytes) -> None:
+    """
+    Grava `dados` em `caminho` via arquivo temporário + rename, para que
+    leitores concorrentes nunca vejam um arquivo pela metade.
+    """
+    diretorio = os.path.dirname(caminho)
+    fd, tmp = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dados)
+        os.replace(tmp, caminho)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class CacheFeeds:
+    """
+    Cache persistente de validadores e corpos de feeds, um par de arquivos por URL:
+      - <hash>.json: feed_url, etag e last_modified
+      - <hash>.xml: último corpo recebido com status 200
+    """
+
+    def __init__(self, diretorio: str = CACHE_DIR_PADRAO):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminhos(self, url: str):
+        chave = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.diretorio, chave)
+        return base + '.json', base + '.xml'
+
+    def _carregar_meta(self, url: str) -> Optional[Dict[str, str]]:
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        if not (os.path.exists(caminho_meta) and os.path.exists(caminho_corpo)):
+            return None
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def cabecalhos_condicionais(self, url: str) -> Dict[str, str]:
+        """
+        Retorna os cabeçalhos If-None-Match / If-Modified-Since para a URL
+        (vazio se ainda não há nada em cache).
+        """
+        meta = self._carregar_meta(url)
+        if not meta:
+            return {}
+        cabecalhos = {}
+        if meta.get('etag'):
+            cabecalhos['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = meta['last_modified']
+        return cabecalhos
+
+    def obter_corpo(self, url: str) -> Optional[bytes]:
+        """
+        Retorna o último corpo guardado para a URL, ou None.
+        """
+        _, caminho_corpo = self._caminhos(url)
+        try:
+            with open(caminho_corpo, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def salvar(self, url: str, conteudo: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """
+        Guarda o corpo e os validadores de uma resposta 200.
+        Respostas sem ETag nem Last-Modified não são guardadas, pois não há como revalidá-las.
+        """
+        if not etag and not last_modified:
+            return
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        # O corpo é gravado antes dos validadores: um validador novo nunca aponta para um corpo antigo
+        escrita_atomica(caminho_corpo, conteudo)
+        meta = {'feed_url': url, 'etag': etag, 'last_modified': last_modified}
+        escrita_atomica(caminho_meta, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
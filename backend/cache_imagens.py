@@ -0,0 +1,156 @@
+# cache_imagens.py
+"""
+Cache das nuvens de palavras já renderizadas (PNG).
+
+Gerar o layout da WordCloud leva segundos; como a mesma nuvem (em especial a do
+período padrão) é pedida por todos os visitantes, o PNG pronto é guardado:
+  - em memória, em um LRU limitado pelo total de bytes;
+  - opcionalmente em disco (data/cache/nuvens), sobrevivendo a reinícios do app.
+
+A chave combina o período, o conteúdo do arquivo de stopwords, a máscara (caminho
+e data de modificação) e a versão da base de notícias, então qualquer mudança
+em um deles gera uma nova imagem.
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional
+
+from backend.cache_feeds import escrita_atomica
+
+CACHE_DIR_PADRAO = os.path.join('data', 'cache', 'nuvens')
+MAX_BYTES_PADRAO = 32 * 1024 * 1024
+MAX_ARQUIVOS_DISCO = 200
+
+
+def _impressao_arquivo(caminho: Optional[str]) -> str:
+    """
+    Identifica o conteúdo de um arquivo opcional (sha1), ou "" se não existir.
+    """
+    if not caminho or not os.path.exists(caminho):
+        return ""
+    with open(caminho, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def chave_nuvem(
+    inicio: Optional[date],
+    fim: Optional[date],
+    stopwords_path: Optional[str],
+    mask_path: Optional[str],
+    versao: int
+) -> str:
+    """
+    Chave da nuvem renderizada para um período, arquivos de configuração e versão da base.
+    """
+    mascara = ""
+    if mask_path and os.path.exists(mask_path):
+        mascara = f"{os.path.abspath(mask_path)}@{os.path.getmtime(mask_path)}"
+    partes = [
+        inicio.isoformat() if inicio else "",
+        fim.isoformat() if fim else "",
+        _impressao_arquivo(stopwords_path),
+        mascara,
+        str(versao),
+    ]
+    return hashlib.sha256("\n".join(partes).encode('utf-8')).hexdigest()
+
+
+class CacheImagens:
+    """
+    LRU de imagens (bytes) limitado por `max_bytes`, com camada opcional em disco
+    (no máximo `max_arquivos` arquivos; saem os de acesso mais antigo).
+    Seguro para uso por várias threads (sessões do Streamlit).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = MAX_BYTES_PADRAO,
+        diretorio: Optional[str] = CACHE_DIR_PADRAO,
+        max_arquivos: int = MAX_ARQUIVOS_DISCO
+    ):
+        self.max_bytes = max_bytes
+        self.diretorio = diretorio
+        self.max_arquivos = max_arquivos
+        self._itens: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + '.png')
+
+    def _guardar_memoria(self, chave: str, dados: bytes) -> None:
+        if len(dados) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._itens[chave] = dados
+            self._bytes += len(dados)
+            # Remove as menos usadas recentemente até caber no limite
+            while self._bytes > self.max_bytes:
+                _, removida = self._itens.popitem(last=False)
+                self._bytes -= len(removida)
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        """
+        Retorna a imagem da memória ou, na falta, do disco (promovendo-a à memória); ou None.
+        """
+        with self._lock:
+            dados = self._itens.get(chave)
+            if dados is not None:
+                self._itens.move_to_end(chave)
+                return dados
+        if not self.diretorio:
+            return None
+        try:
+            with open(self._caminho(chave), 'rb') as f:
+                dados = f.read()
+            os.utime(self._caminho(chave))  # marca o acesso para a limpeza do disco
+        except OSError:
+            return None
+        self._guardar_memoria(chave, dados)
+        return dados
+
+    def salvar(self, chave: str, dados: bytes) -> None:
+        self._guardar_memoria(chave, dados)
+        if self.diretorio:
+            escrita_atomica(self._caminho(chave), dados)
+            self._limpar_disco()
+
+    def _limpar_disco(self) -> None:
+        try:
+            arquivos = [
+                entrada for entrada in os.scandir(self.diretorio)
+                if entrada.is_file() and entrada.name.endswith('.png')
+            ]
+            excedentes = len(arquivos) - self.max_arquivos
+            if excedentes <= 0:
+                return
+            for entrada in sorted(arquivos, key=lambda e: e.stat().st_mtime)[:excedentes]:
+                os.remove(entrada.path)
+        except OSError:
+            pass  # outro processo pode estar limpando ao mesmo tempo
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+_cache: Optional[CacheImagens] = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_imagens() -> CacheImagens:
+    """
+    Retorna o cache compartilhado do processo, criando-o no primeiro uso.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheImagens()
+        return _cache
@@ -0,0 +1,488 @@
+# classificacao.py
+"""
+Classificação de artigos pela API da OpenAI, compartilhada entre o app
+(backend/services.py) e a rotina de atualização (backend/atualiza_noticias.py).
+
+- classificar_artigo: classifica um artigo, consultando antes o cache de
+  classificações (backend/cache_classificacao.py).
+- classificar_lote: classifica vários artigos em uma única chamada, com resposta
+  em JSON estruturado; o tamanho de cada lote se ajusta a um orçamento de tokens.
+- LimitadorTaxa: balde de fichas (token bucket) que mantém as chamadas dentro
+  dos limites de requisições por minuto e de tokens por minuto.
+- criar_completion: chamada ao chat completions respeitando o limitador, com
+  novas tentativas em erros 429/5xx (backoff exponencial com jitter).
+- classificar_em_paralelo: executa a classificação de vários artigos com
+  concorrência limitada, devolvendo cada resultado assim que fica pronto.
+
+Os limites padrão podem ser configurados pelas variáveis de ambiente
+OPENAI_RPM (requisições por minuto) e OPENAI_TPM (tokens por minuto).
+"""
+import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend import metricas
+from backend.cache_classificacao import CacheClassificacao, obter_cache_classificacao, versao_prompt
+from backend.repositorio import PERGUNTAS
+
+MODELO_PADRAO = "gpt-4o-mini"
+RPM_PADRAO = int(os.getenv("OPENAI_RPM", "500"))
+TPM_PADRAO = int(os.getenv("OPENAI_TPM", "200000"))
+MAX_WORKERS_PADRAO = 8
+
+# Tokens reservados para a resposta de cada chamada (quatro respostas curtas)
+TOKENS_RESPOSTA = 50
+
+# Classificação em lote: orçamento de tokens por chamada (prompt + resposta),
+# número máximo de artigos por chamada e tokens de resposta por artigo
+ORCAMENTO_TOKENS_LOTE = 6000
+MAX_ITENS_LOTE = 40
+TOKENS_RESPOSTA_POR_ITEM = 40
+
+RESPOSTAS_VALIDAS = {"Sim", "Não", "Não se aplica"}
+
+# Mensagem do sistema com as instruções de classificação.
+# Qualquer alteração no texto invalida as classificações guardadas em cache.
+SYSTEM_MESSAGE = (
+    "Como economista especializado em inflação de alimentos, sua tarefa é analisar artigos de jornais e classificar "
+    "conforme as seguintes perguntas:\n"
+    "1. O artigo aborda o tema da inflação? (Responda com 'Sim' ou 'Não')\n"
+       "- Se 'Sim':\n"
+       "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral? "
+       "(Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
+    "3. O artigo aborda especificamente a inflação de alimentos? (Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
+       "- Se 'Sim':\n"
+       "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor? "
+       "(Responda com 'Sim', 'Não' ou 'Não se aplica')\n"
+    "Por favor, utilize apenas as palavras 'Sim', 'Não' ou 'Não se aplica' para responder a cada pergunta. "
+    "Não é necessário justificar as respostas.\n"
+    "Em caso de informações insuficientes, responda 'Não'.\n"
+    "Utilize apenas texto puro, sem aplicar estilos de formatação.\n"
+    "Retorne a resposta com cada linha correspondendo a uma pergunta."
+)
+
+# Instruções adicionais da classificação em lote (formato da resposta apenas; as
+# perguntas são as mesmas, por isso o cache é compartilhado com a classificação individual)
+INSTRUCOES_LOTE = (
+    "\n\nVocê receberá vários artigos, cada um com um 'id'. Responda somente com um objeto JSON no formato "
+    '{"classificacoes": [{"id": <id>, "q1": "...", "q2": "...", "q3": "...", "q4": "..."}]}, '
+    "com um elemento por artigo, onde q1 a q4 são as respostas às perguntas 1 a 4."
+)
+
+
+class LimitadorTaxa:
+    """
+    Balde de fichas duplo: uma ficha por requisição e uma por token estimado.
+    Os baldes se recompõem continuamente ao longo de um minuto. Seguro para uso
+    por várias threads.
+    """
+
+    def __init__(self, requisicoes_por_minuto: int = RPM_PADRAO, tokens_por_minuto: int = TPM_PADRAO):
+        self.rpm = requisicoes_por_minuto
+        self.tpm = tokens_por_minuto
+        self._requisicoes = float(requisicoes_por_minuto)
+        self._tokens = float(tokens_por_minuto)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _repor(self) -> None:
+        agora = time.monotonic()
+        decorrido = agora - self._ultimo
+        self._ultimo = agora
+        self._requisicoes = min(self.rpm, self._requisicoes + decorrido * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + decorrido * self.tpm / 60)
+
+    def adquirir(self, tokens: int = 0) -> None:
+        """
+        Bloqueia até haver uma requisição e `tokens` tokens disponíveis, e os consome.
+        """
+        tokens = min(tokens, self.tpm)  # uma chamada maior que o balde nunca seria liberada
+        while True:
+            with self._lock:
+                self._repor()
+                if self._requisicoes >= 1 and self._tokens >= tokens:
+                    self._requisicoes -= 1
+                    self._tokens -= tokens
+                    return
+                espera = max(
+                    (1 - self._requisicoes) * 60 / self.rpm,
+                    (tokens - self._tokens) * 60 / self.tpm,
+                )
+            time.sleep(max(espera, 0.01))
+
+
+_limitador: Optional[LimitadorTaxa] = None
+_limitador_lock = threading.Lock()
+
+
+def obter_limitador() -> LimitadorTaxa:
+    """
+    Retorna o limitador compartilhado do processo (todas as sessões e threads
+    dividem o mesmo orçamento de requisições e tokens).
+    """
+    global _limitador
+    with _limitador_lock:
+        if _limitador is None:
+            _limitador = LimitadorTaxa()
+        return _limitador
+
+
+def estimar_tokens(mensagens: List[Dict[str, str]], tokens_resposta: int = TOKENS_RESPOSTA) -> int:
+    """
+    Estimativa conservadora de tokens de uma chamada (~3 caracteres por token
+    em português) somada à reserva para a resposta.
+    """
+    caracteres = sum(len(m['content']) for m in mensagens)
+    return caracteres // 3 + tokens_resposta
+
+
+def _eh_retentavel(erro: Exception) -> bool:
+    """
+    Erros transitórios: limite de taxa (429), erros do servidor (5xx), falhas de conexão e timeouts.
+    """
+    import openai
+    if isinstance(erro, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    if isinstance(erro, openai.APIStatusError):
+        return erro.status_code == 429 or erro.status_code >= 500
+    return False
+
+
+def _espera_sugerida(erro: Exception) -> Optional[float]:
+    """
+    Tempo de espera indicado pelo servidor no cabeçalho Retry-After, se houver.
+    """
+    response = getattr(erro, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def criar_completion(
+    client,
+    mensagens: List[Dict[str, str]],
+    modelo: str = MODELO_PADRAO,
+    limitador: Optional[LimitadorTaxa] = None,
+    max_tentativas: int = 5,
+    espera_base: float = 1.0,
+    espera_maxima: float = 30.0,
+    tokens_resposta: int = TOKENS_RESPOSTA,
+    **kwargs
+):
+    """
+    Chama client.chat.completions.create respeitando o limitador de taxa.
+
+    Erros 429/5xx e de conexão são repetidos com backoff exponencial e jitter
+    ("full jitter": espera aleatória entre 0 e min(espera_maxima, espera_base * 2^n)),
+    respeitando o Retry-After quando o servidor o informa. Demais erros, ou o
+    esgotamento das tentativas, são propagados.
+
+    `tokens_resposta` é a reserva de tokens da resposta usada na estimativa
+    consumida do limitador.
+
+    Registra nas métricas da execução (backend/metricas.py) a latência de cada
+    chamada, a espera no limitador, as novas tentativas, os erros e os tokens
+    informados em resposta.usage.
+    """
+    limitador = limitador or obter_limitador()
+    tokens = estimar_tokens(mensagens, tokens_resposta)
+    for tentativa in range(max_tentativas):
+        inicio = time.perf_counter()
+        limitador.adquirir(tokens)
+        chamada = time.perf_counter()
+        try:
+            resposta = client.chat.completions.create(model=modelo, messages=mensagens, **kwargs)
+        except Exception as e:
+            metricas.somar(
+                llm_espera_limitador_segundos=chamada - inicio,
+                llm_latencia_segundos=time.perf_counter() - chamada,
+                llm_erros=1,
+            )
+            if not _eh_retentavel(e) or tentativa == max_tentativas - 1:
+                raise
+            espera = _espera_sugerida(e)
+            if espera is None:
+                espera = random.uniform(0, min(espera_maxima, espera_base * 2 ** tentativa))
+            metricas.somar(llm_novas_tentativas=1, llm_espera_backoff_segundos=espera)
+            print(f"Erro transitório na API ({e.__class__.__name__}); nova tentativa em {espera:.1f} s.")
+            time.sleep(espera)
+            continue
+        uso = getattr(resposta, 'usage', None)
+        metricas.somar(
+            llm_chamadas=1,
+            llm_espera_limitador_segundos=chamada - inicio,
+            llm_latencia_segundos=time.perf_counter() - chamada,
+            llm_tokens_prompt=getattr(uso, 'prompt_tokens', None) or 0,
+            llm_tokens_resposta=getattr(uso, 'completion_tokens', None) or 0,
+        )
+        return resposta
+
+
+def classificar_em_paralelo(
+    artigos: List[Dict[str, Any]],
+    classificar: Callable[[Dict[str, Any]], Dict[str, Any]],
+    max_workers: int = MAX_WORKERS_PADRAO
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Classifica os artigos com até `max_workers` chamadas simultâneas.
+
+    O ritmo das chamadas é controlado pelo limitador usado em `classificar`
+    (via criar_completion); aqui só se limita a concorrência.
+
+    Produz pares (índice do artigo em `artigos`, resultado de `classificar`) na
+    ordem em que as classificações terminam, para que o chamador possa gravar
+    ou exibir cada resultado imediatamente.
+    """
+    if not artigos:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(artigos)))
+    try:
+        classificar = metricas.no_contexto(classificar)
+        futuros = {executor.submit(classificar, artigo): indice for indice, artigo in enumerate(artigos)}
+        for futuro in as_completed(futuros):
+            yield futuros[futuro], futuro.result()
+    finally:
+        # Se o consumidor parar antes do fim (ex.: interrupção), descarta as chamadas ainda não iniciadas
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extrair_respostas(conteudo: str) -> Dict[str, str]:
+    """
+    Converte a resposta da API (uma linha por pergunta, ex.: "1. Sim") no
+    dicionário pergunta -> resposta. Linhas além da quarta são ignoradas.
+    """
+    respostas = {pergunta: None for pergunta in PERGUNTAS}
+    for pergunta, linha in zip(PERGUNTAS, conteudo.strip().splitlines()):
+        respostas[pergunta] = linha.split('. ', 1)[-1].strip()
+    return respostas
+
+
+def respostas_validas(respostas: Dict[str, Any]) -> bool:
+    """
+    Se as quatro respostas são 'Sim', 'Não' ou 'Não se aplica' (a pergunta 1 só
+    admite 'Sim' ou 'Não'). Texto livre (ex.: "Sim, pois...") não é aceito.
+    """
+    if not all(respostas.get(pergunta) in RESPOSTAS_VALIDAS for pergunta in PERGUNTAS):
+        return False
+    return respostas[PERGUNTAS[0]] != "Não se aplica"
+
+
+def classificar_artigo(
+    artigo: Dict[str, Any],
+    client,
+    modelo: str = MODELO_PADRAO,
+    cache: Optional[CacheClassificacao] = None,
+    usar_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Classifica um artigo (apenas o título é enviado à API) e atualiza o próprio
+    dicionário com as respostas das quatro perguntas.
+
+    Antes de chamar a API consulta o cache de classificações; respostas válidas
+    (ver respostas_validas) obtidas da API são gravadas no cache para as próximas buscas.
+
+    Retorna o artigo atualizado, ou {} se a chamada à API falhar ou a resposta não
+    for válida (o artigo não é alterado).
+    """
+    versao = versao_prompt(SYSTEM_MESSAGE, modelo)
+    if usar_cache:
+        cache = cache or obter_cache_classificacao()
+        em_cache = cache.obter(artigo['title'], versao)
+        if em_cache is not None and respostas_validas(em_cache):
+            artigo.update(em_cache)
+            return artigo
+
+    user_message = f"Classifique:\nTítulo: {artigo['title']}\n"
+    try:
+        resposta = criar_completion(
+            client,
+            [
+                {"role": "system", "content": SYSTEM_MESSAGE},
+                {"role": "user", "content": user_message}
+            ],
+            modelo=modelo,
+            temperature=0  # para respostas mais determinísticas
+        )
+    except Exception as e:
+        print("Erro ao chamar a API:", e)
+        return {}
+
+    respostas = extrair_respostas(resposta.choices[0].message.content)
+    if not respostas_validas(respostas):
+        print(f"Resposta inválida da API para '{artigo['title']}': {list(respostas.values())}")
+        return {}
+    if usar_cache:
+        cache.salvar(artigo['title'], versao, respostas)
+
+    artigo.update(respostas)
+    return artigo
+
+
+def montar_lotes(
+    artigos: List[Dict[str, Any]],
+    orcamento_tokens: int = ORCAMENTO_TOKENS_LOTE,
+    max_itens: int = MAX_ITENS_LOTE
+) -> List[List[Dict[str, Any]]]:
+    """
+    Agrupa os artigos, na ordem recebida, em lotes cujo custo estimado (prompt,
+    títulos e respostas) cabe em `orcamento_tokens`, com no máximo `max_itens` por lote.
+    """
+    custo_fixo = (len(SYSTEM_MESSAGE) + len(INSTRUCOES_LOTE)) // 3
+    lotes, atual, custo = [], [], custo_fixo
+    for artigo in artigos:
+        custo_item = len(artigo['title']) // 3 + 10 + TOKENS_RESPOSTA_POR_ITEM
+        if atual and (custo + custo_item > orcamento_tokens or len(atual) >= max_itens):
+            lotes.append(atual)
+            atual, custo = [], custo_fixo
+        atual.append(artigo)
+        custo += custo_item
+    if atual:
+        lotes.append(atual)
+    return lotes
+
+
+def _validar_item(item: Any) -> Optional[Dict[str, str]]:
+    """
+    Converte um elemento do JSON de resposta ({"id", "q1".."q4"}) no dicionário
+    pergunta -> resposta, ou None se estiver incompleto ou com respostas inválidas.
+    """
+    if not isinstance(item, dict):
+        return None
+    respostas = {}
+    for numero, pergunta in enumerate(PERGUNTAS, start=1):
+        valor = item.get(f"q{numero}")
+        respostas[pergunta] = valor.strip() if isinstance(valor, str) else valor
+    return respostas if respostas_validas(respostas) else None
+
+
+def _chamar_lote(artigos: List[Dict[str, Any]], client, modelo: str) -> Dict[int, Dict[str, str]]:
+    """
+    Faz uma chamada com todos os `artigos` e retorna as respostas válidas, por posição no lote.
+    """
+    entrada = [{"id": indice, "titulo": artigo['title']} for indice, artigo in enumerate(artigos)]
+    resposta = criar_completion(
+        client,
+        [
+            {"role": "system", "content": SYSTEM_MESSAGE + INSTRUCOES_LOTE},
+            {"role": "user", "content": "Classifique os artigos:\n" + json.dumps(entrada, ensure_ascii=False)}
+        ],
+        modelo=modelo,
+        tokens_resposta=TOKENS_RESPOSTA_POR_ITEM * len(artigos),
+        temperature=0,
+        response_format={"type": "json_object"}
+    )
+    try:
+        itens = json.loads(resposta.choices[0].message.content).get("classificacoes", [])
+    except (ValueError, AttributeError):
+        return {}
+
+    validas = {}
+    for item in itens if isinstance(itens, list) else []:
+        identificador = item.get("id") if isinstance(item, dict) else None
+        respostas = _validar_item(item)
+        if isinstance(identificador, int) and 0 <= identificador < len(artigos) and respostas:
+            validas[identificador] = respostas
+    return validas
+
+
+def _classificar_sublote(
+    artigos: List[Dict[str, Any]],
+    client,
+    modelo: str
+) -> Tuple[List[Optional[Dict[str, str]]], bool]:
+    """
+    Classifica um lote; os artigos cuja resposta falhou na validação são divididos
+    ao meio e reenviados, até chegar a lotes de um artigo.
+
+    Se a chamada à API falhar (erro já retentado por criar_completion, ex.: chave
+    inválida ou cota esgotada), o lote não é dividido: dividir só multiplicaria as
+    chamadas com o mesmo erro. Retorna as respostas (None para os artigos sem
+    resposta válida) e se alguma chamada falhou.
+    """
+    try:
+        validas = _chamar_lote(artigos, client, modelo)
+    except Exception as e:
+        print(f"Erro ao chamar a API para um lote de {len(artigos)} artigos:", e)
+        return [None] * len(artigos), True
+
+    resultados: List[Optional[Dict[str, str]]] = [validas.get(i) for i in range(len(artigos))]
+    falhas = [i for i, respostas in enumerate(resultados) if respostas is None]
+    if not falhas or len(artigos) == 1:
+        return resultados, False
+
+    meio = (len(falhas) + 1) // 2
+    erro_api = False
+    for grupo in (falhas[:meio], falhas[meio:]):
+        if not grupo or erro_api:
+            continue
+        respostas_grupo, erro_api = _classificar_sublote([artigos[i] for i in grupo], client, modelo)
+        for indice, respostas in zip(grupo, respostas_grupo):
+            resultados[indice] = respostas
+    return resultados, erro_api
+
+
+def classificar_lote(
+    artigos: List[Dict[str, Any]],
+    client,
+    modelo: str = MODELO_PADRAO,
+    cache: Optional[CacheClassificacao] = None,
+    usar_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Classifica vários artigos com o mínimo de chamadas à API.
+
+    Artigos em cache são respondidos sem chamada; os demais são agrupados por
+    montar_lotes e enviados juntos, pedindo um array JSON indexado pelo id de cada
+    artigo. Respostas inválidas ou ausentes são reenviadas em lotes menores; um
+    artigo que falha sozinho é tentado uma última vez por classificar_artigo, e
+    fica pendente se essa resposta também não for válida (ver respostas_validas).
+    Se a API falhar, os artigos sem resposta ficam sem classificação (pendentes)
+    e os lotes seguintes não são enviados.
+
+    Retorna uma lista alinhada com `artigos`: cada artigo atualizado com as
+    respostas (o próprio dicionário), ou {} quando não foi possível classificá-lo.
+    """
+    versao = versao_prompt(SYSTEM_MESSAGE, modelo)
+    if usar_cache:
+        cache = cache or obter_cache_classificacao()
+
+    resultados: List[Dict[str, Any]] = [{} for _ in artigos]
+    pendentes = []
+    for indice, artigo in enumerate(artigos):
+        em_cache = cache.obter(artigo['title'], versao) if usar_cache else None
+        if em_cache is not None and respostas_validas(em_cache):
+            artigo.update(em_cache)
+            resultados[indice] = artigo
+        else:
+            pendentes.append(indice)
+
+    # montar_lotes mantém a ordem: os índices de cada lote seguem a sequência de `pendentes`
+    indices = iter(pendentes)
+    for lote in montar_lotes([artigos[i] for i in pendentes]):
+        classificados = []
+        indices_lote = [next(indices) for _ in lote]
+        respostas_lote, erro_api = _classificar_sublote(lote, client, modelo)
+        for indice, artigo, respostas in zip(indices_lote, lote, respostas_lote):
+            if respostas is None:
+                # Último recurso: chamada individual, com o formato de resposta por linhas,
+                # validada pelas mesmas regras de _validar_item; senão o artigo fica pendente
+                if not erro_api:
+                    individual = classificar_artigo(artigo, client, modelo, cache, usar_cache)
+                    if individual and respostas_validas(individual):
+                        resultados[indice] = individual
+                continue
+            artigo.update(respostas)
+            resultados[indice] = artigo
+            classificados.append((artigo['title'], respostas))
+        if usar_cache and classificados:
+            cache.salvar_lote(classificados, versao)
+        if erro_api:
+            break
+    return resultados
@@ -0,0 +1,173 @@
+# dados.py
+"""
+Camada de leitura compartilhada das notícias para as páginas do app.
+
+Nenhuma função carrega o histórico inteiro: as consultas por período
+(noticias_periodo) leem só o período pedido, e a busca de texto
+(buscar_noticias) usa o índice FTS5 da base e lê só a página pedida. As tabelas
+devolvidas vêm prontas para exibição:
+  - 'pub_date' convertida para datetime com fuso (America/Sao_Paulo);
+  - textos repetidos (feed_url, matched_keyword e as respostas Sim/Não) como categóricos.
+
+Os últimos resultados (períodos, agregados de sentimento e intervalo de datas)
+ficam em memória no processo, compartilhados por todas as sessões do Streamlit,
+e são refeitos quando a versão da base (RepositorioNoticias.versao, que muda a
+cada escrita) muda. As funções devolvem visões (cópias rasas) desses resultados:
+os chamadores podem criar ou substituir colunas nelas, mas não devem alterar
+valores no lugar.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from backend.repositorio import DB_PADRAO, PERGUNTAS, RepositorioNoticias
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FUSO_EXIBICAO = "America/Sao_Paulo"
+COLUNAS_CATEGORICAS = ['feed_url', 'matched_keyword'] + PERGUNTAS
+MAX_PERIODOS = 16
+
+_lock = threading.Lock()
+# (caminho, versão, início, fim) -> tabela filtrada, em ordem de uso (LRU)
+_periodos: "OrderedDict[Tuple[str, int, Optional[date], Optional[date]], pd.DataFrame]" = OrderedDict()
+# (caminho, versão, início, fim, semanal) -> agregados de sentimento, em ordem de uso (LRU)
+_agregados: "OrderedDict[Tuple[str, int, Optional[date], Optional[date], bool], pd.DataFrame]" = OrderedDict()
+# caminho absoluto da base -> (versão, intervalo de datas)
+_intervalos: Dict[str, Tuple[int, Tuple[Optional[date], Optional[date]]]] = {}
+
+
+def _preparar(df: "pd.DataFrame") -> "pd.DataFrame":
+    import pandas as pd
+    df["pub_date"] = pd.to_datetime(df["pub_ts"], unit="s", utc=True).dt.tz_convert(FUSO_EXIBICAO)
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("category")
+    return df
+
+
+def noticias_periodo(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    caminho_db: str = DB_PADRAO
+) -> "pd.DataFrame":
+    """
+    Notícias sobre inflação publicadas entre `inicio` e `fim` (inclusivo, no fuso
+    de exibição), com índice reiniciado. Só o período é lido da base (e, para datas
+    antigas, só os meses arquivados do período). As últimas visões filtradas ficam
+    em memória, então reruns com o mesmo período não refazem a leitura.
+    """
+    import pandas as pd
+    repositorio = RepositorioNoticias(caminho_db)
+    versao = repositorio.versao()
+    chave = (os.path.abspath(caminho_db), versao, inicio, fim)
+    with _lock:
+        if chave in _periodos:
+            _periodos.move_to_end(chave)
+            return _periodos[chave].copy(deep=False)
+
+    # A base filtra por dia UTC: um dia de folga de cada lado cobre o fuso de exibição
+    df = _preparar(repositorio.consultar(
+        inicio - timedelta(days=1) if inicio else None,
+        fim + timedelta(days=1) if fim else None,
+        apenas_inflacao=True,
+    ))
+
+    mascara = pd.Series(True, index=df.index)
+    if inicio:
+        mascara &= df["pub_date"] >= pd.Timestamp(inicio).tz_localize(FUSO_EXIBICAO)
+    if fim:
+        mascara &= df["pub_date"] < pd.Timestamp(fim + timedelta(days=1)).tz_localize(FUSO_EXIBICAO)
+    filtrado = df[mascara].reset_index(drop=True)
+
+    with _lock:
+        _periodos[chave] = filtrado
+        while len(_periodos) > MAX_PERIODOS:
+            _periodos.popitem(last=False)
+    return filtrado.copy(deep=False)
+
+
+def intervalo_datas(caminho_db: str = DB_PADRAO) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Menor e maior data de publicação de toda a base (UTC), recalculadas só quando a versão muda.
+    """
+    caminho = os.path.abspath(caminho_db)
+    repositorio = RepositorioNoticias(caminho_db)
+    versao = repositorio.versao()
+    with _lock:
+        atual = _intervalos.get(caminho)
+        if atual is not None and atual[0] == versao:
+            return atual[1]
+    intervalo = repositorio.intervalo_datas()
+    with _lock:
+        _intervalos[caminho] = (versao, intervalo)
+    return intervalo
+
+
+
+def agregados_sentimento(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    semanal: bool = False,
+    caminho_db: str = DB_PADRAO
+) -> "pd.DataFrame":
+    """
+    Contagem das respostas por dia (ou semana), feed e pergunta
+    (RepositorioNoticias.agregados_sentimento), recalculada só quando a versão muda.
+    """
+    repositorio = RepositorioNoticias(caminho_db)
+    chave = (os.path.abspath(caminho_db), repositorio.versao(), inicio, fim, semanal)
+    with _lock:
+        if chave in _agregados:
+            _agregados.move_to_end(chave)
+            return _agregados[chave].copy(deep=False)
+    df = repositorio.agregados_sentimento(inicio, fim, semanal)
+    with _lock:
+        _agregados[chave] = df
+        while len(_agregados) > MAX_PERIODOS:
+            _agregados.popitem(last=False)
+    return df.copy(deep=False)
+
+
+def _limites(inicio: Optional[date], fim: Optional[date]) -> Tuple[Optional[int], Optional[int]]:
+    # Início de `inicio` e fim de `fim` no fuso de exibição, em segundos desde a época
+    import pandas as pd
+    desde = int(pd.Timestamp(inicio).tz_localize(FUSO_EXIBICAO).timestamp()) if inicio else None
+    ate = int(pd.Timestamp(fim + timedelta(days=1)).tz_localize(FUSO_EXIBICAO).timestamp()) if fim else None
+    return desde, ate
+
+
+def contar_busca(
+    consulta: str,
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    caminho_db: str = DB_PADRAO
+) -> int:
+    """
+    Total de notícias sobre inflação encontradas por buscar_noticias no período.
+    """
+    return RepositorioNoticias(caminho_db).contar_busca(consulta, *_limites(inicio, fim), apenas_inflacao=True)
+
+
+def buscar_noticias(
+    consulta: str,
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    pagina: int = 1,
+    tamanho_pagina: int = 25,
+    caminho_db: str = DB_PADRAO
+) -> "pd.DataFrame":
+    """
+    Uma página da busca de texto completo (RepositorioNoticias.buscar) nas notícias
+    sobre inflação publicadas entre `inicio` e `fim` (inclusivo, no fuso de
+    exibição), da mais relevante para a menos relevante, com 'pub_date' já no
+    fuso de exibição.
+    """
+    df = RepositorioNoticias(caminho_db).buscar(
+        consulta, *_limites(inicio, fim), apenas_inflacao=True,
+        limite=tamanho_pagina, deslocamento=(pagina - 1) * tamanho_pagina
+    )
+    return _preparar(df)
@@ -0,0 +1,111 @@
+# datas.py
+"""
+Normalização das datas de publicação dos feeds, usada pelas duas buscas
+(backend/services.py e backend/atualiza_noticias.py) e pela base de notícias.
+
+Os feeds RSS usam RFC 822 ("Mon, 31 Mar 2025 16:30:00 -0300") e os Atom,
+ISO 8601 ("2025-03-31T16:30:00-03:00"); os dois formatos são lidos pelas
+funções rápidas da biblioteca padrão (email.utils e datetime.fromisoformat).
+O parser genérico do dateutil, bem mais lento, só é usado quando ambas falham.
+
+Como cada feed usa sempre o mesmo formato, o último formato reconhecido de
+cada feed é lembrado e testado primeiro na próxima data.
+"""
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+RFC822 = 'rfc822'
+ISO8601 = 'iso8601'
+GERAL = 'geral'
+
+# O parser do email.utils é tolerante demais (ex.: lê "March 31, 2025 4:30 PM" como
+# 04:30): só recebe datas no formato RFC 822; as demais seguem para o dateutil
+_FORMATO_RFC822 = re.compile(
+    r'(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s+(?:[+-]\d{4}|[A-Za-z]{1,5}))?'
+)
+
+
+def _rfc822(texto: str) -> datetime:
+    if not _FORMATO_RFC822.fullmatch(texto):
+        raise ValueError(f"não está no formato RFC 822: {texto!r}")
+    return parsedate_to_datetime(texto)
+
+
+def _iso8601(texto: str) -> datetime:
+    return datetime.fromisoformat(texto)
+
+
+def _geral(texto: str) -> datetime:
+    from dateutil import parser as date_parser
+    return date_parser.parse(texto)
+
+
+_PARSERS: Dict[str, Callable[[str], datetime]] = {RFC822: _rfc822, ISO8601: _iso8601, GERAL: _geral}
+
+# feed_url -> último formato reconhecido
+_formato_por_feed: Dict[str, str] = {}
+
+
+def interpretar_data(texto: Optional[str], feed_url: Optional[str] = None) -> Optional[datetime]:
+    """
+    Converte a data de publicação para datetime com fuso. Datas sem fuso são
+    tratadas como UTC; datas vazias ou inválidas viram None.
+
+    Args:
+        texto: Data como veio do feed.
+        feed_url: Feed de origem, para testar primeiro o formato já detectado nele.
+    """
+    if not texto:
+        return None
+    texto = texto.strip()
+    preferido = _formato_por_feed.get(feed_url, RFC822 if texto[:1].isalpha() else ISO8601)
+    for formato in dict.fromkeys((preferido, RFC822, ISO8601, GERAL)):
+        try:
+            dt = _PARSERS[formato](texto)
+        except (ValueError, TypeError, OverflowError, IndexError):
+            continue
+        if feed_url is not None:
+            _formato_por_feed[feed_url] = formato
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    return None
+
+
+def timestamp_utc(texto: Optional[str], feed_url: Optional[str] = None) -> Optional[int]:
+    """
+    Segundos desde a época (UTC) da data de publicação, ou None.
+    """
+    dt = interpretar_data(texto, feed_url)
+    if dt is None:
+        return None
+    try:
+        return int(dt.timestamp())
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def data_canonica(texto: Optional[str], feed_url: Optional[str] = None) -> str:
+    """
+    Data em ISO 8601 com o fuso original (ex.: "2025-03-31T16:30:00-03:00").
+    Datas que não puderem ser interpretadas são mantidas como vieram; vazias viram "".
+    """
+    dt = interpretar_data(texto, feed_url)
+    if dt is None:
+        return texto or ""
+    return dt.isoformat()
+
+
+def normalizar(texto: Optional[str], feed_url: Optional[str] = None) -> Tuple[str, Optional[int]]:
+    """
+    Data canônica (ver data_canonica) e timestamp UTC, com uma única interpretação do texto.
+    """
+    dt = interpretar_data(texto, feed_url)
+    if dt is None:
+        return texto or "", None
+    try:
+        return dt.isoformat(), int(dt.timestamp())
+    except (OverflowError, OSError, ValueError):
+        return dt.isoformat(), None
@@ -0,0 +1,121 @@
+# duplicatas.py
+"""
+Detecção de notícias quase duplicadas (a mesma matéria de agência publicada em
+vários feeds, com pequenas diferenças no título ou na descrição).
+
+Cada notícia recebe uma impressão SimHash de 64 bits das palavras do título e da
+descrição (minúsculas, sem acentos e sem pontuação). Duas notícias são
+consideradas a mesma matéria quando as impressões diferem em até
+DISTANCIA_MAXIMA bits.
+
+Para não comparar cada notícia com todo o histórico, as impressões são
+divididas em BANDAS = DISTANCIA_MAXIMA + 1 faixas (LSH): duas impressões a até
+DISTANCIA_MAXIMA bits de distância têm, necessariamente, ao menos uma faixa
+idêntica, então só as notícias que compartilham alguma faixa são comparadas.
+
+As notícias de um grupo são classificadas uma única vez (a representante, a
+primeira recebida) e as respostas são copiadas para as demais. Na base, isso é
+feito por RepositorioNoticias; em memória, por AgrupadorDuplicatas (notícias
+que chegam aos poucos, ver backend/pipeline.py).
+"""
+import hashlib
+import string
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+
+from backend.matcher import normalizar_texto
+
+BITS = 64
+# Em textos curtos, trocar uma palavra do título já muda de 5 a 7 bits;
+# matérias diferentes sobre o mesmo tema ficam a 15 bits ou mais
+DISTANCIA_MAXIMA = 8
+BANDAS = DISTANCIA_MAXIMA + 1
+# Limites (bit inicial) de cada faixa; a última fica com o resto da divisão
+_INICIOS = [banda * (BITS // BANDAS) for banda in range(BANDAS)] + [BITS]
+# Notícias publicadas com mais de JANELA_SEGUNDOS de diferença nunca são agrupadas
+# (ex.: "IPCA de março" de anos diferentes)
+JANELA_SEGUNDOS = 3 * 24 * 60 * 60
+
+_SEM_PONTUACAO = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+
+def _hash_palavra(palavra: str) -> int:
+    return int.from_bytes(hashlib.blake2b(palavra.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(texto: str) -> int:
+    """
+    Impressão SimHash de 64 bits (sem sinal) das palavras do texto, com peso pela
+    frequência; 0 para textos sem palavras. Palavras de até duas letras são ignoradas.
+    """
+    import numpy as np
+
+    palavras = Counter(
+        p for p in normalizar_texto(texto or "", dobrar_acentos=True).translate(_SEM_PONTUACAO).split() if len(p) > 2
+    )
+    if not palavras:
+        return 0
+    hashes = np.array([_hash_palavra(p) for p in palavras], dtype='>u8')
+    # Matriz palavras x bits (bit 0 = menos significativo), com +1/-1 por bit
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, BITS)[:, ::-1].astype(np.int64)
+    pesos = np.fromiter(palavras.values(), dtype=np.int64, count=len(palavras)) @ (2 * bits - 1)
+    return int(np.packbits(pesos[::-1] > 0).view('>u8')[0])
+
+
+def texto_noticia(noticia: Dict) -> str:
+    return f"{noticia.get('title') or ''} {noticia.get('description') or ''}"
+
+
+def distancia(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def bandas(impressao: int) -> Iterator[Tuple[int, int]]:
+    """
+    Pares (número da faixa, valor da faixa) usados como chaves do índice LSH.
+    """
+    for banda in range(BANDAS):
+        inicio, fim = _INICIOS[banda], _INICIOS[banda + 1]
+        yield banda, impressao >> inicio & ((1 << (fim - inicio)) - 1)
+
+
+def para_sqlite(impressao: int) -> int:
+    """
+    Converte a impressão (sem sinal) para o INTEGER de 64 bits com sinal do SQLite.
+    """
+    return impressao - (1 << BITS) if impressao >= 1 << (BITS - 1) else impressao
+
+
+def de_sqlite(valor: int) -> int:
+    return valor + (1 << BITS) if valor < 0 else valor
+
+
+class AgrupadorDuplicatas:
+    """
+    Agrupamento incremental de notícias em memória: cada notícia é comparada com as
+    representantes já vistas, na ordem de chegada (usado pela etapa de deduplicação
+    de backend/pipeline.py, que recebe as notícias aos poucos).
+    """
+
+    def __init__(self):
+        self._indice: Dict[Tuple[int, int], List[int]] = {}
+        self._impressoes: List[int] = []
+
+    def adicionar(self, noticia: Dict) -> int:
+        """
+        Retorna a posição (ordem de chegada) da representante do grupo da notícia;
+        a própria posição quando ela não tem duplicatas anteriores.
+        """
+        impressao = simhash(texto_noticia(noticia))
+        posicao = len(self._impressoes)
+        self._impressoes.append(impressao)
+        chaves = list(bandas(impressao))
+        candidatos = sorted({c for chave in chaves for c in self._indice.get(chave, [])})
+        for candidato in candidatos:
+            if distancia(impressao, self._impressoes[candidato]) <= DISTANCIA_MAXIMA:
+                return candidato
+        # Só as representantes entram no índice: os grupos não se encadeiam
+        for chave in chaves:
+            self._indice.setdefault(chave, []).append(posicao)
+        return posicao
+
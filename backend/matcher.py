@@ -0,0 +1,153 @@
+# matcher.py
+"""
+Busca de várias palavras-chave em uma única varredura do texto (Aho-Corasick).
+
+Substitui o laço de uma expressão regular por keyword: o custo da busca passa a
+depender do tamanho do texto e do número de ocorrências, e não da quantidade de
+keywords da taxonomia. As fronteiras de palavra seguem a mesma regra do `\\b`
+das expressões regulares usadas anteriormente.
+"""
+import unicodedata
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+
+def _eh_palavra(caractere: str) -> bool:
+    """
+    Mesmo critério do `\\w` do módulo `re`: letras, dígitos e sublinhado.
+    """
+    return caractere.isalnum() or caractere == '_'
+
+
+def normalizar_texto(texto: str, dobrar_acentos: bool = False) -> str:
+    """
+    Converte o texto para minúsculas e, opcionalmente, remove os acentos
+    ("inflação" -> "inflacao").
+    """
+    texto = texto.lower()
+    if dobrar_acentos:
+        texto = unicodedata.normalize('NFD', texto)
+        texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return texto
+
+
+class MatcherPalavrasChave:
+    """
+    Automato de Aho-Corasick compilado a partir de uma lista de keywords.
+
+    Uso:
+        matcher = MatcherPalavrasChave(keywords, dobrar_acentos=True)
+        matcher.buscar("Alta da inflação pressiona o preço dos alimentos")
+        # -> ['inflação', 'preço dos alimentos']
+    """
+
+    def __init__(self, keywords: List[str], dobrar_acentos: bool = False):
+        self.dobrar_acentos = dobrar_acentos
+        # Remove vazios e duplicatas preservando a ordem original
+        self.keywords = list(dict.fromkeys(k for k in keywords if k and k.strip()))
+
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        # Para cada estado: lista de (índice da keyword, tamanho normalizado)
+        self._saidas: List[List[Tuple[int, int]]] = [[]]
+
+        for indice, keyword in enumerate(self.keywords):
+            self._adicionar(normalizar_texto(keyword.strip(), dobrar_acentos), indice)
+        self._construir_falhas()
+
+    def _adicionar(self, padrao: str, indice: int) -> None:
+        if not padrao:
+            return
+        estado = 0
+        for caractere in padrao:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+                self._transicoes[estado][caractere] = proximo
+            estado = proximo
+        self._saidas[estado].append((indice, len(padrao)))
+
+    def _construir_falhas(self) -> None:
+        # Busca em largura: a falha de um estado é o maior sufixo próprio que também é prefixo
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falha[proximo]]
+
+    def buscar(self, texto: str) -> List[str]:
+        """
+        Retorna todas as keywords encontradas no texto (respeitando fronteiras de
+        palavra), sem repetição e na ordem em que foram informadas ao matcher.
+        """
+        if not texto:
+            return []
+        texto = normalizar_texto(texto, self.dobrar_acentos)
+        transicoes, falhas, saidas = self._transicoes, self._falha, self._saidas
+        tamanho_texto = len(texto)
+        encontrados = set()
+
+        estado = 0
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            for indice, tamanho in saidas[estado]:
+                if indice in encontrados:
+                    continue
+                inicio = posicao - tamanho + 1
+                fim = posicao + 1
+                antes = _eh_palavra(texto[inicio - 1]) if inicio > 0 else False
+                depois = _eh_palavra(texto[fim]) if fim < tamanho_texto else False
+                if antes != _eh_palavra(texto[inicio]) and depois != _eh_palavra(texto[posicao]):
+                    encontrados.add(indice)
+
+        return [self.keywords[indice] for indice in sorted(encontrados)]
+
+    def como_dict(self) -> Dict[str, Any]:
+        """
+        Automato compilado em tipos simples (serializável em JSON), ver de_dict.
+        """
+        return {
+            'keywords': self.keywords,
+            'dobrar_acentos': self.dobrar_acentos,
+            'transicoes': self._transicoes,
+            'falha': self._falha,
+            'saidas': self._saidas,
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "MatcherPalavrasChave":
+        """
+        Reconstrói o matcher gravado por como_dict, sem recompilar o automato.
+        Levanta ValueError se os dados estiverem incompletos ou inconsistentes.
+        """
+        matcher = cls.__new__(cls)
+        try:
+            matcher.keywords = [str(k) for k in dados['keywords']]
+            matcher.dobrar_acentos = bool(dados['dobrar_acentos'])
+            matcher._transicoes = [{str(c): int(e) for c, e in t.items()} for t in dados['transicoes']]
+            matcher._falha = [int(e) for e in dados['falha']]
+            matcher._saidas = [[(int(i), int(n)) for i, n in saidas] for saidas in dados['saidas']]
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            raise ValueError(f"matcher inválido: {e}") from e
+        estados = len(matcher._transicoes)
+        if not (estados == len(matcher._falha) == len(matcher._saidas)) or any(
+            not 0 <= e < estados for t in matcher._transicoes for e in t.values()
+        ) or any(not 0 <= e < estados for e in matcher._falha) or any(
+            not 0 <= i < len(matcher.keywords) for saidas in matcher._saidas for i, _ in saidas
+        ):
+            raise ValueError("matcher inválido: estados inconsistentes")
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self.keywords)
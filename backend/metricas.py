@@ -0,0 +1,275 @@
+# metricas.py
+"""
+Métricas das execuções da coleta e da classificação, por execução e por feed.
+
+Uma execução (ex.: uma rodada de backend/atualiza_noticias.py) é aberta com
+`execucao(nome)`; enquanto ela está aberta, os pontos instrumentados registram:
+  - por feed: latência do download, bytes baixados, status HTTP, itens lidos,
+    tempo de parse, notícias com keywords e tempo da busca de keywords;
+  - chamadas à API: latência, espera no limitador de taxa, novas tentativas,
+    erros e tokens de prompt e de resposta (resposta.usage);
+  - base: notícias inseridas e classificadas, descartes do pré-filtro;
+  - duração de cada etapa da execução (cronometro).
+Fora de uma execução (ex.: buscas do app), os registros não fazem nada.
+
+A execução atual fica em uma ContextVar, e não em uma variável global: no modo
+contínuo, a coleta e a classificação rodam ao mesmo tempo em threads diferentes,
+cada uma com a sua execução. As threads criadas pelo pipeline herdam a execução
+de quem as criou (ver no_contexto).
+
+Ao fim de cada execução, as métricas são exportadas para data/metricas/:
+  - <nome>.prom: valores da última execução no formato texto do Prometheus
+    (para o textfile collector do node_exporter);
+  - historico.jsonl: uma linha JSON por execução, mantidas as últimas
+    MAX_EXECUCOES (lido pela página de métricas).
+"""
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.cache_feeds import escrita_atomica
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DIR_PADRAO = os.path.join('data', 'metricas')
+HISTORICO = 'historico.jsonl'
+MAX_EXECUCOES = 500
+PREFIXO = 'alerta_inflacao'
+
+
+class Execucao:
+    """
+    Acumulador de uma execução, seguro para uso por várias threads.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.inicio = time.time()
+        self.duracao: Optional[float] = None
+        self.totais: Dict[str, float] = {}
+        self.feeds: Dict[str, Dict[str, float]] = {}
+        self.etapas: Dict[str, float] = {}
+        self._relogio = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def somar(self, **valores: float) -> None:
+        with self._lock:
+            for chave, valor in valores.items():
+                self.totais[chave] = self.totais.get(chave, 0) + valor
+
+    def somar_feed(self, feed_url: str, **valores: float) -> None:
+        with self._lock:
+            feed = self.feeds.setdefault(feed_url, {})
+            for chave, valor in valores.items():
+                feed[chave] = feed.get(chave, 0) + valor
+
+    def definir_feed(self, feed_url: str, **valores: float) -> None:
+        with self._lock:
+            self.feeds.setdefault(feed_url, {}).update(valores)
+
+    def somar_etapa(self, etapa: str, segundos: float) -> None:
+        with self._lock:
+            self.etapas[etapa] = self.etapas.get(etapa, 0) + segundos
+
+    def encerrar(self) -> None:
+        self.duracao = time.perf_counter() - self._relogio
+
+    def como_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'execucao': self.nome,
+                'inicio': datetime.fromtimestamp(self.inicio, tz=timezone.utc).isoformat(),
+                'duracao_segundos': self.duracao,
+                'etapas': dict(self.etapas),
+                'totais': dict(self.totais),
+                'feeds': {url: dict(valores) for url, valores in self.feeds.items()},
+            }
+
+
+_execucao: contextvars.ContextVar[Optional[Execucao]] = contextvars.ContextVar('execucao_metricas', default=None)
+
+
+@contextmanager
+def execucao(nome: str, diretorio: Optional[str] = DIR_PADRAO) -> Iterator[Execucao]:
+    """
+    Abre uma execução para o contexto atual (e as threads criadas com no_contexto).
+    Ao sair, exporta as métricas para `diretorio` (None: não exporta), mesmo que a
+    execução termine com erro.
+    """
+    atual = Execucao(nome)
+    token = _execucao.set(atual)
+    try:
+        yield atual
+    finally:
+        _execucao.reset(token)
+        atual.encerrar()
+        if diretorio:
+            try:
+                exportar(atual, diretorio)
+            except OSError as e:
+                print(f"Não foi possível gravar as métricas em {diretorio}: {e}")
+
+
+def execucao_atual() -> Optional[Execucao]:
+    return _execucao.get()
+
+
+def somar(**valores: float) -> None:
+    atual = _execucao.get()
+    if atual is not None:
+        atual.somar(**valores)
+
+
+def somar_feed(feed_url: str, **valores: float) -> None:
+    atual = _execucao.get()
+    if atual is not None:
+        atual.somar_feed(feed_url, **valores)
+
+
+def definir_feed(feed_url: str, **valores: float) -> None:
+    atual = _execucao.get()
+    if atual is not None:
+        atual.definir_feed(feed_url, **valores)
+
+
+@contextmanager
+def cronometro(etapa: str) -> Iterator[None]:
+    """
+    Soma à etapa o tempo gasto dentro do bloco.
+    """
+    atual = _execucao.get()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if atual is not None:
+            atual.somar_etapa(etapa, time.perf_counter() - inicio)
+
+
+def no_contexto(funcao: Callable) -> Callable:
+    """
+    `funcao` ligada ao contexto atual, para ser executada em outra thread
+    (Thread(target=...) ou executor.submit) registrando na mesma execução.
+
+    Cada chamada roda em uma cópia própria do contexto: um mesmo Context não pode
+    ser usado por duas threads ao mesmo tempo, e a função retornada pode ser
+    submetida várias vezes a um executor.
+    """
+    contexto = contextvars.copy_context()
+
+    def executar(*args: Any, **kwargs: Any) -> Any:
+        return contexto.copy().run(funcao, *args, **kwargs)
+
+    return executar
+
+
+##### Exportação #####
+_historico_lock = threading.Lock()
+
+
+def _rotulo(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _valor(valor: float) -> str:
+    return repr(float(valor))
+
+
+def formato_prometheus(dados: Dict[str, Any]) -> str:
+    """
+    Métricas de uma execução (ver Execucao.como_dict) no formato texto do
+    Prometheus, todas como gauges com o rótulo `execucao`.
+    """
+    nome = _rotulo(dados['execucao'])
+    linhas: List[str] = []
+
+    def gauge(metrica: str, descricao: str, amostras: List[Tuple[str, float]]) -> None:
+        metrica = f"{PREFIXO}_{metrica}"
+        linhas.append(f"# HELP {metrica} {descricao}")
+        linhas.append(f"# TYPE {metrica} gauge")
+        linhas.extend(f"{metrica}{{{rotulos}}} {_valor(valor)}" for rotulos, valor in amostras)
+
+    base = f'execucao="{nome}"'
+    inicio = datetime.fromisoformat(dados['inicio']).timestamp()
+    gauge("execucao_inicio_timestamp_segundos", "Início da última execução.", [(base, inicio)])
+    gauge("execucao_duracao_segundos", "Duração da última execução.", [(base, dados['duracao_segundos'] or 0)])
+    if dados['etapas']:
+        gauge("etapa_duracao_segundos", "Tempo de cada etapa na última execução.", [
+            (f'{base},etapa="{_rotulo(etapa)}"', segundos) for etapa, segundos in sorted(dados['etapas'].items())
+        ])
+    for chave, valor in sorted(dados['totais'].items()):
+        gauge(chave, f"{chave} na última execução.", [(base, valor)])
+    chaves_feed = sorted({chave for valores in dados['feeds'].values() for chave in valores})
+    for chave in chaves_feed:
+        gauge(f"feed_{chave}", f"{chave} por feed na última execução.", [
+            (f'{base},feed="{_rotulo(url)}"', valores[chave])
+            for url, valores in sorted(dados['feeds'].items()) if chave in valores
+        ])
+    return "\n".join(linhas) + "\n"
+
+
+def exportar(atual: Execucao, diretorio: str = DIR_PADRAO) -> None:
+    """
+    Grava o arquivo .prom da execução e acrescenta a execução ao histórico,
+    descartando as mais antigas além de MAX_EXECUCOES.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    dados = atual.como_dict()
+    escrita_atomica(os.path.join(diretorio, f"{atual.nome}.prom"), formato_prometheus(dados).encode('utf-8'))
+
+    caminho = os.path.join(diretorio, HISTORICO)
+    with _historico_lock:
+        linhas = _linhas_historico(caminho)
+        linhas.append(json.dumps(dados, ensure_ascii=False))
+        escrita_atomica(caminho, ("\n".join(linhas[-MAX_EXECUCOES:]) + "\n").encode('utf-8'))
+
+
+def _linhas_historico(caminho: str) -> List[str]:
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return [linha.strip() for linha in f if linha.strip()]
+    except OSError:
+        return []
+
+
+def ler_historico(diretorio: str = DIR_PADRAO) -> List[Dict[str, Any]]:
+    """
+    Execuções do histórico, da mais antiga para a mais recente (linhas inválidas são ignoradas).
+    """
+    execucoes = []
+    for linha in _linhas_historico(os.path.join(diretorio, HISTORICO)):
+        try:
+            execucoes.append(json.loads(linha))
+        except ValueError:
+            continue
+    return execucoes
+
+
+def tabelas_historico(execucoes: List[Dict[str, Any]]) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    """
+    Histórico em duas tabelas: uma linha por execução (início, execucao, duração,
+    'etapa:<nome>' e os totais) e uma linha por execução e feed.
+    """
+    import pandas as pd
+
+    por_execucao, por_feed = [], []
+    for dados in execucoes:
+        inicio = pd.Timestamp(dados['inicio'])
+        por_execucao.append({
+            'inicio': inicio,
+            'execucao': dados['execucao'],
+            'duracao_segundos': dados.get('duracao_segundos'),
+            **{f"etapa:{etapa}": segundos for etapa, segundos in dados.get('etapas', {}).items()},
+            **dados.get('totais', {}),
+        })
+        por_feed += [
+            {'inicio': inicio, 'execucao': dados['execucao'], 'feed_url': url, **valores}
+            for url, valores in dados.get('feeds', {}).items()
+        ]
+    return pd.DataFrame(por_execucao), pd.DataFrame(por_feed)
@@ -0,0 +1,119 @@
+# nuvem.py
+"""
+Nuvem de palavras da página inicial.
+
+wordcloud, nltk, numpy e PIL só são importados quando uma nuvem precisa ser
+renderizada; com o PNG no cache (backend/cache_imagens.py), a página não os carrega.
+"""
+import io
+import os
+from datetime import date
+from typing import TYPE_CHECKING, Optional
+
+from backend.cache_imagens import chave_nuvem, obter_cache_imagens
+from backend.repositorio import DB_PADRAO, RepositorioNoticias
+
+if TYPE_CHECKING:
+    from wordcloud import WordCloud
+
+# Se ainda não baixou as stopwords do NLTK, execute uma vez:
+# import nltk; nltk.download('stopwords')
+
+
+def carregar_stopwords(caminho: str) -> set:
+    """
+    Carrega as stopwords de um arquivo, onde cada linha contém uma palavra.
+    """
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            stopwords_lista = [linha.strip() for linha in f if linha.strip()]
+        return set(stopwords_lista)
+    except Exception as e:
+        raise ValueError("Erro ao carregar stopwords do arquivo: " + str(e))
+
+
+def gerar_nuvem_palavras(
+    db_path: str = DB_PADRAO,
+    stopwords_path: str = None,
+    mask_path: str = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> "WordCloud":
+    '''
+    Soma, no indice de frequencias da base, as contagens diarias de palavras das
+    noticias que abordam a inflacao e gera uma WordCloud estilizada.
+
+    Parametros:
+    - db_path: caminho para a base de noticias (SQLite).
+    - stopwords_path: caminho para um arquivo de stopwords customizado (opcional).
+    - mask_path: caminho para uma imagem que servira de mascara para a nuvem (opcional).
+    - start_date: data inicial para filtrar as noticias (opcional).
+    - end_date: data final para filtrar as noticias (opcional).
+
+    Retorna:
+    - Um objeto WordCloud.
+    '''
+    # Dependências pesadas importadas só quando uma nuvem precisa ser renderizada
+    import numpy as np
+    from PIL import Image
+    from wordcloud import WordCloud
+
+    # Contagens ja tokenizadas (minusculas, sem pontuacao), somadas so nos dias do periodo
+    frequencias = RepositorioNoticias(db_path).frequencias_palavras(inicio=start_date, fim=end_date)
+
+    if stopwords_path and os.path.exists(stopwords_path):
+        stopwords_pt = carregar_stopwords(stopwords_path)
+    else:
+        from nltk.corpus import stopwords
+        stopwords_pt = set(stopwords.words('portuguese'))
+
+    # Palavras de uma letra sao descartadas, como faz WordCloud.generate
+    frequencias = {
+        palavra: contagem for palavra, contagem in frequencias.items()
+        if palavra not in stopwords_pt and len(palavra) > 1
+    }
+    if not frequencias:
+        raise ValueError("Nenhuma noticia relevante encontrada para o periodo selecionado.")
+
+    mask = None
+    if mask_path and os.path.exists(mask_path):
+        mask = np.array(Image.open(mask_path))
+
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        colormap='Reds',
+        mask=mask,
+        contour_width=1,
+        contour_color='steelblue',
+        collocations=False
+    ).generate_from_frequencies(frequencias)
+
+    return wordcloud
+
+
+def gerar_png_nuvem_palavras(
+    db_path: str = DB_PADRAO,
+    stopwords_path: str = None,
+    mask_path: str = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> bytes:
+    '''
+    Retorna a nuvem de palavras do periodo ja renderizada em PNG, pronta para st.image.
+
+    A imagem vem do cache de nuvens (memoria e disco) quando o periodo, as
+    stopwords, a mascara e a versao da base sao os mesmos de uma geracao anterior;
+    caso contrario, e gerada por gerar_nuvem_palavras e guardada no cache.
+    '''
+    cache = obter_cache_imagens()
+    chave = chave_nuvem(start_date, end_date, stopwords_path, mask_path, RepositorioNoticias(db_path).versao())
+    png = cache.obter(chave)
+    if png is None:
+        wordcloud = gerar_nuvem_palavras(db_path, stopwords_path, mask_path, start_date, end_date)
+        buffer = io.BytesIO()
+        wordcloud.to_image().save(buffer, format='PNG')
+        png = buffer.getvalue()
+        cache.salvar(chave, png)
+    return png
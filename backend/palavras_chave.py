@@ -0,0 +1,236 @@
+# palavras_chave.py
+"""
+Registro das palavras-chave da busca, com o matcher (backend/matcher.py) já compilado.
+
+As keywords vêm da lista padrão e da taxonomia do IPCA em CSV (colunas
+categoria_grupo, categoria_subgrupo, categoria_item e categoria_subitem). Cada
+keyword guarda o nível da taxonomia de onde veio ('padrao' para as da lista
+padrão; no CSV, vale o nível mais geral em que ela aparece), e as buscas informam
+o nível de cada keyword encontrada.
+
+O registro é identificado por uma impressão (SHA-256) do conteúdo do CSV e da
+lista padrão, e montado uma única vez:
+  - no processo, fica em memória e é compartilhado por todas as sessões do Streamlit;
+  - em disco (data/cache/keywords/<impressão>.json), com os matchers compilados,
+    para que outros processos (ex.: a rotina de atualização) e reinícios do app
+    não refaçam a leitura do CSV nem a compilação. O arquivo é JSON (ler o cache
+    não executa código) e são mantidos só os MAX_ARQUIVOS mais recentes.
+Alterar o CSV muda a impressão, e o registro é remontado automaticamente.
+
+Registros de listas avulsas (ex.: as keywords digitadas no buscador) ficam só em
+memória, limitados aos MAX_AVULSOS usados mais recentemente.
+"""
+import os
+import csv
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from backend.cache_feeds import escrita_atomica
+from backend.matcher import MatcherPalavrasChave
+
+CSV_PADRAO = os.path.join('data', 'keywords', 'ipca_alimentacao_bebidas.csv')
+CACHE_DIR_PADRAO = os.path.join('data', 'cache', 'keywords')
+
+KEYWORDS_PADRAO = ['inflação', 'preço dos alimentos', 'alta dos preços', 'IPCA', 'alimentação', 'bebidas']
+
+NIVEL_PADRAO = 'padrao'
+# Coluna do CSV -> nível da taxonomia, do mais geral para o mais específico
+COLUNAS_NIVEIS = {
+    'categoria_grupo': 'grupo',
+    'categoria_subgrupo': 'subgrupo',
+    'categoria_item': 'item',
+    'categoria_subitem': 'subitem',
+}
+
+# Muda quando o formato do registro em disco muda (invalida os arquivos antigos)
+_FORMATO = 2
+# Registros mantidos em disco e registros de listas avulsas mantidos em memória
+MAX_ARQUIVOS = 8
+MAX_AVULSOS = 32
+
+_lock = threading.Lock()
+# impressão -> registro do CSV
+_registros: Dict[str, "RegistroPalavrasChave"] = {}
+# impressão -> registro de lista avulsa, em ordem de uso (LRU)
+_avulsos: "OrderedDict[str, RegistroPalavrasChave]" = OrderedDict()
+# (caminho absoluto, mtime, tamanho do CSV, keywords padrão) -> impressão, para não reler o CSV a cada rerun
+_impressoes_csv: Dict[Tuple[str, int, int, Tuple[str, ...]], str] = {}
+
+
+def ler_taxonomia(csv_filepath: str) -> Dict[str, str]:
+    """
+    Keywords do CSV da taxonomia, sem repetição e na ordem das linhas, com o nível
+    mais geral em que cada uma aparece.
+    """
+    niveis: Dict[str, str] = {}
+    with open(csv_filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        for linha in csv.DictReader(f):
+            for coluna, nivel in COLUNAS_NIVEIS.items():
+                keyword = (linha.get(coluna) or "").strip()
+                if keyword:
+                    niveis.setdefault(keyword, nivel)
+    return niveis
+
+
+class RegistroPalavrasChave:
+    """
+    Keywords com os respectivos níveis e os matchers compilados (com e sem dobra de acentos).
+    Com `persistir`, o registro é gravado em disco (ver obter_registro).
+    """
+
+    def __init__(self, niveis: Dict[str, str], impressao: str = "", persistir: bool = False):
+        self.niveis = niveis
+        self.impressao = impressao
+        self.persistir = persistir
+        self._matchers: Dict[bool, MatcherPalavrasChave] = {}
+
+    @property
+    def keywords(self) -> List[str]:
+        return list(self.niveis)
+
+    def matcher(self, dobrar_acentos: bool = False) -> MatcherPalavrasChave:
+        """
+        Matcher das keywords, compilado no primeiro uso (e gravado junto com o registro em disco).
+        """
+        matcher = self._matchers.get(dobrar_acentos)
+        if matcher is None:
+            matcher = self._matchers[dobrar_acentos] = MatcherPalavrasChave(self.keywords, dobrar_acentos)
+            _salvar(self)
+        return matcher
+
+    def buscar(self, texto: str, dobrar_acentos: bool = False) -> List[Tuple[str, str]]:
+        """
+        Pares (keyword, nível) das keywords encontradas no texto.
+        """
+        return [(keyword, self.niveis[keyword]) for keyword in self.matcher(dobrar_acentos).buscar(texto)]
+
+    def __len__(self) -> int:
+        return len(self.niveis)
+
+
+def _caminho(impressao: str) -> str:
+    return os.path.join(CACHE_DIR_PADRAO, impressao + '.json')
+
+
+def _salvar(registro: RegistroPalavrasChave) -> None:
+    if not (registro.impressao and registro.persistir):
+        return
+    dados = {
+        'formato': _FORMATO,
+        'niveis': registro.niveis,
+        'matchers': {str(int(dobrar)): matcher.como_dict() for dobrar, matcher in registro._matchers.items()},
+    }
+    try:
+        os.makedirs(CACHE_DIR_PADRAO, exist_ok=True)
+        escrita_atomica(_caminho(registro.impressao), json.dumps(dados, ensure_ascii=False).encode('utf-8'))
+        _limpar_cache(manter=registro.impressao)
+    except OSError as e:
+        print(f"Não foi possível gravar o registro de keywords em disco: {e}")
+
+
+def _limpar_cache(manter: str) -> None:
+    # Mantém os MAX_ARQUIVOS registros gravados mais recentemente (CSVs antigos e formatos anteriores saem)
+    arquivos = [os.path.join(CACHE_DIR_PADRAO, nome) for nome in os.listdir(CACHE_DIR_PADRAO)]
+    arquivos = [a for a in arquivos if os.path.isfile(a) and a != _caminho(manter)]
+    arquivos.sort(key=os.path.getmtime, reverse=True)
+    for arquivo in arquivos[MAX_ARQUIVOS - 1:]:
+        os.remove(arquivo)
+
+
+def _carregar(impressao: str) -> Optional[RegistroPalavrasChave]:
+    try:
+        with open(_caminho(impressao), 'r', encoding='utf-8') as f:
+            dados: Dict[str, Any] = json.load(f)
+        if dados.get('formato') != _FORMATO:
+            return None
+        registro = RegistroPalavrasChave({str(k): str(v) for k, v in dados['niveis'].items()}, impressao, persistir=True)
+        for dobrar, matcher in dados['matchers'].items():
+            registro._matchers[dobrar == '1'] = MatcherPalavrasChave.de_dict(matcher)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return registro
+
+
+def _impressao(*partes: bytes) -> str:
+    h = hashlib.sha256(str(_FORMATO).encode('utf-8'))
+    for parte in partes:
+        h.update(hashlib.sha256(parte).digest())
+    return h.hexdigest()
+
+
+def _obter(impressao: str, montar) -> RegistroPalavrasChave:
+    # Chamado com o lock: memória, depois disco, e só então monta
+    registro = _registros.get(impressao)
+    if registro is None:
+        registro = _carregar(impressao)
+        if registro is None:
+            registro = RegistroPalavrasChave(montar(), impressao, persistir=True)
+            _salvar(registro)
+        _registros[impressao] = registro
+    return registro
+
+
+def obter_registro(
+    csv_filepath: Optional[str] = CSV_PADRAO,
+    keywords_padrao: Optional[List[str]] = None
+) -> RegistroPalavrasChave:
+    """
+    Registro com as keywords padrão e as da taxonomia em `csv_filepath` (se o arquivo
+    existir). Montado uma vez por conteúdo do CSV; as chamadas seguintes, inclusive
+    de outras sessões, devolvem o mesmo objeto.
+    """
+    keywords_padrao = KEYWORDS_PADRAO if keywords_padrao is None else keywords_padrao
+    existe = bool(csv_filepath) and os.path.exists(csv_filepath)
+    chave_csv = None
+    if existe:
+        estado = os.stat(csv_filepath)
+        chave_csv = (os.path.abspath(csv_filepath), estado.st_mtime_ns, estado.st_size, tuple(keywords_padrao))
+
+    def montar() -> Dict[str, str]:
+        niveis = ler_taxonomia(csv_filepath) if existe else {}
+        padrao = [k.strip() for k in keywords_padrao if k and k.strip()]
+        # Lista padrão primeiro, depois a taxonomia na ordem do CSV
+        return {k: niveis.get(k, NIVEL_PADRAO) for k in dict.fromkeys(padrao + list(niveis))}
+
+    with _lock:
+        # Rerun com o CSV inalterado: nem relê o arquivo
+        impressao = _impressoes_csv.get(chave_csv) if chave_csv else None
+        if impressao is None:
+            conteudo = b""
+            if existe:
+                with open(csv_filepath, 'rb') as f:
+                    conteudo = f.read()
+            impressao = _impressao(conteudo, "\n".join(keywords_padrao).encode('utf-8'))
+            if chave_csv:
+                _impressoes_csv[chave_csv] = impressao
+        return _obter(impressao, montar)
+
+
+def registro_de_lista(keywords: List[str]) -> RegistroPalavrasChave:
+    """
+    Registro de uma lista avulsa de keywords (todas no nível 'padrao'), compartilhado
+    por todas as chamadas com a mesma lista. Fica só em memória (não é gravado em disco).
+    """
+    impressao = _impressao("\n".join(keywords).encode('utf-8'))
+    with _lock:
+        registro = _avulsos.get(impressao)
+        if registro is None:
+            registro = RegistroPalavrasChave({k.strip(): NIVEL_PADRAO for k in keywords if k and k.strip()}, impressao)
+            _avulsos[impressao] = registro
+            while len(_avulsos) > MAX_AVULSOS:
+                _avulsos.popitem(last=False)
+        else:
+            _avulsos.move_to_end(impressao)
+        return registro
+
+
+def como_registro(keywords: Union[RegistroPalavrasChave, List[str]]) -> RegistroPalavrasChave:
+    """
+    Aceita um registro pronto ou uma lista de keywords (ver registro_de_lista).
+    """
+    if isinstance(keywords, RegistroPalavrasChave):
+        return keywords
+    return registro_de_lista(list(keywords))
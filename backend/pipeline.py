@@ -0,0 +1,459 @@
+# pipeline.py
+"""
+Pipeline de busca em etapas: download -> parse -> keywords -> duplicatas ->
+pré-filtro -> classificação -> consumidor.
+
+Cada etapa é um gerador que recebe o iterador da etapa anterior e roda na sua
+própria thread; as etapas são ligadas por filas limitadas (CAPACIDADE_FILA), então
+uma etapa lenta (ex.: a API) segura as anteriores em vez de acumular itens na
+memória. O consumidor recebe os resultados assim que cada um fica pronto: a
+primeira notícia classificada aparece depois do primeiro feed baixado e de uma
+chamada à API, e não ao fim de toda a busca.
+
+Eventos que percorrem o pipeline:
+  - ResultadoFeed (backend/rss.py), produzido pelo download;
+  - dicionários de item/notícia (title, description, link, pub_date, feed_url, ...);
+  - FimFeed, ao fim de cada feed, repassado pelas etapas seguintes. Na etapa de
+    classificação, o FimFeed só sai depois de todas as notícias daquele feed.
+
+Uso:
+    eventos = encadear(
+        etapa_busca(feed_urls, cache=CacheFeeds()),
+        etapa_parse(), etapa_keywords(obter_registro()), etapa_duplicatas(),
+        etapa_prefiltro(obter_prefiltro()), etapa_classificacao(classificar_artigo),
+    )
+    for evento in eventos:
+        ...
+
+As três primeiras etapas (download, parse e keywords) são montadas por etapas_busca.
+Usado pelas duas buscas (backend/services.py e backend/atualiza_noticias.py) e
+pela página do buscador, que exibe cada notícia assim que ela é classificada.
+"""
+import time
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from backend import metricas
+from backend.cache_feeds import CacheFeeds
+from backend.datas import data_canonica
+from backend.duplicatas import AgrupadorDuplicatas
+from backend.palavras_chave import RegistroPalavrasChave, como_registro
+from backend.repositorio import ORIGEM_PREFILTRO, PERGUNTAS
+from backend.rss import MAX_WORKERS_PADRAO, ResultadoFeed, buscar_feed, imprimir_latencias, iterar_itens, obter_sessao
+
+if TYPE_CHECKING:
+    from backend.prefiltro import PreFiltro
+
+# Itens em espera entre duas etapas
+CAPACIDADE_FILA = 64
+# Classificações em andamento ou na fila do pool
+MAX_WORKERS_CLASSIFICACAO = 8
+# Notícias por chamada ao pré-filtro (um lote também é fechado ao fim de cada feed)
+TAMANHO_LOTE_PREFILTRO = 64
+
+Etapa = Callable[[Iterator[Any]], Iterator[Any]]
+
+# Chave temporária que liga uma duplicata à sua representante, entre a etapa de
+# duplicatas e a de classificação
+_REPRESENTANTE = '_representante'
+
+
+@dataclass
+class FimFeed:
+    """
+    Marca o fim dos itens de um feed.
+
+    Atributos:
+      - feed_url: URL do feed.
+      - itens: identificadores (link ou, na falta, título) de todos os itens do feed; None
+        quando o feed não pôde ser lido ou foi ignorado por não ter mudado (304).
+    """
+    feed_url: str
+    itens: Optional[Set[str]] = None
+
+
+class _Erro:
+    def __init__(self, erro: BaseException):
+        self.erro = erro
+
+
+class _Fim:
+    pass
+
+
+class _Interrompido(Exception):
+    pass
+
+
+def _colocar(fila: queue.Queue, item: Any, parar: threading.Event) -> None:
+    while True:
+        if parar.is_set():
+            raise _Interrompido()
+        try:
+            fila.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _ler(fila: queue.Queue, parar: threading.Event) -> Iterator[Any]:
+    while True:
+        try:
+            item = fila.get(timeout=0.1)
+        except queue.Empty:
+            if parar.is_set():
+                raise _Interrompido()
+            continue
+        if isinstance(item, _Fim):
+            return
+        if isinstance(item, _Erro):
+            raise item.erro
+        yield item
+
+
+def _executar(itens: Iterable[Any], saida: queue.Queue, parar: threading.Event) -> None:
+    try:
+        for item in itens:
+            _colocar(saida, item, parar)
+        _colocar(saida, _Fim(), parar)
+    except _Interrompido:
+        pass
+    except Exception as e:
+        # O erro segue pelo pipeline e é levantado para o consumidor
+        try:
+            _colocar(saida, _Erro(e), parar)
+        except _Interrompido:
+            pass
+
+
+def encadear(fonte: Iterable[Any], *etapas: Etapa, capacidade: int = CAPACIDADE_FILA) -> Iterator[Any]:
+    """
+    Executa `fonte` e cada etapa em uma thread, ligadas por filas de até `capacidade`
+    itens, e produz os itens da última etapa. Erros de qualquer etapa são levantados
+    aqui. Se o consumidor parar antes do fim, as etapas são encerradas.
+    """
+    parar = threading.Event()
+    fila: queue.Queue = queue.Queue(maxsize=capacidade)
+    # As threads registram métricas na execução de quem montou o pipeline (backend/metricas.py)
+    threads = [threading.Thread(target=metricas.no_contexto(_executar), args=(fonte, fila, parar), daemon=True)]
+    for etapa in etapas:
+        saida: queue.Queue = queue.Queue(maxsize=capacidade)
+        threads.append(threading.Thread(
+            target=metricas.no_contexto(_executar), args=(etapa(_ler(fila, parar)), saida, parar), daemon=True
+        ))
+        fila = saida
+    for thread in threads:
+        thread.start()
+    try:
+        yield from _ler(fila, parar)
+    finally:
+        parar.set()
+        for thread in threads:
+            thread.join()
+
+
+##### Etapas #####
+def etapa_busca(
+    feed_urls: List[str],
+    max_workers: int = MAX_WORKERS_PADRAO,
+    timeout: float = 10,
+    cache: Optional[CacheFeeds] = None
+) -> Iterator[ResultadoFeed]:
+    """
+    Baixa os feeds em paralelo (sessão compartilhada, ver backend/rss.py) e produz
+    cada ResultadoFeed assim que o download termina.
+    """
+    if not feed_urls:
+        return
+    sessao = obter_sessao()
+    inicio = time.perf_counter()
+    resultados = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(feed_urls)))) as executor:
+        futuros = [executor.submit(buscar_feed, url, sessao, timeout, cache) for url in feed_urls]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            metricas.somar_feed(
+                resultado.feed_url,
+                busca_segundos=resultado.latencia,
+                # 304: o corpo veio do cache em disco, nada foi baixado
+                bytes=0 if resultado.nao_modificado else len(resultado.conteudo or b""),
+                erros=int(resultado.erro is not None),
+            )
+            metricas.definir_feed(resultado.feed_url, status_http=resultado.status or 0)
+            yield resultado
+    imprimir_latencias(resultados, time.perf_counter() - inicio)
+
+
+def etapa_parse(ignorar_nao_modificados: bool = False) -> Etapa:
+    """
+    Parse incremental de cada feed baixado: um dicionário por item (title, description,
+    link, pub_date como veio do feed, feed_url), seguido de um FimFeed.
+    Feeds com erro, e os que responderam 304 quando `ignorar_nao_modificados`, produzem só o FimFeed.
+    """
+    def etapa(resultados: Iterator[ResultadoFeed]) -> Iterator[Any]:
+        for resultado in resultados:
+            url = resultado.feed_url
+            print(f"Analisando feed: {url}")
+            if resultado.erro is not None:
+                print(f"Erro ao tentar acessar {url}: {resultado.erro}")
+                yield FimFeed(url)
+                continue
+            if resultado.nao_modificado and ignorar_nao_modificados:
+                print(f"Feed sem alterações desde a última busca: {url}")
+                yield FimFeed(url)
+                continue
+            if resultado.conteudo is None:
+                print(f"Falha ao acessar feed: {url}, status: {resultado.status}")
+                yield FimFeed(url)
+                continue
+
+            itens: Set[str] = set()
+            # Tempo de parse: só o gasto dentro do parser, sem a espera pelas etapas seguintes
+            parse_segundos = 0.0
+            registros = iterar_itens(resultado.conteudo)
+            try:
+                while True:
+                    inicio = time.perf_counter()
+                    registro = next(registros, None)
+                    parse_segundos += time.perf_counter() - inicio
+                    if registro is None:
+                        break
+                    itens.add(registro['link'] or registro['title'])
+                    registro['feed_url'] = url
+                    yield registro
+            except ET.ParseError as e:
+                print(f"Erro de parse XML no feed {url}: {e}")
+                metricas.somar_feed(url, parse_segundos=parse_segundos, erros=1)
+                yield FimFeed(url)
+                continue
+            print(f"Foram encontrados {len(itens)} itens no feed {url}.")
+            metricas.somar_feed(url, parse_segundos=parse_segundos, itens=len(itens))
+            yield FimFeed(url, itens)
+    return etapa
+
+
+def etapa_keywords(registro: RegistroPalavrasChave, dobrar_acentos: bool = False) -> Etapa:
+    """
+    Mantém só os itens que contêm alguma keyword do registro (backend/palavras_chave.py),
+    com a data normalizada (ISO 8601, ver backend/datas.py). 'matched_keyword' traz a
+    primeira keyword encontrada e 'matched_keywords' todas elas, separadas por "; ";
+    'matched_level' e 'matched_levels' trazem os níveis da taxonomia correspondentes
+    ('padrao', 'grupo', 'subgrupo', 'item' ou 'subitem').
+    """
+    matcher = registro.matcher(dobrar_acentos)
+    niveis = registro.niveis
+
+    def etapa(eventos: Iterator[Any]) -> Iterator[Any]:
+        # Por feed: (notícias com keywords, segundos na busca), registrados no FimFeed
+        parciais: Dict[str, List[float]] = {}
+        for evento in eventos:
+            if isinstance(evento, FimFeed):
+                correspondencias, segundos = parciais.pop(evento.feed_url, (0, 0.0))
+                metricas.somar_feed(evento.feed_url, correspondencias=correspondencias, keywords_segundos=segundos)
+                yield evento
+                continue
+            inicio = time.perf_counter()
+            encontradas = matcher.buscar(f"{evento['title']} {evento['description']}")
+            parcial = parciais.setdefault(evento['feed_url'], [0, 0.0])
+            parcial[1] += time.perf_counter() - inicio
+            if not encontradas:
+                continue
+            parcial[0] += 1
+            yield {
+                'title': evento['title'],
+                'description': evento['description'],
+                'link': evento['link'],
+                'pub_date': data_canonica(evento['pub_date'], evento['feed_url']),
+                'feed_url': evento['feed_url'],
+                'matched_keyword': encontradas[0],
+                'matched_keywords': "; ".join(encontradas),
+                'matched_level': niveis[encontradas[0]],
+                'matched_levels': "; ".join(niveis[keyword] for keyword in encontradas),
+            }
+    return etapa
+
+
+def etapa_duplicatas() -> Etapa:
+    """
+    Agrupa as quase duplicatas (backend/duplicatas.py): cada duplicata é ligada à
+    primeira notícia do seu grupo, e só a representante é classificada.
+    """
+    def etapa(eventos: Iterator[Any]) -> Iterator[Any]:
+        agrupador = AgrupadorDuplicatas()
+        vistas: List[Dict[str, Any]] = []
+        for evento in eventos:
+            if not isinstance(evento, FimFeed):
+                representante = agrupador.adicionar(evento)
+                if representante != len(vistas):
+                    evento[_REPRESENTANTE] = vistas[representante]
+                vistas.append(evento)
+            yield evento
+    return etapa
+
+
+def etapa_prefiltro(prefiltro: "PreFiltro", tamanho_lote: int = TAMANHO_LOTE_PREFILTRO) -> Etapa:
+    """
+    Aplica o pré-filtro (backend/prefiltro.py) em lotes de até `tamanho_lote`
+    notícias: as claramente fora do tema saem com as respostas do pré-filtro e
+    'origem_classificacao' = ORIGEM_PREFILTRO, e a etapa de classificação só chama
+    a API para as incertas. Duplicatas não são avaliadas (seguem a representante).
+    A ordem dos eventos é mantida.
+    """
+    def etapa(eventos: Iterator[Any]) -> Iterator[Any]:
+        lote: List[Dict[str, Any]] = []
+
+        def filtrar() -> List[Dict[str, Any]]:
+            representantes = [noticia for noticia in lote if _REPRESENTANTE not in noticia]
+            descartados, _ = prefiltro.filtrar(representantes)
+            metricas.somar(prefiltro_descartados=len(descartados))
+            saida = list(lote)
+            lote.clear()
+            return saida
+
+        for evento in eventos:
+            if isinstance(evento, FimFeed):
+                yield from filtrar()
+                yield evento
+                continue
+            lote.append(evento)
+            if len(lote) >= tamanho_lote:
+                yield from filtrar()
+        yield from filtrar()
+    return etapa
+
+
+def etapa_classificacao(
+    classificar: Callable[[Dict[str, Any]], Dict[str, Any]],
+    max_workers: int = MAX_WORKERS_CLASSIFICACAO
+) -> Etapa:
+    """
+    Classifica as notícias com até `max_workers` chamadas simultâneas, produzindo
+    cada uma assim que a resposta chega. `classificar` atualiza o dicionário da
+    notícia no lugar (ex.: services.classificar_artigo). Duplicatas recebem as
+    respostas da representante, e as notícias já descartadas pela etapa_prefiltro
+    seguem com as respostas do pré-filtro, ambas sem nova chamada.
+    """
+    def etapa(eventos: Iterator[Any]) -> Iterator[Any]:
+        prontos: queue.Queue = queue.Queue()
+        # Limita as notícias em andamento: a leitura da etapa anterior espera aqui
+        vagas = threading.BoundedSemaphore(max_workers * 2)
+        lock = threading.Lock()
+        # Notícias ainda sem resposta por feed e FimFeed retidos até elas saírem
+        pendentes_feed: Dict[str, int] = {}
+        fins: Dict[str, FimFeed] = {}
+        # Duplicatas à espera da representante (por id da representante) e representantes já classificadas
+        espera: Dict[int, List[Dict[str, Any]]] = {}
+        classificadas: Set[int] = set()
+
+        def entregar(noticia: Dict[str, Any]) -> None:
+            prontos.put(noticia)
+            url = noticia['feed_url']
+            pendentes_feed[url] -= 1
+            if pendentes_feed[url] == 0 and url in fins:
+                prontos.put(fins.pop(url))
+
+        def copiar_respostas(duplicata: Dict[str, Any], representante: Dict[str, Any]) -> None:
+            duplicata.update({pergunta: representante.get(pergunta) for pergunta in PERGUNTAS})
+            entregar(duplicata)
+
+        def classificar_e_entregar(artigo: Dict[str, Any]) -> None:
+            try:
+                classificar(artigo)
+            except Exception as e:
+                prontos.put(_Erro(e))
+                return
+            finally:
+                vagas.release()
+            with lock:
+                classificadas.add(id(artigo))
+                entregar(artigo)
+                for duplicata in espera.pop(id(artigo), []):
+                    copiar_respostas(duplicata, artigo)
+
+        def alimentar(executor: ThreadPoolExecutor) -> None:
+            futuros = []
+            try:
+                for evento in eventos:
+                    with lock:
+                        if isinstance(evento, FimFeed):
+                            if pendentes_feed.get(evento.feed_url, 0):
+                                fins[evento.feed_url] = evento
+                            else:
+                                prontos.put(evento)
+                            continue
+                        url = evento['feed_url']
+                        pendentes_feed[url] = pendentes_feed.get(url, 0) + 1
+                        representante = evento.pop(_REPRESENTANTE, None)
+                        if representante is not None:
+                            if id(representante) in classificadas:
+                                copiar_respostas(evento, representante)
+                            else:
+                                espera.setdefault(id(representante), []).append(evento)
+                            continue
+                        if evento.get('origem_classificacao') == ORIGEM_PREFILTRO:
+                            classificadas.add(id(evento))
+                            entregar(evento)
+                            for duplicata in espera.pop(id(evento), []):
+                                copiar_respostas(duplicata, evento)
+                            continue
+                    vagas.acquire()
+                    futuros.append(executor.submit(metricas.no_contexto(classificar_e_entregar), evento))
+                wait(futuros)
+                prontos.put(_Fim())
+            except Exception as e:
+                prontos.put(_Erro(e))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        leitor = threading.Thread(target=metricas.no_contexto(alimentar), args=(executor,), daemon=True)
+        leitor.start()
+        try:
+            yield from _ler(prontos, threading.Event())
+        finally:
+            # Se o pipeline for interrompido, descarta as chamadas ainda não iniciadas
+            executor.shutdown(wait=True, cancel_futures=True)
+    return etapa
+
+
+def etapas_busca(
+    feed_urls: List[str],
+    keywords: Union[RegistroPalavrasChave, List[str]],
+    max_workers: int = MAX_WORKERS_PADRAO,
+    cache: Optional[CacheFeeds] = None,
+    ignorar_nao_modificados: bool = False,
+    dobrar_acentos: bool = False
+) -> List[Any]:
+    """
+    Fonte e etapas da busca de notícias com keywords (download -> parse -> keywords),
+    para encadear; as buscas acrescentam as etapas seguintes. Sem `cache`, os feeds
+    são baixados sem requisições condicionais.
+    """
+    # O matcher (uma varredura por texto) vem compilado do registro de keywords
+    return [
+        etapa_busca(feed_urls, max_workers=max_workers, cache=cache),
+        etapa_parse(ignorar_nao_modificados),
+        etapa_keywords(como_registro(keywords), dobrar_acentos),
+    ]
+
+
+##### Consumidor #####
+def reunir(eventos: Iterable[Any], feed_urls: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, Optional[Set[str]]]]:
+    """
+    Consome o pipeline inteiro. Retorna as notícias, na ordem de `feed_urls` (e, em
+    cada feed, na ordem dos itens), e os identificadores dos itens de cada feed
+    (None para os feeds que não puderam ser lidos).
+    """
+    noticias: List[Dict[str, Any]] = []
+    itens_por_feed: Dict[str, Optional[Set[str]]] = {}
+    for evento in eventos:
+        if isinstance(evento, FimFeed):
+            itens_por_feed[evento.feed_url] = evento.itens
+        else:
+            noticias.append(evento)
+    ordem = {url: posicao for posicao, url in enumerate(feed_urls)}
+    noticias.sort(key=lambda noticia: ordem.get(noticia['feed_url'], len(ordem)))
+    return noticias, itens_por_feed
@@ -0,0 +1,488 @@
+# prefiltro.py
+"""
+Pré-filtro local (CPU, sem chamadas à API) da pergunta 1 ("O artigo aborda o
+tema da inflação?").
+
+Boa parte das notícias que passam pelo matcher de keywords não trata de
+inflação (ex.: uma keyword genérica em uma notícia policial, como em
+resultados_classificacao.csv), e cada uma custava uma chamada à API da OpenAI.
+O pré-filtro estima a probabilidade de "Sim" na pergunta 1 com um modelo linear
+treinado com as respostas que a própria API já deu (base de notícias ou um
+noticias.csv antigo):
+  - atributos: TF-IDF das palavras e pares de palavras do título e da descrição
+    (minúsculas, sem acentos e sem HTML), com hashing em 2^BITS_HASH posições,
+    sem vocabulário a manter;
+  - modelo: regressão logística com regularização L2, ajustada só com numpy.
+
+Notícias com probabilidade abaixo do limiar recebem "Não" na pergunta 1 (e, nas
+demais, as respostas mais comuns da API para notícias fora do tema) sem chamada
+à API; só as incertas seguem para classificar_artigo. O limiar é escolhido no
+treino, nas notícias mais recentes (separadas do ajuste), como o maior que
+mantém a concordância com a API em pelo menos CONCORDANCIA_MINIMA.
+
+Treino e relatório de chamadas evitadas x concordância (a partir da raiz do projeto):
+    python -m backend.prefiltro treinar [--csv data/noticias/noticias.csv]
+    python -m backend.prefiltro avaliar
+O modelo é gravado em data/modelos/prefiltro.npz: pesos e IDF como arrays do numpy
+e os demais dados (limiar, respostas, período do treino) em JSON, lidos sem pickle.
+Sem modelo treinado, tudo segue para a API.
+"""
+import io
+import os
+import re
+import json
+import zlib
+import string
+import hashlib
+import zipfile
+import argparse
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.cache_feeds import escrita_atomica
+from backend.datas import timestamp_utc
+from backend.matcher import normalizar_texto
+from backend.repositorio import DB_PADRAO, ORIGEM_PREFILTRO, PERGUNTAS, RepositorioNoticias
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MODELO_PADRAO = os.path.join('data', 'modelos', 'prefiltro.npz')
+# Origem do treino com as notícias da base (com --csv: "csv:<sha256 do arquivo>")
+ORIGEM_BASE = 'base'
+
+BITS_HASH = 18
+# Fração mínima de notícias descartadas que a API também responderia "Não"
+CONCORDANCIA_MINIMA = 0.98
+# Notícias mais recentes reservadas para a escolha do limiar e o relatório
+FRACAO_VALIDACAO = 0.2
+MINIMO_EXEMPLOS = 200
+REGULARIZACAO = 1e-6
+EPOCAS = 200
+TAXA_APRENDIZADO = 0.05
+LIMIARES_RELATORIO = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5)
+
+PERGUNTA_1 = PERGUNTAS[0]
+
+_HTML = re.compile(r'<[^>]*>')
+_SEM_PONTUACAO = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+
+def atributos(artigo: Dict[str, Any]) -> List[str]:
+    """
+    Palavras e pares de palavras do título ("t:") e da descrição ("d:"), normalizados.
+    """
+    resultado = []
+    for prefixo, campo in (('t', 'title'), ('d', 'description')):
+        texto = normalizar_texto(_HTML.sub(" ", artigo.get(campo) or ""), dobrar_acentos=True)
+        palavras = [p for p in texto.translate(_SEM_PONTUACAO).split() if len(p) > 1]
+        resultado += [f"{prefixo}:{p}" for p in palavras]
+        resultado += [f"{prefixo}:{a} {b}" for a, b in zip(palavras, palavras[1:])]
+    return resultado
+
+
+def _contagens(artigos: Sequence[Dict[str, Any]], bits: int) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Matriz esparsa (linha, posição, contagem) dos atributos com hashing: uma linha por artigo.
+    """
+    import numpy as np
+
+    mascara = (1 << bits) - 1
+    linhas, posicoes, contagens = [], [], []
+    for linha, artigo in enumerate(artigos):
+        # crc32 é estável entre processos (hash() do Python não é)
+        contagem = Counter(zlib.crc32(a.encode('utf-8')) & mascara for a in atributos(artigo))
+        linhas += [linha] * len(contagem)
+        posicoes += contagem.keys()
+        contagens += contagem.values()
+    return np.array(linhas, dtype=np.int64), np.array(posicoes, dtype=np.int64), np.array(contagens, dtype=np.float64)
+
+
+def _tfidf(linhas: "np.ndarray", posicoes: "np.ndarray", contagens: "np.ndarray", idf: "np.ndarray", n: int) -> "np.ndarray":
+    """
+    Valores TF-IDF (tf sublinear) com cada linha normalizada (norma L2 = 1).
+    """
+    import numpy as np
+
+    valores = (1 + np.log(contagens)) * idf[posicoes]
+    normas = np.sqrt(np.bincount(linhas, weights=valores ** 2, minlength=n))
+    return valores / np.where(normas > 0, normas, 1)[linhas]
+
+
+def _sigmoide(z: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+    return 1 / (1 + np.exp(-np.clip(z, -30, 30)))
+
+
+def _ajustar(
+    linhas: "np.ndarray",
+    posicoes: "np.ndarray",
+    valores: "np.ndarray",
+    rotulos: "np.ndarray",
+    dimensao: int
+) -> Tuple["np.ndarray", float]:
+    """
+    Regressão logística (perda logarítmica média + L2) por gradiente em lote completo
+    com Adam. Cada época custa O(atributos não nulos), via bincount.
+    """
+    import numpy as np
+
+    n = len(rotulos)
+    pesos = np.zeros(dimensao)
+    vies = 0.0
+    m, v = np.zeros(dimensao + 1), np.zeros(dimensao + 1)
+    beta1, beta2 = 0.9, 0.999
+    for epoca in range(1, EPOCAS + 1):
+        logits = np.bincount(linhas, weights=valores * pesos[posicoes], minlength=n) + vies
+        residuo = _sigmoide(logits) - rotulos
+        gradiente = np.empty(dimensao + 1)
+        gradiente[:-1] = np.bincount(posicoes, weights=valores * residuo[linhas], minlength=dimensao) / n
+        gradiente[:-1] += REGULARIZACAO * pesos
+        gradiente[-1] = residuo.mean()
+        m = beta1 * m + (1 - beta1) * gradiente
+        v = beta2 * v + (1 - beta2) * gradiente ** 2
+        passo = TAXA_APRENDIZADO * (m / (1 - beta1 ** epoca)) / (np.sqrt(v / (1 - beta2 ** epoca)) + 1e-8)
+        pesos -= passo[:-1]
+        vies -= passo[-1]
+    return pesos, float(vies)
+
+
+class PreFiltro:
+    """
+    Modelo treinado: pesos da regressão logística, IDF de cada posição do hashing,
+    limiar de descarte e as respostas atribuídas às notícias descartadas.
+    """
+
+    def __init__(
+        self,
+        pesos: "np.ndarray",
+        vies: float,
+        idf: "np.ndarray",
+        limiar: float,
+        respostas_negativas: Dict[str, str],
+        ultimo_id: int = 0,
+        ultima_publicacao: Optional[int] = None,
+        origem: str = ORIGEM_BASE,
+        relatorio: Optional[List[Dict[str, float]]] = None,
+        bits: int = BITS_HASH
+    ):
+        self.pesos = pesos
+        self.vies = vies
+        self.idf = idf
+        self.limiar = limiar
+        self.respostas_negativas = respostas_negativas
+        # Período do treino: maior id da base (0 no treino com --csv, sem ids) e maior
+        # pub_ts; `avaliar` considera só as notícias posteriores aos dois
+        self.ultimo_id = ultimo_id
+        self.ultima_publicacao = ultima_publicacao
+        self.origem = origem
+        # Chamadas evitadas x concordância nas notícias de validação, por limiar
+        self.relatorio = relatorio or []
+        self.bits = bits
+
+    def probabilidades(self, artigos: Sequence[Dict[str, Any]]) -> "np.ndarray":
+        """
+        Probabilidade estimada de "Sim" na pergunta 1 para cada artigo.
+        """
+        import numpy as np
+
+        if not artigos:
+            return np.zeros(0)
+        linhas, posicoes, contagens = _contagens(artigos, self.bits)
+        valores = _tfidf(linhas, posicoes, contagens, self.idf, len(artigos))
+        logits = np.bincount(linhas, weights=valores * self.pesos[posicoes], minlength=len(artigos)) + self.vies
+        return _sigmoide(logits)
+
+    def filtrar(self, artigos: Sequence[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Separa os artigos em (descartados, incertos). Os descartados são atualizados
+        no próprio dicionário com as respostas das quatro perguntas e
+        'origem_classificacao' = ORIGEM_PREFILTRO; os incertos seguem para a API.
+        """
+        descartados, incertos = [], []
+        for artigo, probabilidade in zip(artigos, self.probabilidades(artigos)):
+            if probabilidade < self.limiar:
+                artigo.update(self.respostas_negativas)
+                artigo['origem_classificacao'] = ORIGEM_PREFILTRO
+                descartados.append(artigo)
+            else:
+                incertos.append(artigo)
+        return descartados, incertos
+
+
+def _rotulos(exemplos: Sequence[Dict[str, Any]]) -> "np.ndarray":
+    import numpy as np
+    return np.array([exemplo[PERGUNTA_1] == "Sim" for exemplo in exemplos], dtype=np.float64)
+
+
+def relatorio(
+    probabilidades: "np.ndarray",
+    rotulos: "np.ndarray",
+    limiares: Sequence[float] = LIMIARES_RELATORIO
+) -> List[Dict[str, float]]:
+    """
+    Para cada limiar: fração das chamadas à API evitadas, concordância com a API
+    nas notícias descartadas (fração em que a API também respondeu "Não") e
+    fração das notícias "Sim" descartadas por engano.
+    """
+    total_sim = max(rotulos.sum(), 1)
+    linhas = []
+    for limiar in sorted(limiares):
+        descartadas = probabilidades < limiar
+        quantidade = int(descartadas.sum())
+        linhas.append({
+            'limiar': float(limiar),
+            'chamadas_evitadas': quantidade / max(len(rotulos), 1),
+            'concordancia': float((rotulos[descartadas] == 0).mean()) if quantidade else 1.0,
+            'sim_perdidos': float(rotulos[descartadas].sum() / total_sim),
+        })
+    return linhas
+
+
+def escolher_limiar(probabilidades: "np.ndarray", rotulos: "np.ndarray", concordancia_minima: float = CONCORDANCIA_MINIMA) -> float:
+    """
+    Maior limiar em que a concordância das notícias descartadas (probabilidade
+    abaixo do limiar) com a API fica em pelo menos `concordancia_minima`; 0.0
+    (nada é descartado) se nenhum atingir.
+    """
+    import numpy as np
+
+    ordem = np.argsort(probabilidades, kind='stable')
+    ordenadas = probabilidades[ordem]
+    concordancia = np.cumsum(rotulos[ordem] == 0) / np.arange(1, len(ordem) + 1)
+    atingem = np.nonzero(concordancia >= concordancia_minima)[0]
+    if not len(atingem):
+        return 0.0
+    k = atingem[-1]
+    if k + 1 == len(ordenadas):
+        return float(np.nextafter(ordenadas[k], 1.0))
+    # Meio do caminho até a próxima probabilidade (que fica fora do descarte)
+    return float((ordenadas[k] + ordenadas[k + 1]) / 2)
+
+
+def _respostas_negativas(exemplos: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Respostas mais comuns da API às perguntas 2 a 4 quando a pergunta 1 é "Não".
+    """
+    respostas = {PERGUNTA_1: "Não"}
+    for pergunta in PERGUNTAS[1:]:
+        contagem = Counter(e.get(pergunta) for e in exemplos if e[PERGUNTA_1] == "Não" and e.get(pergunta))
+        respostas[pergunta] = contagem.most_common(1)[0][0] if contagem else "Não se aplica"
+    return respostas
+
+
+def _treinar_modelo(exemplos: Sequence[Dict[str, Any]], bits: int) -> Tuple["np.ndarray", float, "np.ndarray"]:
+    import numpy as np
+
+    n, dimensao = len(exemplos), 1 << bits
+    linhas, posicoes, contagens = _contagens(exemplos, bits)
+    documentos = np.bincount(posicoes, minlength=dimensao)
+    idf = np.log((1 + n) / (1 + documentos)) + 1
+    valores = _tfidf(linhas, posicoes, contagens, idf, n)
+    pesos, vies = _ajustar(linhas, posicoes, valores, _rotulos(exemplos), dimensao)
+    return pesos, vies, idf
+
+
+def treinar(
+    exemplos: List[Dict[str, Any]],
+    concordancia_minima: float = CONCORDANCIA_MINIMA,
+    fracao_validacao: float = FRACAO_VALIDACAO,
+    bits: int = BITS_HASH,
+    origem: str = ORIGEM_BASE
+) -> PreFiltro:
+    """
+    Treina o pré-filtro com notícias já classificadas pela API (título, descrição,
+    pub_ts e respostas), em ordem cronológica.
+
+    As últimas `fracao_validacao` notícias ficam fora do primeiro ajuste e servem para
+    escolher o limiar e montar o relatório (modelo.relatorio); o modelo final é então
+    reajustado com todas as notícias, mantendo o limiar escolhido.
+    """
+    import numpy as np
+
+    exemplos = [e for e in exemplos if e.get(PERGUNTA_1) in ("Sim", "Não")]
+    rotulos = _rotulos(exemplos)
+    if len(exemplos) < MINIMO_EXEMPLOS or rotulos.min() == rotulos.max():
+        raise ValueError(
+            f"São necessárias ao menos {MINIMO_EXEMPLOS} notícias classificadas, com respostas "
+            f"'Sim' e 'Não' na pergunta 1 ({len(exemplos)} encontradas)."
+        )
+    corte = int(len(exemplos) * (1 - fracao_validacao))
+    pesos, vies, idf = _treinar_modelo(exemplos[:corte], bits)
+    provisorio = PreFiltro(pesos.astype(np.float32), vies, idf.astype(np.float32), 0.0, {}, bits=bits)
+    probabilidades = provisorio.probabilidades(exemplos[corte:])
+    limiar = escolher_limiar(probabilidades, rotulos[corte:], concordancia_minima)
+
+    pesos, vies, idf = _treinar_modelo(exemplos, bits)
+    return PreFiltro(
+        pesos.astype(np.float32),
+        vies,
+        idf.astype(np.float32),
+        limiar,
+        _respostas_negativas(exemplos),
+        ultimo_id=max((int(e.get('id') or 0) for e in exemplos), default=0),
+        ultima_publicacao=max((int(e['pub_ts']) for e in exemplos if e.get('pub_ts') is not None), default=None),
+        origem=origem,
+        relatorio=relatorio(probabilidades, rotulos[corte:], sorted({*LIMIARES_RELATORIO, limiar})),
+        bits=bits,
+    )
+
+
+def avaliar(modelo: PreFiltro, exemplos: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+    """
+    Relatório (ver `relatorio`) do modelo em notícias classificadas pela API,
+    nos limiares padrão e no limiar do modelo.
+    """
+    exemplos = [e for e in exemplos if e.get(PERGUNTA_1) in ("Sim", "Não")]
+    return relatorio(modelo.probabilidades(exemplos), _rotulos(exemplos), sorted({*LIMIARES_RELATORIO, modelo.limiar}))
+
+
+def imprimir_relatorio(linhas: List[Dict[str, float]], limiar: Optional[float] = None) -> None:
+    print(f"{'limiar':>8} {'chamadas evitadas':>18} {'concordância':>13} {'Sim perdidos':>13}")
+    for linha in linhas:
+        marca = "  <- limiar do modelo" if limiar is not None and linha['limiar'] == limiar else ""
+        print(
+            f"{linha['limiar']:>8.3f} {linha['chamadas_evitadas']:>18.1%} "
+            f"{linha['concordancia']:>13.1%} {linha['sim_perdidos']:>13.1%}{marca}"
+        )
+
+
+##### Persistência #####
+def salvar_modelo(modelo: PreFiltro, caminho: str = MODELO_PADRAO) -> None:
+    """
+    Grava o modelo em um .npz: pesos e IDF como arrays e os demais atributos em
+    JSON (array 'metadados'), sem objetos Python serializados.
+    """
+    import numpy as np
+
+    metadados = {
+        'vies': modelo.vies,
+        'limiar': modelo.limiar,
+        'respostas_negativas': modelo.respostas_negativas,
+        'ultimo_id': modelo.ultimo_id,
+        'ultima_publicacao': modelo.ultima_publicacao,
+        'origem': modelo.origem,
+        'relatorio': modelo.relatorio,
+        'bits': modelo.bits,
+    }
+    conteudo = io.BytesIO()
+    np.savez(conteudo, pesos=modelo.pesos, idf=modelo.idf, metadados=np.array(json.dumps(metadados, ensure_ascii=False)))
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    escrita_atomica(caminho, conteudo.getvalue())
+
+
+def carregar_modelo(caminho: str = MODELO_PADRAO) -> Optional[PreFiltro]:
+    """
+    Modelo gravado por `salvar_modelo`, ou None se o arquivo não existir ou for inválido.
+    """
+    import numpy as np
+
+    try:
+        # allow_pickle=False: ler o arquivo nunca executa código
+        with np.load(caminho, allow_pickle=False) as arquivo:
+            pesos, idf = arquivo['pesos'], arquivo['idf']
+            metadados = json.loads(str(arquivo['metadados']))
+        bits = int(metadados['bits'])
+        if pesos.shape != (1 << bits,) or idf.shape != (1 << bits,):
+            return None
+        return PreFiltro(
+            pesos,
+            float(metadados['vies']),
+            idf,
+            float(metadados['limiar']),
+            dict(metadados['respostas_negativas']),
+            ultimo_id=int(metadados['ultimo_id']),
+            ultima_publicacao=metadados['ultima_publicacao'],
+            origem=str(metadados['origem']),
+            relatorio=list(metadados['relatorio']),
+            bits=bits,
+        )
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+        return None
+
+
+_lock = threading.Lock()
+# caminho -> (mtime do arquivo, modelo)
+_modelos: Dict[str, Tuple[int, Optional[PreFiltro]]] = {}
+
+
+def obter_prefiltro(caminho: str = MODELO_PADRAO) -> Optional[PreFiltro]:
+    """
+    Modelo treinado em `caminho`, carregado uma vez por processo (e recarregado se o
+    arquivo for retreinado), ou None se ainda não houver modelo.
+    """
+    try:
+        mtime = os.stat(caminho).st_mtime_ns
+    except OSError:
+        return None
+    with _lock:
+        em_memoria = _modelos.get(caminho)
+        if em_memoria is None or em_memoria[0] != mtime:
+            em_memoria = _modelos[caminho] = (mtime, carregar_modelo(caminho))
+        return em_memoria[1]
+
+
+def _exemplos_csv(csv_filepath: str) -> List[Dict[str, Any]]:
+    import pandas as pd
+
+    exemplos = pd.read_csv(csv_filepath, dtype=str).fillna("").to_dict('records')
+    for exemplo in exemplos:
+        exemplo['pub_ts'] = timestamp_utc(exemplo.get('pub_date'), exemplo.get('feed_url'))
+    return exemplos
+
+
+def _origem_csv(csv_filepath: str) -> str:
+    """
+    Impressão digital do CSV de treino, para identificar no modelo de onde ele veio.
+    """
+    sha = hashlib.sha256()
+    with open(csv_filepath, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            sha.update(bloco)
+    return f"csv:{sha.hexdigest()}"
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Pré-filtro local da pergunta 1 (antes da API da OpenAI).")
+    subcomandos = arg_parser.add_subparsers(dest='comando', required=True)
+    treino = subcomandos.add_parser('treinar', help="Treina o modelo com as notícias já classificadas pela API.")
+    treino.add_argument('--db', default=DB_PADRAO)
+    treino.add_argument('--csv', help="Treina com um noticias.csv antigo em vez da base.")
+    treino.add_argument('--concordancia', type=float, default=CONCORDANCIA_MINIMA,
+                        help="Concordância mínima com a API nas notícias descartadas.")
+    treino.add_argument('--modelo', default=MODELO_PADRAO)
+    avaliacao = subcomandos.add_parser(
+        'avaliar', help="Chamadas evitadas x concordância nas notícias classificadas pela API depois do treino."
+    )
+    avaliacao.add_argument('--db', default=DB_PADRAO)
+    avaliacao.add_argument('--modelo', default=MODELO_PADRAO)
+    args = arg_parser.parse_args()
+
+    if args.comando == 'treinar':
+        if args.csv:
+            exemplos, origem = _exemplos_csv(args.csv), _origem_csv(args.csv)
+        else:
+            exemplos, origem = RepositorioNoticias(args.db, csv_legado=None).rotuladas(), ORIGEM_BASE
+        modelo = treinar(exemplos, args.concordancia, origem=origem)
+        salvar_modelo(modelo, args.modelo)
+        print(f"Modelo treinado com {len(exemplos)} notícias e gravado em {args.modelo}.")
+        print(f"Validação (últimos {FRACAO_VALIDACAO:.0%} das notícias, fora do ajuste):")
+        imprimir_relatorio(modelo.relatorio, modelo.limiar)
+    elif args.comando == 'avaliar':
+        modelo = carregar_modelo(args.modelo)
+        if modelo is None:
+            arg_parser.error(f"Nenhum modelo em {args.modelo}; execute 'treinar' antes.")
+        if modelo.ultimo_id == 0 and modelo.ultima_publicacao is None:
+            arg_parser.error(
+                f"O modelo em {args.modelo} foi treinado sem ids nem datas ({modelo.origem}): "
+                "não há como separar as notícias do treino."
+            )
+        exemplos = RepositorioNoticias(args.db, csv_legado=None).rotuladas(
+            apos_id=modelo.ultimo_id, apos_ts=modelo.ultima_publicacao
+        )
+        if not exemplos:
+            print("Nenhuma notícia classificada pela API depois do treino.")
+        else:
+            print(f"{len(exemplos)} notícias classificadas pela API depois do treino:")
+            imprimir_relatorio(avaliar(modelo, exemplos), modelo.limiar)
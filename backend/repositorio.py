@@ -0,0 +1,1082 @@
+# repositorio.py
+"""
+Armazenamento das notícias em SQLite (data/noticias/noticias.db), substituindo
+o antigo data/noticias/noticias.csv.
+
+A chave de deduplicação (feed_url, pub_date, title) tem índice único, então a
+inserção de novas notícias é incremental (INSERT OR IGNORE) e não depende do
+tamanho do histórico. Há índices também na data de publicação, no feed e nas
+colunas de classificação, usados pelas consultas das páginas.
+
+A tabela `frequencias` guarda a contagem de palavras por dia (UTC) e por feed
+das notícias classificadas como "Sim" na pergunta 1. É atualizada a cada
+inserção/classificação, e a nuvem de palavras soma só os dias do período pedido,
+sem reprocessar os textos.
+
+Notícias quase duplicadas (a mesma matéria em vários feeds) são agrupadas na
+inserção por SimHash com índice LSH (tabela `simhash_bandas`, ver
+backend/duplicatas.py): só a representante de cada grupo fica pendente de
+classificação, e as respostas dela são copiadas para as demais.
+
+A tabela virtual `noticias_fts` (FTS5) indexa título e descrição, sem acentos,
+para a busca de texto completo ordenada por relevância (BM25). Gatilhos mantêm
+o índice em dia a cada inserção, sem reprocessar o histórico.
+
+A tabela `agregados_sentimento` guarda, por dia (UTC), feed e pergunta, quantas
+notícias receberam cada resposta (Sim / Não / Não se aplica). Gatilhos a mantêm
+em dia a cada inserção, classificação ou correção de data, e a página de
+tendências lê só essa tabela (semanas são somadas a partir dos dias).
+
+Os meses antigos podem ser compactados para um arquivo Parquet particionado por
+mês (backend/arquivo.py); a base fica só com os meses recentes e as notícias
+pendentes. As consultas por período leem apenas os meses arquivados do período,
+e os agregados por dia e o índice de texto (sem o conteúdo, tabela
+`arquivadas_fts`) dos meses arquivados continuam na base:
+    python -m backend.repositorio compactar [--meses 3]
+
+Migração do CSV antigo (executar a partir da raiz do projeto):
+    python -m backend.repositorio migrar data/noticias/noticias.csv
+"""
+import os
+import re
+import string
+import sqlite3
+import argparse
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from backend import datas, duplicatas
+from backend.arquivo import ArquivoNoticias, limites_mes, mes_de
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DB_PADRAO = os.path.join('data', 'noticias', 'noticias.db')
+CSV_LEGADO = os.path.join('data', 'noticias', 'noticias.csv')
+
+# Perguntas da classificação (nomes das colunas expostas) -> colunas da tabela
+COLUNAS_CLASSIFICACAO = {
+    "1. O artigo aborda o tema da inflação?": "aborda_inflacao",
+    "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?": "perspectiva_geral",
+    "3. O artigo aborda especificamente a inflação de alimentos?": "aborda_alimentos",
+    "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?": "perspectiva_alimentos",
+}
+PERGUNTAS = list(COLUNAS_CLASSIFICACAO)
+
+# Origem das respostas (coluna origem_classificacao): vazia para a API da OpenAI,
+# ORIGEM_PREFILTRO para as notícias descartadas pelo pré-filtro (backend/prefiltro.py)
+ORIGEM_PREFILTRO = 'prefiltro'
+
+COLUNAS_NOTICIA = ['title', 'description', 'link', 'pub_date', 'feed_url', 'matched_keyword', 'matched_keywords']
+
+SEGUNDOS_DIA = 86400
+
+# Compactação: meses mantidos na base (o atual e os anteriores), o resto vai para o arquivo Parquet
+MESES_QUENTES = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS noticias (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    pub_date TEXT NOT NULL DEFAULT '',
+    pub_ts INTEGER,
+    feed_url TEXT NOT NULL DEFAULT '',
+    matched_keyword TEXT NOT NULL DEFAULT '',
+    matched_keywords TEXT NOT NULL DEFAULT '',
+    aborda_inflacao TEXT NOT NULL DEFAULT '',
+    perspectiva_geral TEXT NOT NULL DEFAULT '',
+    aborda_alimentos TEXT NOT NULL DEFAULT '',
+    perspectiva_alimentos TEXT NOT NULL DEFAULT '',
+    simhash INTEGER,
+    representante_id INTEGER,
+    origem_classificacao TEXT NOT NULL DEFAULT '',
+    UNIQUE (feed_url, pub_date, title)
+);
+CREATE INDEX IF NOT EXISTS idx_noticias_pub_ts ON noticias (pub_ts);
+CREATE INDEX IF NOT EXISTS idx_noticias_feed_url ON noticias (feed_url, pub_ts);
+CREATE INDEX IF NOT EXISTS idx_noticias_aborda_inflacao ON noticias (aborda_inflacao, pub_ts);
+CREATE INDEX IF NOT EXISTS idx_noticias_perspectiva_geral ON noticias (perspectiva_geral, pub_ts);
+CREATE INDEX IF NOT EXISTS idx_noticias_aborda_alimentos ON noticias (aborda_alimentos, pub_ts);
+CREATE INDEX IF NOT EXISTS idx_noticias_perspectiva_alimentos ON noticias (perspectiva_alimentos, pub_ts);
+-- Índice parcial: contém só as notícias pendentes, então retomar a classificação
+-- não percorre o histórico já classificado
+CREATE INDEX IF NOT EXISTS idx_noticias_pendentes ON noticias (id) WHERE aborda_inflacao = '';
+-- Duplicatas de cada representante, e notícias ainda sem impressão SimHash
+CREATE INDEX IF NOT EXISTS idx_noticias_representante ON noticias (representante_id) WHERE representante_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_noticias_sem_simhash ON noticias (id) WHERE simhash IS NULL;
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (chave, valor) VALUES ('versao', 0);
+
+-- Contagem de palavras por dia (dias desde a época, UTC) e feed, só das notícias sobre inflação
+CREATE TABLE IF NOT EXISTS frequencias (
+    dia INTEGER NOT NULL,
+    feed_url TEXT NOT NULL,
+    palavra TEXT NOT NULL,
+    contagem INTEGER NOT NULL,
+    PRIMARY KEY (dia, feed_url, palavra)
+) WITHOUT ROWID;
+
+-- Índice de texto completo (BM25) de título e descrição, sem acentos; o conteúdo
+-- fica em `noticias` e os gatilhos mantêm o índice em dia a cada escrita
+CREATE VIRTUAL TABLE IF NOT EXISTS noticias_fts USING fts5(
+    title, description, content='noticias', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS noticias_fts_insercao AFTER INSERT ON noticias BEGIN
+    INSERT INTO noticias_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS noticias_fts_remocao AFTER DELETE ON noticias BEGIN
+    INSERT INTO noticias_fts (noticias_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS noticias_fts_alteracao AFTER UPDATE OF title, description ON noticias BEGIN
+    INSERT INTO noticias_fts (noticias_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO noticias_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+-- Notícias movidas para o arquivo Parquet (ver compactar): o índice de texto delas
+-- continua na base, sem o conteúdo (o texto fica no Parquet, com o mesmo arquivo_id)
+CREATE TABLE IF NOT EXISTS arquivadas (
+    arquivo_id INTEGER PRIMARY KEY,
+    pub_ts INTEGER NOT NULL,
+    aborda_inflacao TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS arquivadas_fts USING fts5(
+    title, description, content='', tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Índice LSH das representantes: faixas da impressão SimHash -> notícia
+CREATE TABLE IF NOT EXISTS simhash_bandas (
+    banda INTEGER NOT NULL,
+    valor INTEGER NOT NULL,
+    noticia_id INTEGER NOT NULL,
+    pub_ts INTEGER,
+    PRIMARY KEY (banda, valor, noticia_id)
+) WITHOUT ROWID;
+
+-- Contagem de respostas por dia (dias desde a época, UTC), feed e pergunta (nome da coluna)
+CREATE TABLE IF NOT EXISTS agregados_sentimento (
+    dia INTEGER NOT NULL,
+    feed_url TEXT NOT NULL,
+    pergunta TEXT NOT NULL,
+    resposta TEXT NOT NULL,
+    contagem INTEGER NOT NULL,
+    PRIMARY KEY (dia, feed_url, pergunta, resposta)
+) WITHOUT ROWID;
+"""
+
+
+def _sql_agregados(registro: str, sinal: int) -> str:
+    """
+    Comandos (um por pergunta) que somam `sinal` às contagens das respostas de
+    `registro` ('new' ou 'old', dentro de um gatilho). Respostas vazias e notícias sem data não entram.
+    """
+    comandos = []
+    for coluna in COLUNAS_CLASSIFICACAO.values():
+        comandos.append(
+            "INSERT INTO agregados_sentimento (dia, feed_url, pergunta, resposta, contagem) "
+            f"SELECT {registro}.pub_ts / {SEGUNDOS_DIA}, {registro}.feed_url, '{coluna}', {registro}.{coluna}, {sinal} "
+            f"WHERE {registro}.{coluna} != '' AND {registro}.pub_ts IS NOT NULL "
+            "ON CONFLICT (dia, feed_url, pergunta, resposta) DO UPDATE SET contagem = contagem + excluded.contagem;"
+        )
+    return "\n    ".join(comandos)
+
+
+# Gatilhos que mantêm `agregados_sentimento` em dia com qualquer escrita (inserção,
+# classificação, cópia das respostas para duplicatas e correção de datas)
+_SCHEMA_AGREGADOS = f"""
+CREATE TRIGGER IF NOT EXISTS agregados_insercao AFTER INSERT ON noticias BEGIN
+    {_sql_agregados('new', 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS agregados_alteracao
+AFTER UPDATE OF pub_ts, feed_url, {', '.join(COLUNAS_CLASSIFICACAO.values())} ON noticias BEGIN
+    {_sql_agregados('old', -1)}
+    {_sql_agregados('new', 1)}
+    DELETE FROM agregados_sentimento
+    WHERE dia = old.pub_ts / {SEGUNDOS_DIA} AND feed_url = old.feed_url AND contagem <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS agregados_remocao AFTER DELETE ON noticias BEGIN
+    {_sql_agregados('old', -1)}
+    DELETE FROM agregados_sentimento
+    WHERE dia = old.pub_ts / {SEGUNDOS_DIA} AND feed_url = old.feed_url AND contagem <= 0;
+END;
+"""
+
+# Colunas acrescentadas depois da criação da tabela (bases antigas recebem ALTER TABLE)
+_COLUNAS_ADICIONAIS = {
+    'simhash': 'INTEGER',
+    'representante_id': 'INTEGER',
+    'origem_classificacao': "TEXT NOT NULL DEFAULT ''",
+}
+
+# Colunas gravadas no arquivo Parquet (backend/arquivo.py)
+_COLUNAS_ARQUIVO = COLUNAS_NOTICIA + ['pub_ts'] + list(COLUNAS_CLASSIFICACAO.values()) + ['origem_classificacao', 'arquivo_id']
+
+_SEM_PONTUACAO = str.maketrans("", "", string.punctuation)
+
+# Termos da busca: frases entre aspas ou palavras soltas
+_TERMOS_BUSCA = re.compile(r'"([^"]*)"|(\S+)')
+# Peso do título em relação à descrição no BM25
+PESO_TITULO = 2.0
+
+
+def _inicio_do_dia(dia: date) -> int:
+    return int(datetime.combine(dia, dtime.min, tzinfo=timezone.utc).timestamp())
+
+
+def consulta_fts(texto: str) -> str:
+    """
+    Converte o texto digitado na busca em uma consulta FTS5: todas as palavras (ou
+    frases entre aspas) precisam aparecer; "palavra*" busca por prefixo. Os demais
+    caracteres especiais do FTS5 são tratados como texto comum.
+    """
+    termos = []
+    for frase, palavra in _TERMOS_BUSCA.findall(texto or ""):
+        termo = frase or palavra
+        prefixo = not frase and termo.endswith('*')
+        termo = termo.rstrip('*').strip()
+        if termo:
+            termos.append('"' + termo.replace('"', '""') + '"' + ('*' if prefixo else ''))
+    return ' '.join(termos)
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Palavras do texto como na nuvem de palavras: minúsculas, sem pontuação,
+    separadas por espaços.
+    """
+    return texto.lower().translate(_SEM_PONTUACAO).split()
+
+
+def _atualizar_frequencias(conn: sqlite3.Connection, linhas: List[Tuple[str, str, str, Optional[int]]], sinal: int = 1) -> None:
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) da tabela `frequencias` as palavras das
+    notícias em `linhas` (title, description, feed_url, pub_ts). Notícias sem data são ignoradas.
+    """
+    contagens: Counter = Counter()
+    for title, description, feed_url, pub_ts in linhas:
+        if pub_ts is None:
+            continue
+        dia = pub_ts // SEGUNDOS_DIA
+        for palavra, contagem in Counter(tokenizar(f"{title} {description}")).items():
+            contagens[(dia, feed_url, palavra)] += contagem
+    if not contagens:
+        return
+    conn.executemany(
+        "INSERT INTO frequencias (dia, feed_url, palavra, contagem) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (dia, feed_url, palavra) DO UPDATE SET contagem = contagem + excluded.contagem",
+        [(dia, feed_url, palavra, sinal * contagem) for (dia, feed_url, palavra), contagem in contagens.items()],
+    )
+    if sinal < 0:
+        conn.execute("DELETE FROM frequencias WHERE contagem <= 0")
+
+
+def _gravar_classificacoes(conn: sqlite3.Connection, lote: List[Tuple[int, Dict[str, str]]], origem: str = '') -> None:
+    """
+    Grava as respostas (e a origem delas) e mantém a tabela de frequências em dia
+    com as notícias que passam a ser (ou deixam de ser) "Sim".
+    """
+    atribuicoes = ', '.join(f"{coluna} = ?" for coluna in COLUNAS_CLASSIFICACAO.values())
+    linhas = [
+        [str(respostas.get(pergunta) or "") for pergunta in PERGUNTAS] + [origem, noticia_id]
+        for noticia_id, respostas in lote
+    ]
+    novas = {linha[-1]: linha[0] for linha in linhas}
+    anteriores = []
+    ids = list(novas)
+    for i in range(0, len(ids), 500):
+        parte = ids[i:i + 500]
+        anteriores += conn.execute(
+            "SELECT id, aborda_inflacao, title, description, feed_url, pub_ts FROM noticias "
+            f"WHERE id IN ({', '.join('?' for _ in parte)})",
+            parte,
+        ).fetchall()
+    conn.executemany(f"UPDATE noticias SET {atribuicoes}, origem_classificacao = ? WHERE id = ?", linhas)
+    _atualizar_frequencias(conn, [
+        linha[2:] for linha in anteriores if linha[1] != "Sim" and novas[linha[0]] == "Sim"
+    ])
+    _atualizar_frequencias(conn, [
+        linha[2:] for linha in anteriores if linha[1] == "Sim" and novas[linha[0]] != "Sim"
+    ], sinal=-1)
+
+
+def _arquivado_ate(conn: sqlite3.Connection) -> int:
+    """
+    Timestamp a partir do qual as notícias classificadas estão na base; as anteriores
+    foram movidas para o arquivo Parquet (0 se nada foi arquivado).
+    """
+    linha = conn.execute("SELECT valor FROM meta WHERE chave = 'arquivado_ate'").fetchone()
+    return linha[0] if linha else 0
+
+
+def _indexar_arquivadas(conn: sqlite3.Connection, df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Registra as notícias de `df` (colunas do arquivo Parquet) no índice de texto das
+    arquivadas e devolve `df` com o 'arquivo_id' de cada uma.
+    """
+    primeiro = conn.execute("SELECT COALESCE(MAX(arquivo_id), 0) + 1 FROM arquivadas").fetchone()[0]
+    df = df.assign(arquivo_id=range(primeiro, primeiro + len(df)))
+    linhas = list(zip(df['arquivo_id'].tolist(), df['pub_ts'].tolist(), df['aborda_inflacao'],
+                      df['title'], df['description']))
+    conn.executemany("INSERT INTO arquivadas (arquivo_id, pub_ts, aborda_inflacao) VALUES (?, ?, ?)",
+                     [linha[:3] for linha in linhas])
+    conn.executemany("INSERT INTO arquivadas_fts (rowid, title, description) VALUES (?, ?, ?)",
+                     [(linha[0], linha[3], linha[4]) for linha in linhas])
+    return df
+
+
+def _reconstruir_agregados(conn: sqlite3.Connection) -> None:
+    """
+    Recalcula `agregados_sentimento` a partir das notícias classificadas da base.
+    Os dias já arquivados são mantidos como estão.
+    """
+    corte = _arquivado_ate(conn)
+    conn.execute("DELETE FROM agregados_sentimento WHERE dia >= ?", (corte // SEGUNDOS_DIA,))
+    for coluna in COLUNAS_CLASSIFICACAO.values():
+        conn.execute(
+            "INSERT INTO agregados_sentimento (dia, feed_url, pergunta, resposta, contagem) "
+            f"SELECT pub_ts / {SEGUNDOS_DIA}, feed_url, '{coluna}', {coluna}, COUNT(*) FROM noticias "
+            f"WHERE {coluna} != '' AND pub_ts >= ? GROUP BY 1, 2, 4",
+            (corte // SEGUNDOS_DIA * SEGUNDOS_DIA,),
+        )
+    conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('sentimento', 1)")
+
+
+def _agrupar_duplicatas(conn: sqlite3.Connection) -> int:
+    """
+    Calcula a impressão SimHash das notícias que ainda não a têm e liga cada uma à
+    representante de uma matéria quase idêntica publicada em até JANELA_SEGUNDOS, se
+    houver (consulta pelo índice LSH). Duplicatas de representantes já classificadas
+    recebem as mesmas respostas. Retorna o número de duplicatas encontradas.
+    """
+    colunas = ', '.join(COLUNAS_CLASSIFICACAO.values()) + ', origem_classificacao'
+    novas = conn.execute(
+        "SELECT id, title, description, pub_ts, aborda_inflacao FROM noticias WHERE simhash IS NULL ORDER BY id"
+    ).fetchall()
+    # Origem -> cópias das respostas das representantes
+    copias: Dict[str, List[Tuple[int, Dict[str, str]]]] = {}
+    encontradas = 0
+    for noticia_id, title, description, pub_ts, aborda_inflacao in novas:
+        impressao = duplicatas.simhash(f"{title} {description}")
+        chaves = list(duplicatas.bandas(impressao))
+        representante = None
+        if impressao:
+            condicoes = " OR ".join("(banda = ? AND valor = ?)" for _ in chaves)
+            parametros = [v for chave in chaves for v in chave]
+            sql = f"SELECT DISTINCT b.noticia_id, n.simhash FROM simhash_bandas b JOIN noticias n ON n.id = b.noticia_id WHERE ({condicoes})"
+            if pub_ts is not None:
+                sql += " AND b.pub_ts BETWEEN ? AND ?"
+                parametros += [pub_ts - duplicatas.JANELA_SEGUNDOS, pub_ts + duplicatas.JANELA_SEGUNDOS]
+            for candidato, impressao_candidato in conn.execute(sql + " ORDER BY b.noticia_id", parametros):
+                if duplicatas.distancia(impressao, duplicatas.de_sqlite(impressao_candidato)) <= duplicatas.DISTANCIA_MAXIMA:
+                    representante = candidato
+                    break
+
+        conn.execute(
+            "UPDATE noticias SET simhash = ?, representante_id = ? WHERE id = ?",
+            (duplicatas.para_sqlite(impressao), representante, noticia_id),
+        )
+        if representante is None:
+            if impressao:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO simhash_bandas (banda, valor, noticia_id, pub_ts) VALUES (?, ?, ?, ?)",
+                    [(banda, valor, noticia_id, pub_ts) for banda, valor in chaves],
+                )
+            continue
+
+        encontradas += 1
+        if aborda_inflacao == '':
+            respostas = conn.execute(f"SELECT {colunas} FROM noticias WHERE id = ?", (representante,)).fetchone()
+            if respostas[0] != '':
+                copias.setdefault(respostas[-1], []).append((noticia_id, dict(zip(PERGUNTAS, respostas))))
+    for origem, lote in copias.items():
+        _gravar_classificacoes(conn, lote, origem)
+    return encontradas
+
+
+_inicializacao_lock = threading.Lock()
+# Bases já preparadas neste processo: (caminho absoluto, inode do arquivo)
+_inicializadas: Set[Tuple[str, int]] = set()
+
+
+def _identidade(caminho: str) -> Tuple[str, int]:
+    # O inode distingue uma base apagada e recriada no mesmo caminho
+    return os.path.abspath(caminho), os.stat(caminho).st_ino
+
+
+class RepositorioNoticias:
+    """
+    API de acesso à tabela de notícias.
+
+    Cada operação abre sua própria conexão, então a mesma instância pode ser
+    usada por várias threads (sessões do Streamlit) e por processos diferentes
+    (app e rotina de atualização) ao mesmo tempo.
+
+    A preparação da base (esquema, migrações e reindexações pendentes) é feita só
+    na primeira instância de cada base no processo; as seguintes são imediatas.
+    """
+
+    def __init__(self, caminho: str = DB_PADRAO, csv_legado: Optional[str] = CSV_LEGADO):
+        self.caminho = caminho
+        # Meses antigos compactados (ver compactar): data/noticias/noticias_arquivo/mes=AAAA-MM/
+        self.arquivo = ArquivoNoticias(os.path.splitext(caminho)[0] + '_arquivo', _COLUNAS_ARQUIVO)
+        with _inicializacao_lock:
+            if os.path.exists(caminho) and _identidade(caminho) in _inicializadas:
+                return
+            self._preparar(csv_legado)
+            _inicializadas.add(_identidade(caminho))
+
+    def _preparar(self, csv_legado: Optional[str]) -> None:
+        caminho = self.caminho
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        novo = not os.path.exists(caminho)
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._adicionar_colunas(conn)
+            conn.executescript(_SCHEMA + _SCHEMA_AGREGADOS)
+            # Notícias sem impressão SimHash (bases antigas): agrupa as duplicatas uma única vez
+            _agrupar_duplicatas(conn)
+            indexada = conn.execute("SELECT 1 FROM meta WHERE chave = 'frequencias'").fetchone()
+            normalizada = conn.execute("SELECT 1 FROM meta WHERE chave = 'datas'").fetchone()
+            # Base criada antes do índice de texto: indexa o histórico uma única vez
+            if not conn.execute("SELECT 1 FROM meta WHERE chave = 'busca'").fetchone():
+                conn.execute("INSERT INTO noticias_fts (noticias_fts) VALUES ('rebuild')")
+                conn.execute("INSERT INTO meta (chave, valor) VALUES ('busca', 1)")
+            # Base criada antes dos agregados de sentimento: calcula o histórico uma única vez
+            if not conn.execute("SELECT 1 FROM meta WHERE chave = 'sentimento'").fetchone():
+                _reconstruir_agregados(conn)
+            arquivo_indexado = conn.execute("SELECT 1 FROM meta WHERE chave = 'busca_arquivo'").fetchone()
+        # Arquivo Parquet gravado antes do índice de texto das arquivadas: indexa uma única vez
+        if not arquivo_indexado:
+            self._indexar_arquivo()
+        # Base com datas gravadas como vieram dos feeds: normaliza o histórico uma única vez
+        if not normalizada and self.normalizar_datas():
+            indexada = None
+        # Base criada antes da tabela de frequências: indexa o histórico uma única vez
+        if not indexada:
+            self.reconstruir_frequencias()
+        # Primeira execução após a troca do CSV pelo SQLite: importa o histórico
+        if novo and csv_legado and os.path.exists(csv_legado):
+            print(f"Migrando histórico de {csv_legado} para {caminho}...")
+            self.migrar_csv(csv_legado)
+
+    def _indexar_arquivo(self) -> None:
+        colunas = [c for c in _COLUNAS_ARQUIVO if c != 'arquivo_id']
+        with self._conectar() as conn:
+            for mes in self.arquivo.meses():
+                df = _indexar_arquivadas(conn, self.arquivo.ler(*limites_mes(mes), colunas=colunas))
+                self.arquivo.acrescentar(mes, df)
+            conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('busca_arquivo', 1)")
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conn:  # commit ao final do bloco, rollback em caso de erro
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _adicionar_colunas(conn: sqlite3.Connection) -> None:
+        existentes = {linha[1] for linha in conn.execute("PRAGMA table_info(noticias)")}
+        if not existentes:
+            return  # base nova: a tabela é criada já com todas as colunas
+        for coluna, tipo in _COLUNAS_ADICIONAIS.items():
+            if coluna not in existentes:
+                conn.execute(f"ALTER TABLE noticias ADD COLUMN {coluna} {tipo}")
+
+    @staticmethod
+    def _incrementar_versao(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE meta SET valor = valor + 1 WHERE chave = 'versao'")
+
+    def versao(self) -> int:
+        """
+        Número que muda a cada escrita; usado para invalidar caches de leitura.
+        """
+        with self._conectar() as conn:
+            return conn.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()[0]
+
+    ##### Escrita #####
+    def inserir(self, noticias: List[Dict[str, Any]]) -> int:
+        """
+        Insere as notícias ainda não cadastradas (chave: feed_url, pub_date, title).
+        Notícias que já chegam classificadas como "Sim" (ex.: migração do CSV) entram
+        também na tabela de frequências. Retorna o número de notícias efetivamente inseridas.
+        """
+        linhas, linhas_sim = [], []
+        for noticia in noticias:
+            valores = [str(noticia.get(col) or "") for col in COLUNAS_NOTICIA]
+            # Data gravada sempre na forma canônica (ISO 8601), junto com o timestamp UTC
+            valores[COLUNAS_NOTICIA.index('pub_date')], pub_ts = datas.normalizar(
+                noticia.get('pub_date'), noticia.get('feed_url')
+            )
+            valores.append(pub_ts)
+            valores += [str(noticia.get(pergunta) or "") for pergunta in PERGUNTAS]
+            (linhas_sim if valores[len(COLUNAS_NOTICIA) + 1] == "Sim" else linhas).append(valores)
+        if not linhas and not linhas_sim:
+            return 0
+
+        colunas = COLUNAS_NOTICIA + ['pub_ts'] + list(COLUNAS_CLASSIFICACAO.values())
+        with self._conectar() as conn:
+            corte = _arquivado_ate(conn)
+        indice_ts = len(COLUNAS_NOTICIA)
+        antigas = [v for v in linhas + linhas_sim if v[indice_ts] is not None and v[indice_ts] < corte]
+        if antigas:
+            # Notícias de meses já arquivados: ignora as que já estão no arquivo Parquet
+            arquivadas = self.arquivo.chaves({mes_de(v[indice_ts]) for v in antigas})
+            chave = [COLUNAS_NOTICIA.index(c) for c in ('feed_url', 'pub_date', 'title')]
+            linhas, linhas_sim = (
+                [v for v in grupo if tuple(v[i] for i in chave) not in arquivadas] for grupo in (linhas, linhas_sim)
+            )
+        sql = (
+            f"INSERT OR IGNORE INTO noticias ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' for _ in colunas)})"
+        )
+        with self._conectar() as conn:
+            inseridas = conn.executemany(sql, linhas).rowcount if linhas else 0
+            # As já classificadas são inseridas uma a uma para indexar só as que eram novas
+            novas_sim = []
+            for valores in linhas_sim:
+                if conn.execute(sql, valores).rowcount:
+                    novas_sim.append((valores[0], valores[1], valores[4], valores[len(COLUNAS_NOTICIA)]))
+            _atualizar_frequencias(conn, novas_sim)
+            inseridas += len(novas_sim)
+            if inseridas:
+                duplicadas = _agrupar_duplicatas(conn)
+                if duplicadas:
+                    print(f"{duplicadas} notícias quase duplicadas agrupadas (serão classificadas pela representante).")
+                self._incrementar_versao(conn)
+        return inseridas
+
+    def salvar_classificacao(self, noticia_id: int, respostas: Dict[str, str]) -> None:
+        """
+        Grava as respostas da classificação (chaves = textos das perguntas) de uma notícia.
+        """
+        self.salvar_classificacoes([(noticia_id, respostas)])
+
+    def salvar_classificacoes(self, lote: List[Tuple[int, Dict[str, str]]], origem: str = '') -> None:
+        """
+        Grava as classificações de um lote de notícias em uma única transação:
+        ou o lote inteiro é persistido, ou nada é (em caso de queda no meio da escrita).
+        As respostas de cada representante são copiadas para as suas duplicatas ainda
+        pendentes, e a tabela de frequências acompanha as notícias que passam a ser
+        (ou deixam de ser) "Sim".
+
+        `origem` identifica quem respondeu: vazia para a API, ORIGEM_PREFILTRO para o
+        pré-filtro local (essas respostas não são usadas no treino do próprio pré-filtro).
+        """
+        if not lote:
+            return
+        with self._conectar() as conn:
+            copias = []
+            for noticia_id, respostas in lote:
+                copias += [
+                    (duplicata, respostas) for (duplicata,) in conn.execute(
+                        "SELECT id FROM noticias WHERE representante_id = ? AND aborda_inflacao = ''", (noticia_id,)
+                    )
+                ]
+            _gravar_classificacoes(conn, list(lote) + copias, origem)
+            self._incrementar_versao(conn)
+
+    def reconstruir_frequencias(self) -> None:
+        """
+        Recalcula a tabela de frequências a partir das notícias da base classificadas como "Sim".
+        """
+        with self._conectar() as conn:
+            # Os dias já arquivados são mantidos como estão
+            corte = _arquivado_ate(conn)
+            conn.execute("DELETE FROM frequencias WHERE dia >= ?", (corte // SEGUNDOS_DIA,))
+            cursor = conn.execute(
+                "SELECT title, description, feed_url, pub_ts FROM noticias "
+                "WHERE aborda_inflacao = 'Sim' AND pub_ts >= ?",
+                (corte // SEGUNDOS_DIA * SEGUNDOS_DIA,),
+            )
+            while True:
+                linhas = cursor.fetchmany(5000)
+                if not linhas:
+                    break
+                _atualizar_frequencias(conn, linhas)
+            conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('frequencias', 1)")
+            self._incrementar_versao(conn)
+
+    def normalizar_datas(self) -> int:
+        """
+        Regrava 'pub_date' na forma canônica (ISO 8601) e recalcula 'pub_ts' de todo o
+        histórico. Retorna o número de notícias cujo timestamp mudou (nesse caso, a
+        tabela de frequências, indexada por dia, precisa ser reconstruída).
+        """
+        with self._conectar() as conn:
+            linhas = conn.execute("SELECT id, pub_date, pub_ts, feed_url FROM noticias").fetchall()
+            datas_novas, timestamps_novos = [], []
+            for noticia_id, pub_date, pub_ts, feed_url in linhas:
+                canonica, novo_ts = datas.normalizar(pub_date, feed_url)
+                if canonica != pub_date:
+                    datas_novas.append((canonica, noticia_id))
+                if novo_ts != pub_ts:
+                    timestamps_novos.append((novo_ts, noticia_id))
+            # OR IGNORE: se a forma canônica já existir para o mesmo feed e título, a
+            # notícia (duplicada) mantém o texto original, mas recebe o timestamp correto
+            conn.executemany("UPDATE OR IGNORE noticias SET pub_date = ? WHERE id = ?", datas_novas)
+            conn.executemany("UPDATE noticias SET pub_ts = ? WHERE id = ?", timestamps_novos)
+            conn.executemany("UPDATE simhash_bandas SET pub_ts = ? WHERE noticia_id = ?", timestamps_novos)
+            conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('datas', 1)")
+            if datas_novas or timestamps_novos:
+                self._incrementar_versao(conn)
+        if datas_novas or timestamps_novos:
+            print(f"Datas normalizadas: {len(datas_novas)} reescritas, {len(timestamps_novos)} timestamps corrigidos.")
+        return len(timestamps_novos)
+
+    ##### Leitura #####
+    def pendentes(self, limite: Optional[int] = None, apos_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Retorna as notícias ainda não classificadas (pergunta 1 vazia), com o 'id',
+        em ordem de id. Usa o índice parcial de pendentes. Duplicatas não são
+        retornadas: recebem as respostas da sua representante.
+
+        Args:
+            limite: Número máximo de notícias retornadas (opcional).
+            apos_id: Retorna apenas notícias com id maior que este (paginação).
+        """
+        sql = (
+            "SELECT id, " + ', '.join(COLUNAS_NOTICIA) +
+            " FROM noticias WHERE aborda_inflacao = '' AND representante_id IS NULL AND id > ? ORDER BY id"
+        )
+        if limite:
+            sql += f" LIMIT {int(limite)}"
+        with self._conectar() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(linha) for linha in conn.execute(sql, (apos_id,))]
+
+    def rotuladas(self, apos_id: int = 0, apos_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Notícias classificadas pela API (não pelo pré-filtro), em ordem cronológica, com
+        título, descrição, pub_ts e as respostas; usadas para treinar e avaliar o pré-filtro.
+        Duplicatas ficam de fora (repetem a representante).
+
+        Args:
+            apos_id: Retorna apenas notícias com id maior que este.
+            apos_ts: Retorna apenas notícias publicadas depois deste timestamp (None: todas).
+        """
+        colunas = ', '.join(f"{coluna} AS \"{pergunta}\"" for pergunta, coluna in COLUNAS_CLASSIFICACAO.items())
+        sql = (
+            f"SELECT id, title, description, pub_ts, {colunas} FROM noticias "
+            "WHERE aborda_inflacao IN ('Sim', 'Não') AND origem_classificacao = '' "
+            "AND representante_id IS NULL AND id > ?"
+        )
+        parametros: List[Any] = [apos_id]
+        if apos_ts is not None:
+            sql += " AND pub_ts > ?"
+            parametros.append(apos_ts)
+        with self._conectar() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(linha) for linha in conn.execute(sql + " ORDER BY pub_ts, id", parametros)]
+
+    def contar_pendentes(self) -> int:
+        with self._conectar() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM noticias WHERE aborda_inflacao = '' AND representante_id IS NULL"
+            ).fetchone()[0]
+
+    def consultar(
+        self,
+        inicio: Optional[date] = None,
+        fim: Optional[date] = None,
+        apenas_inflacao: bool = False,
+        colunas: Optional[List[str]] = None
+    ) -> "pd.DataFrame":
+        """
+        Consulta as notícias por intervalo de datas (inclusivo, em UTC), da mais
+        recente para a mais antiga. Períodos que incluem meses já arquivados leem
+        também as partições Parquet desses meses (e só as colunas pedidas).
+
+        Args:
+            inicio: Data inicial (opcional).
+            fim: Data final (opcional).
+            apenas_inflacao: Retorna só as notícias classificadas como "Sim" na pergunta 1.
+            colunas: Colunas desejadas (nomes do CSV antigo); padrão: todas.
+
+        Returns:
+            DataFrame com as colunas no mesmo formato do antigo noticias.csv,
+            mais 'pub_ts' (segundos desde a época, UTC).
+        """
+        nomes = colunas or (COLUNAS_NOTICIA + ['pub_ts'] + PERGUNTAS)
+        selecao = ', '.join(
+            f'{COLUNAS_CLASSIFICACAO[nome]} AS "{nome}"' if nome in COLUNAS_CLASSIFICACAO else nome
+            for nome in nomes
+        )
+        condicoes, parametros = [], []
+        if inicio:
+            condicoes.append("pub_ts >= ?")
+            parametros.append(_inicio_do_dia(inicio))
+        if fim:
+            condicoes.append("pub_ts < ?")
+            parametros.append(_inicio_do_dia(fim + timedelta(days=1)))
+        if apenas_inflacao:
+            condicoes.append("aborda_inflacao = 'Sim'")
+
+        sql = f"SELECT {selecao} FROM noticias"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY pub_ts DESC"
+        import pandas as pd  # só as consultas para as páginas precisam do pandas
+        with self._conectar() as conn:
+            df = pd.read_sql_query(sql, conn, params=parametros)
+            corte = _arquivado_ate(conn)
+
+        inicio_ts = _inicio_do_dia(inicio) if inicio else None
+        if corte and (inicio_ts is None or inicio_ts < corte):
+            fim_ts = min(_inicio_do_dia(fim + timedelta(days=1)), corte) if fim else corte
+            arquivadas = self.arquivo.ler(
+                inicio_ts, fim_ts, [COLUNAS_CLASSIFICACAO.get(nome, nome) for nome in nomes], apenas_inflacao
+            )
+            if len(arquivadas):
+                arquivadas.columns = nomes
+                df = pd.concat([df, arquivadas], ignore_index=True)
+                if 'pub_ts' in df.columns:
+                    df = df.sort_values('pub_ts', ascending=False, kind='stable', ignore_index=True)
+        return df
+
+    def _filtros_busca(
+        self,
+        consulta: str,
+        desde: Optional[int],
+        ate: Optional[int],
+        apenas_inflacao: bool,
+        arquivadas: bool = False
+    ) -> Tuple[str, List[Any]]:
+        # Mesmos filtros no índice da base e no das notícias arquivadas
+        fts, tabela, chave = ('arquivadas_fts', 'arquivadas', 'arquivo_id') if arquivadas else ('noticias_fts', 'noticias', 'id')
+        condicoes, parametros = [f"{fts} MATCH ?"], [consulta_fts(consulta)]
+        if desde is not None:
+            condicoes.append("n.pub_ts >= ?")
+            parametros.append(desde)
+        if ate is not None:
+            condicoes.append("n.pub_ts < ?")
+            parametros.append(ate)
+        if apenas_inflacao:
+            condicoes.append("n.aborda_inflacao = 'Sim'")
+        # CROSS JOIN: o SQLite percorre primeiro o resultado do MATCH, e não a tabela de notícias
+        sql = f"FROM {fts} CROSS JOIN {tabela} n ON n.{chave} = {fts}.rowid WHERE " + " AND ".join(condicoes)
+        return sql, parametros
+
+    def buscar(
+        self,
+        consulta: str,
+        desde: Optional[int] = None,
+        ate: Optional[int] = None,
+        apenas_inflacao: bool = False,
+        limite: int = 25,
+        deslocamento: int = 0
+    ) -> "pd.DataFrame":
+        """
+        Busca de texto completo em título e descrição (sem diferenciar acentos e
+        maiúsculas; ver consulta_fts), da notícia mais relevante (BM25, título com
+        peso PESO_TITULO) para a menos relevante. Cobre também os meses arquivados
+        (ver compactar): o ranking usa o índice deles na base, e só as notícias
+        arquivadas da página pedida são lidas do Parquet.
+
+        Args:
+            consulta: Texto digitado pelo usuário.
+            desde: Início do período (segundos desde a época, inclusivo; opcional).
+            ate: Fim do período (segundos desde a época, exclusivo; opcional).
+            apenas_inflacao: Retorna só as notícias classificadas como "Sim" na pergunta 1.
+            limite: Número máximo de notícias (tamanho da página).
+            deslocamento: Quantas notícias pular (início da página).
+
+        Returns:
+            DataFrame com as mesmas colunas de consultar(), mais 'relevancia'
+            (pontuação BM25; quanto menor, mais relevante).
+        """
+        import pandas as pd
+        nomes = COLUNAS_NOTICIA + ['pub_ts'] + PERGUNTAS
+        if not consulta_fts(consulta):
+            return pd.DataFrame(columns=nomes + ['relevancia'])
+        filtros, parametros = self._filtros_busca(consulta, desde, ate, apenas_inflacao)
+        filtros_arquivo, parametros_arquivo = self._filtros_busca(consulta, desde, ate, apenas_inflacao, arquivadas=True)
+        # Primeiro só a página de resultados (origem, identificador e relevância) das duas fontes
+        sql = (
+            f"SELECT 0 AS arquivada, n.id AS chave, bm25(noticias_fts, {PESO_TITULO}, 1.0) AS relevancia, n.pub_ts AS pub_ts {filtros} "
+            "UNION ALL "
+            f"SELECT 1, n.arquivo_id, bm25(arquivadas_fts, {PESO_TITULO}, 1.0), n.pub_ts {filtros_arquivo} "
+            "ORDER BY relevancia, pub_ts DESC LIMIT ? OFFSET ?"
+        )
+        selecao = ', '.join(
+            f'{COLUNAS_CLASSIFICACAO[nome]} AS "{nome}"' if nome in COLUNAS_CLASSIFICACAO else nome
+            for nome in nomes
+        )
+        with self._conectar() as conn:
+            pagina = conn.execute(sql, parametros + parametros_arquivo + [limite, deslocamento]).fetchall()
+            if not pagina:
+                return pd.DataFrame(columns=nomes + ['relevancia'])
+            partes = []
+            ids = [chave for arquivada, chave, _, _ in pagina if not arquivada]
+            if ids:
+                partes.append(pd.read_sql_query(
+                    f"SELECT 0 AS arquivada, id AS chave, {selecao} FROM noticias WHERE id IN ({', '.join('?' * len(ids))})",
+                    conn, params=ids
+                ))
+
+        arquivo_ids = [chave for arquivada, chave, _, _ in pagina if arquivada]
+        if arquivo_ids:
+            instantes = [pub_ts for arquivada, _, _, pub_ts in pagina if arquivada]
+            arquivadas = self.arquivo.ler(
+                min(instantes), max(instantes) + 1,
+                ['arquivo_id'] + [COLUNAS_CLASSIFICACAO.get(nome, nome) for nome in nomes], arquivo_ids=arquivo_ids
+            )
+            arquivadas.columns = ['chave'] + nomes
+            arquivadas.insert(0, 'arquivada', 1)
+            partes.append(arquivadas)
+
+        # Reúne as duas fontes na ordem do ranking
+        ordem = pd.DataFrame(pagina, columns=['arquivada', 'chave', 'relevancia', 'pub_ts']).drop(columns='pub_ts')
+        df = ordem.merge(pd.concat(partes, ignore_index=True), on=['arquivada', 'chave'], how='inner')
+        return df[nomes + ['relevancia']]
+
+    def contar_busca(
+        self,
+        consulta: str,
+        desde: Optional[int] = None,
+        ate: Optional[int] = None,
+        apenas_inflacao: bool = False
+    ) -> int:
+        """
+        Total de notícias encontradas pela busca (mesmos filtros de buscar()).
+        """
+        if not consulta_fts(consulta):
+            return 0
+        filtros, parametros = self._filtros_busca(consulta, desde, ate, apenas_inflacao)
+        filtros_arquivo, parametros_arquivo = self._filtros_busca(consulta, desde, ate, apenas_inflacao, arquivadas=True)
+        with self._conectar() as conn:
+            return conn.execute(
+                f"SELECT (SELECT COUNT(*) {filtros}) + (SELECT COUNT(*) {filtros_arquivo})", parametros + parametros_arquivo
+            ).fetchone()[0]
+
+    def agregados_sentimento(
+        self,
+        inicio: Optional[date] = None,
+        fim: Optional[date] = None,
+        semanal: bool = False,
+        perguntas: Optional[List[str]] = None
+    ) -> "pd.DataFrame":
+        """
+        Contagem das respostas por período, feed e pergunta, lida só da tabela de
+        agregados (o custo depende do número de dias, e não do de notícias).
+
+        Args:
+            inicio: Data inicial (opcional, inclusivo, UTC).
+            fim: Data final (opcional, inclusivo, UTC).
+            semanal: Soma os dias por semana (segunda a domingo).
+            perguntas: Perguntas desejadas (nomes do CSV antigo); padrão: todas.
+
+        Returns:
+            DataFrame com 'data' (dia, ou segunda-feira da semana), 'feed_url',
+            'pergunta' (texto da pergunta), 'resposta' e 'contagem'.
+        """
+        import pandas as pd
+        # Dia 0 da época é uma quinta-feira: (dia + 3) // 7 agrupa de segunda a domingo
+        periodo = "(dia + 3) / 7 * 7 - 3" if semanal else "dia"
+        colunas = [COLUNAS_CLASSIFICACAO[p] for p in (perguntas or PERGUNTAS)]
+        condicoes = [f"pergunta IN ({', '.join('?' for _ in colunas)})"]
+        parametros: List[Any] = list(colunas)
+        if inicio:
+            condicoes.append("dia >= ?")
+            parametros.append(_inicio_do_dia(inicio) // SEGUNDOS_DIA)
+        if fim:
+            condicoes.append("dia <= ?")
+            parametros.append(_inicio_do_dia(fim) // SEGUNDOS_DIA)
+        sql = (
+            f"SELECT {periodo} AS periodo, feed_url, pergunta, resposta, SUM(contagem) AS contagem "
+            f"FROM agregados_sentimento WHERE {' AND '.join(condicoes)} "
+            "GROUP BY 1, 2, 3, 4 ORDER BY 1"
+        )
+        with self._conectar() as conn:
+            df = pd.read_sql_query(sql, conn, params=parametros)
+        perguntas_por_coluna = {coluna: pergunta for pergunta, coluna in COLUNAS_CLASSIFICACAO.items()}
+        df.insert(0, 'data', pd.to_datetime(df.pop('periodo'), unit='D').dt.date)
+        df['pergunta'] = df['pergunta'].map(perguntas_por_coluna)
+        return df
+
+    def reconstruir_agregados(self) -> None:
+        """
+        Recalcula os agregados de sentimento a partir de todas as notícias classificadas.
+        """
+        with self._conectar() as conn:
+            _reconstruir_agregados(conn)
+            self._incrementar_versao(conn)
+
+    def frequencias_palavras(
+        self,
+        inicio: Optional[date] = None,
+        fim: Optional[date] = None,
+        feed_url: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Soma as contagens diárias de palavras das notícias sobre inflação no período
+        (inclusivo, em UTC) e, opcionalmente, de um único feed. O custo depende do
+        número de dias do período, não do tamanho do histórico.
+        """
+        condicoes, parametros = [], []
+        if inicio:
+            condicoes.append("dia >= ?")
+            parametros.append(_inicio_do_dia(inicio) // SEGUNDOS_DIA)
+        if fim:
+            condicoes.append("dia <= ?")
+            parametros.append(_inicio_do_dia(fim) // SEGUNDOS_DIA)
+        if feed_url:
+            condicoes.append("feed_url = ?")
+            parametros.append(feed_url)
+        sql = "SELECT palavra, SUM(contagem) FROM frequencias"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " GROUP BY palavra"
+        with self._conectar() as conn:
+            return dict(conn.execute(sql, parametros).fetchall())
+
+    def intervalo_datas(self) -> Tuple[Optional[date], Optional[date]]:
+        """
+        Retorna a menor e a maior data de publicação (UTC), ou (None, None) se não houver notícias.
+        O arquivo Parquet entra pelos metadados dos arquivos, sem leitura das notícias.
+        """
+        with self._conectar() as conn:
+            minimo, maximo = conn.execute("SELECT MIN(pub_ts), MAX(pub_ts) FROM noticias").fetchone()
+        limites = [v for v in (minimo, maximo, *self.arquivo.limites()) if v is not None]
+        if not limites:
+            return None, None
+        minimo, maximo = min(limites), max(limites)
+        return (
+            datetime.fromtimestamp(minimo, tz=timezone.utc).date(),
+            datetime.fromtimestamp(maximo, tz=timezone.utc).date(),
+        )
+
+    def contar(self) -> int:
+        with self._conectar() as conn:
+            quentes = conn.execute("SELECT COUNT(*) FROM noticias").fetchone()[0]
+        return quentes + self.arquivo.contar()
+
+    def inicio_quente(self) -> Optional[date]:
+        """
+        Primeiro dia (UTC) cujas notícias estão todas na base; as anteriores ficam no
+        arquivo Parquet. None se nada foi arquivado.
+        """
+        with self._conectar() as conn:
+            corte = _arquivado_ate(conn)
+        return datetime.fromtimestamp(corte, tz=timezone.utc).date() if corte else None
+
+    ##### Compactação #####
+    def compactar(self, meses_quentes: int = MESES_QUENTES, hoje: Optional[date] = None) -> int:
+        """
+        Move para o arquivo Parquet (uma partição por mês, ver backend/arquivo.py) as
+        notícias já classificadas publicadas antes dos últimos `meses_quentes` meses
+        (contando o atual). As pendentes continuam na base até serem classificadas e
+        vão na compactação seguinte.
+
+        Os agregados por dia (frequências de palavras e sentimento) dos meses
+        arquivados permanecem na base, então a nuvem de palavras e as tendências
+        continuam cobrindo todo o histórico, assim como o índice de texto (a busca
+        lê do Parquet só as notícias da página de resultados).
+
+        Retorna o número de notícias arquivadas.
+        """
+        import pandas as pd
+
+        hoje = hoje or datetime.now(timezone.utc).date()
+        meses = hoje.year * 12 + hoje.month - 1 - (meses_quentes - 1)
+        corte = _inicio_do_dia(date(meses // 12, meses % 12 + 1, 1))
+        with self._conectar() as conn:
+            corte = max(corte, _arquivado_ate(conn))
+            colunas = [c for c in _COLUNAS_ARQUIVO if c != 'arquivo_id']
+            df = pd.read_sql_query(
+                f"SELECT id, {', '.join(colunas)} FROM noticias WHERE pub_ts < ? AND aborda_inflacao != ''",
+                conn, params=(corte,),
+            )
+            # As notícias arquivadas continuam no índice de texto (tabela arquivadas_fts)
+            df = _indexar_arquivadas(conn, df)
+            # Partições gravadas antes do commit: se a transação falhar, a próxima
+            # compactação regrava o mês sem duplicar (chave feed_url, pub_date, title)
+            for mes, parte in df.groupby(df['pub_ts'].map(mes_de)):
+                self.arquivo.acrescentar(mes, parte)
+
+            # Os gatilhos descontariam as notícias removidas dos agregados de sentimento:
+            # os dias arquivados são restaurados depois da remoção
+            dia_corte = corte // SEGUNDOS_DIA
+            conn.execute("CREATE TEMP TABLE agregados_arquivados AS SELECT * FROM agregados_sentimento WHERE dia < ?", (dia_corte,))
+            ids = [(int(i),) for i in df['id']]
+            conn.executemany("DELETE FROM noticias WHERE id = ?", ids)
+            conn.executemany("DELETE FROM simhash_bandas WHERE noticia_id = ?", ids)
+            conn.execute("DELETE FROM agregados_sentimento WHERE dia < ?", (dia_corte,))
+            conn.execute("INSERT INTO agregados_sentimento SELECT * FROM agregados_arquivados")
+            conn.execute("DROP TABLE agregados_arquivados")
+            conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('arquivado_ate', ?)", (corte,))
+            if ids:
+                self._incrementar_versao(conn)
+        if ids:
+            # Devolve ao sistema o espaço das notícias removidas
+            conn = sqlite3.connect(self.caminho, timeout=30)
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+            print(f"{len(ids)} notícias arquivadas em {self.arquivo.diretorio} (base mantém a partir de {self.inicio_quente()}).")
+        return len(ids)
+
+    ##### Migração #####
+    def migrar_csv(self, csv_filepath: str) -> int:
+        """
+        Importa o histórico de um noticias.csv no formato antigo.
+        Pode ser executada mais de uma vez: notícias já cadastradas são ignoradas.
+        """
+        import pandas as pd
+        df = pd.read_csv(csv_filepath, dtype=str).fillna("")
+        inseridas = self.inserir(df.to_dict('records'))
+        print(f"{inseridas} notícias importadas de {csv_filepath} ({len(df)} linhas lidas).")
+        return inseridas
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Ferramentas do repositório de notícias.")
+    subcomandos = arg_parser.add_subparsers(dest='comando', required=True)
+    migrar = subcomandos.add_parser('migrar', help="Importa um noticias.csv antigo para o SQLite.")
+    migrar.add_argument('csv', nargs='?', default=CSV_LEGADO)
+    migrar.add_argument('--db', default=DB_PADRAO)
+    reindexar = subcomandos.add_parser('reindexar', help="Recalcula a tabela de frequências de palavras.")
+    reindexar.add_argument('--db', default=DB_PADRAO)
+    normalizar = subcomandos.add_parser('normalizar-datas', help="Regrava as datas de publicação na forma canônica.")
+    normalizar.add_argument('--db', default=DB_PADRAO)
+    agregar = subcomandos.add_parser('agregar', help="Recalcula os agregados de sentimento.")
+    agregar.add_argument('--db', default=DB_PADRAO)
+    compactar = subcomandos.add_parser('compactar', help="Move os meses antigos para o arquivo Parquet.")
+    compactar.add_argument('--meses', type=int, default=MESES_QUENTES,
+                           help="Meses mantidos na base, contando o atual.")
+    compactar.add_argument('--db', default=DB_PADRAO)
+    buscar = subcomandos.add_parser('buscar', help="Busca de texto completo nas notícias.")
+    buscar.add_argument('consulta')
+    buscar.add_argument('--limite', type=int, default=10)
+    buscar.add_argument('--db', default=DB_PADRAO)
+    args = arg_parser.parse_args()
+
+    if args.comando == 'migrar':
+        RepositorioNoticias(args.db, csv_legado=None).migrar_csv(args.csv)
+    elif args.comando == 'reindexar':
+        RepositorioNoticias(args.db, csv_legado=None).reconstruir_frequencias()
+    elif args.comando == 'normalizar-datas':
+        repositorio = RepositorioNoticias(args.db, csv_legado=None)
+        if repositorio.normalizar_datas():
+            repositorio.reconstruir_frequencias()
+    elif args.comando == 'agregar':
+        RepositorioNoticias(args.db, csv_legado=None).reconstruir_agregados()
+    elif args.comando == 'compactar':
+        RepositorioNoticias(args.db, csv_legado=None).compactar(args.meses)
+    elif args.comando == 'buscar':
+        repositorio = RepositorioNoticias(args.db, csv_legado=None)
+        print(f"{repositorio.contar_busca(args.consulta)} notícias encontradas.")
+        for noticia in repositorio.buscar(args.consulta, limite=args.limite).to_dict('records'):
+            print(f"  [{noticia['relevancia']:.2f}] {noticia['pub_date']} {noticia['title']}")
@@ -0,0 +1,229 @@
+# rss.py
+"""
+Coleta de feeds RSS compartilhada entre o app (backend/services.py) e a rotina
+de atualização (backend/atualiza_noticias.py).
+
+Os feeds são baixados em paralelo por um pool de threads limitado, todos usando
+a mesma sessão HTTP (conexões keep-alive reaproveitadas). Assim o tempo total
+fica limitado pelo feed mais lento, e não pela soma de todos.
+
+Com um CacheFeeds (backend/cache_feeds.py) as requisições são condicionais:
+feeds sem alteração respondem 304 e não precisam ser baixados novamente.
+
+O parse é incremental (iterar_itens): cada <item> (RSS) ou <entry> (Atom) é
+convertido em um dicionário assim que o elemento fecha e depois esvaziado,
+mantendo a memória estável mesmo em feeds grandes ou arquivos históricos.
+"""
+import io
+import time
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.cache_feeds import CacheFeeds
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; RSSBot/1.0)'}
+
+# Número padrão de downloads simultâneos
+MAX_WORKERS_PADRAO = 8
+
+# Namespaces dos formatos suportados
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_RSS1 = '{http://purl.org/rss/1.0/}'
+_DC = '{http://purl.org/dc/elements/1.1/}'
+
+# Tags que delimitam um item: RSS 2.0, RSS 1.0 (RDF) e Atom
+_TAGS_ITEM = {'item', _RSS1 + 'item', _ATOM + 'entry'}
+
+# Tag do filho -> campo do registro (vale o primeiro filho encontrado de cada campo)
+_CAMPOS = {
+    'title': 'title',
+    'description': 'description',
+    'link': 'link',
+    'pubDate': 'pub_date',
+    _RSS1 + 'title': 'title',
+    _RSS1 + 'description': 'description',
+    _RSS1 + 'link': 'link',
+    _DC + 'date': 'pub_date',
+    _ATOM + 'title': 'title',
+    _ATOM + 'summary': 'description',
+    _ATOM + 'content': 'description',
+    _ATOM + 'published': 'pub_date',
+    _ATOM + 'updated': 'pub_date',
+}
+
+_sessao: Optional[requests.Session] = None
+_sessao_lock = threading.Lock()
+
+
+@dataclass
+class ResultadoFeed:
+    """
+    Resultado do download de um feed.
+
+    Atributos:
+      - feed_url: URL do feed.
+      - status: código HTTP (None se a requisição falhou).
+      - conteudo: corpo da resposta (status 200, ou corpo em cache quando status == 304).
+      - latencia: tempo gasto na requisição, em segundos.
+      - erro: mensagem de erro quando a requisição falhou.
+      - nao_modificado: True quando o servidor respondeu 304 (feed igual ao da última busca).
+    """
+    feed_url: str
+    status: Optional[int] = None
+    conteudo: Optional[bytes] = None
+    latencia: float = 0.0
+    erro: Optional[str] = None
+    nao_modificado: bool = False
+
+
+def criar_sessao(max_conexoes: int = MAX_WORKERS_PADRAO) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões keep-alive dimensionado para
+    `max_conexoes` downloads simultâneos.
+    """
+    sessao = requests.Session()
+    sessao.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount('http://', adapter)
+    sessao.mount('https://', adapter)
+    return sessao
+
+
+def obter_sessao() -> requests.Session:
+    """
+    Retorna a sessão compartilhada do processo, criando-a no primeiro uso.
+    Reaproveitar a sessão entre buscas mantém as conexões abertas entre cliques.
+    """
+    global _sessao
+    with _sessao_lock:
+        if _sessao is None:
+            _sessao = criar_sessao()
+        return _sessao
+
+
+def buscar_feed(
+    url: str,
+    sessao: Optional[requests.Session] = None,
+    timeout: float = 10,
+    cache: Optional[CacheFeeds] = None
+) -> ResultadoFeed:
+    """
+    Baixa um único feed e mede a latência da requisição.
+    Com `cache`, envia os validadores guardados e, em caso de 304, devolve o corpo em cache.
+    Erros de rede não são propagados: ficam registrados em `erro`.
+    """
+    sessao = sessao or obter_sessao()
+    cabecalhos = cache.cabecalhos_condicionais(url) if cache is not None else {}
+    inicio = time.perf_counter()
+    try:
+        response = sessao.get(url, headers=cabecalhos, timeout=timeout)
+    except requests.RequestException as e:
+        return ResultadoFeed(feed_url=url, latencia=time.perf_counter() - inicio, erro=str(e))
+    latencia = time.perf_counter() - inicio
+
+    if response.status_code == 304 and cache is not None:
+        return ResultadoFeed(
+            feed_url=url,
+            status=304,
+            conteudo=cache.obter_corpo(url),
+            latencia=latencia,
+            nao_modificado=True,
+        )
+
+    conteudo = response.content if response.status_code == 200 else None
+    if conteudo is not None and cache is not None:
+        cache.salvar(url, conteudo, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    return ResultadoFeed(feed_url=url, status=response.status_code, conteudo=conteudo, latencia=latencia)
+
+
+def buscar_feeds(
+    feed_urls: List[str],
+    max_workers: int = MAX_WORKERS_PADRAO,
+    timeout: float = 10,
+    sessao: Optional[requests.Session] = None,
+    cache: Optional[CacheFeeds] = None
+) -> List[ResultadoFeed]:
+    """
+    Baixa vários feeds simultaneamente.
+
+    Args:
+        feed_urls: Lista de URLs de feeds RSS.
+        max_workers: Número máximo de downloads simultâneos (1 = sequencial).
+        timeout: Tempo limite de cada requisição, em segundos.
+        sessao: Sessão HTTP a ser usada (padrão: sessão compartilhada do processo).
+        cache: Cache de validadores para requisições condicionais (opcional).
+
+    Returns:
+        Um ResultadoFeed por URL, na mesma ordem de `feed_urls`.
+    """
+    sessao = sessao or obter_sessao()
+    if max_workers <= 1 or len(feed_urls) <= 1:
+        return [buscar_feed(url, sessao, timeout, cache) for url in feed_urls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(feed_urls))) as executor:
+        # executor.map preserva a ordem de entrada, garantindo resultado determinístico
+        return list(executor.map(lambda url: buscar_feed(url, sessao, timeout, cache), feed_urls))
+
+
+def imprimir_latencias(resultados: List[ResultadoFeed], tempo_total: float) -> None:
+    """
+    Imprime a latência de cada feed e o tempo total da coleta.
+    """
+    for resultado in resultados:
+        situacao = resultado.status if resultado.erro is None else "erro"
+        if resultado.nao_modificado:
+            situacao = "304, sem alterações"
+        print(f"  {resultado.feed_url}: {resultado.latencia:.2f} s (status: {situacao})")
+    print(f"Coleta de {len(resultados)} feeds concluída em {tempo_total:.2f} s.")
+
+
+def _extrair_campos(elem: ET.Element) -> Dict[str, str]:
+    """
+    Extrai title, description, link e pub_date de um <item>/<entry> percorrendo
+    seus filhos uma única vez.
+    """
+    registro = {'title': "", 'description': "", 'link': "", 'pub_date': ""}
+    for filho in elem:
+        tag = filho.tag
+        if tag == _ATOM + 'link':
+            # No Atom o link fica no atributo href; só o link principal (rel="alternate") interessa
+            if not registro['link'] and filho.get('rel', 'alternate') == 'alternate':
+                registro['link'] = filho.get('href') or ""
+            continue
+        campo = _CAMPOS.get(tag)
+        if campo is None:
+            continue
+        texto = filho.text or ""
+        # 'published' tem prioridade sobre 'updated' nas entradas Atom
+        if texto and (not registro[campo] or tag == _ATOM + 'published'):
+            registro[campo] = texto
+    return registro
+
+
+def iterar_itens(fonte: Union[bytes, BinaryIO]) -> Iterator[Dict[str, str]]:
+    """
+    Percorre um feed RSS/Atom de forma incremental, produzindo um dicionário
+    (title, description, link, pub_date) por item assim que o elemento fecha.
+
+    Cada item é esvaziado (elem.clear()) depois de processado, portanto textos e
+    filhos não se acumulam na memória. Aceita o corpo da resposta (bytes) ou um
+    arquivo aberto em modo binário.
+
+    Levanta ET.ParseError se o XML for inválido; os itens anteriores ao erro já
+    terão sido produzidos.
+    """
+    if isinstance(fonte, (bytes, bytearray)):
+        fonte = io.BytesIO(fonte)
+
+    # Apenas eventos 'end': eventos 'start' dobrariam o custo do parse em Python
+    for _, elem in ET.iterparse(fonte, events=('end',)):
+        if elem.tag in _TAGS_ITEM:
+            yield _extrair_campos(elem)
+            elem.clear()
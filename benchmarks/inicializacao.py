@@ -0,0 +1,145 @@
+# inicializacao.py
+"""
+Benchmark de inicialização: tempo de importação e memória (RSS) de cada ponto
+de entrada do app, com verificação de regressão contra uma linha de base.
+
+Para cada página, os módulos `backend.*` que ela importa são lidos do próprio
+arquivo (via ast) e importados em um processo Python novo, medindo o tempo das
+importações e o pico de memória do processo. A rotina de atualização
+(backend.atualiza_noticias) também é medida. A mediana de várias repetições
+reduz o ruído.
+
+A linha de base (benchmarks/inicializacao_base.json) fica no repositório; sem
+ela, ou se algum ponto de entrada falhar ao importar, a verificação falha.
+Regrave-a (e faça o commit) quando uma mudança alterar a inicialização de propósito.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.inicializacao --salvar-base   # grava a linha de base
+    python -m benchmarks.inicializacao                 # compara; sai com código 1 se regredir
+"""
+import os
+import ast
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PADRAO = os.path.join(os.path.dirname(__file__), 'inicializacao_base.json')
+PAGINAS = [
+    '0_🏠 Início.py',
+    os.path.join('pages', '1_📊 Histórico de Notícias.py'),
+    os.path.join('pages', '2_🔎 Buscador de Notícias.py'),
+    os.path.join('pages', '3_📈 Tendências.py'),
+    os.path.join('pages', '4_⏱️ Métricas.py'),
+]
+
+# Regressão: acima de (1 + tolerância) vezes a base e de uma folga absoluta (ruído de máquinas lentas)
+TOLERANCIA = 0.5
+FOLGA_SEGUNDOS = 0.05
+FOLGA_MB = 10.0
+
+_MEDIDOR = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+for modulo in sys.argv[1:]:
+    __import__(modulo)
+segundos = time.perf_counter() - inicio
+pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"segundos": segundos, "rss_mb": pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024}))
+"""
+
+
+def modulos_backend(caminho: str) -> List[str]:
+    """
+    Módulos do pacote backend importados no nível superior de um arquivo.
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        arvore = ast.parse(f.read())
+    modulos = []
+    for no in arvore.body:
+        if isinstance(no, ast.ImportFrom) and no.module and no.module.split('.')[0] == 'backend':
+            modulos.append(no.module)
+        elif isinstance(no, ast.Import):
+            modulos += [alias.name for alias in no.names if alias.name.split('.')[0] == 'backend']
+    return list(dict.fromkeys(modulos))
+
+
+def pontos_de_entrada() -> Dict[str, List[str]]:
+    entradas = {pagina: modulos_backend(os.path.join(RAIZ, pagina)) for pagina in PAGINAS}
+    entradas['backend/atualiza_noticias.py'] = ['backend.atualiza_noticias']
+    return entradas
+
+
+def medir(modulos: List[str], repeticoes: int = 5) -> Dict[str, float]:
+    """
+    Mediana do tempo de importação e do pico de memória de `modulos` em processos novos.
+    """
+    medidas = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', _MEDIDOR, *modulos],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        medidas.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    return {
+        'segundos': round(statistics.median(m['segundos'] for m in medidas), 4),
+        'rss_mb': round(statistics.median(m['rss_mb'] for m in medidas), 1),
+    }
+
+
+def regressoes(atual: Dict[str, Dict[str, float]], base: Dict[str, Dict[str, float]]) -> List[str]:
+    problemas = []
+    for entrada, medida in atual.items():
+        referencia = base.get(entrada)
+        if not referencia:
+            continue
+        for chave, folga in (('segundos', FOLGA_SEGUNDOS), ('rss_mb', FOLGA_MB)):
+            limite = max(referencia[chave] * (1 + TOLERANCIA), referencia[chave] + folga)
+            if medida[chave] > limite:
+                problemas.append(f"{entrada}: {chave} {medida[chave]} > {limite:.2f} (base {referencia[chave]})")
+    return problemas
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Tempo de importação e memória de cada ponto de entrada.")
+    arg_parser.add_argument('--repeticoes', type=int, default=5)
+    arg_parser.add_argument('--base', default=BASE_PADRAO, help="Arquivo JSON da linha de base.")
+    arg_parser.add_argument('--salvar-base', action='store_true', help="Grava as medidas atuais como linha de base.")
+    args = arg_parser.parse_args()
+
+    atual = {}
+    falhas = []
+    for entrada, modulos in pontos_de_entrada().items():
+        try:
+            atual[entrada] = medir(modulos, args.repeticoes)
+        except subprocess.CalledProcessError as e:
+            print(f"{entrada}: falha ao importar {modulos}\n{e.stderr.strip().splitlines()[-1]}")
+            falhas.append(entrada)
+            continue
+        print(f"{entrada:<45}{atual[entrada]['segundos']:>8.3f} s{atual[entrada]['rss_mb']:>9.1f} MB  ({', '.join(modulos)})")
+
+    if falhas:
+        print("Pontos de entrada que não puderam ser medidos:", *falhas, sep="\n  ")
+        sys.exit(1)
+    if args.salvar_base:
+        with open(args.base, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Linha de base gravada em {args.base}.")
+    elif not os.path.exists(args.base):
+        print(f"Sem linha de base em {args.base}: grave uma com --salvar-base.", file=sys.stderr)
+        sys.exit(1)
+    else:
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        problemas = regressoes(atual, base)
+        sem_base = sorted(set(atual) - set(base))
+        if sem_base:
+            problemas += [f"{entrada}: sem medida na linha de base (regrave com --salvar-base)" for entrada in sem_base]
+        if problemas:
+            print("Regressões de inicialização:", *problemas, sep="\n  ")
+            sys.exit(1)
+        print("Sem regressões em relação à linha de base.")
@@ -0,0 +1,145 @@
+# llm_falso.py
+"""
+Imitação local do endpoint /v1/chat/completions da OpenAI para benchmarks.
+
+Responde no mesmo formato da API, tanto à classificação individual (quatro
+linhas) quanto à classificação em lote (JSON com "classificacoes"), com
+latência e taxa de erro configuráveis. Os erros sorteados alternam entre 429
+e 500, exercitando as novas tentativas de backend/classificacao.py.
+
+O cliente é apontado para o servidor com:
+    openai.OpenAI(base_url=servidor.url_base + "/v1", api_key="falso", max_retries=0)
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+_PREFIXO_LOTE = "Classifique os artigos:\n"
+
+
+def _respostas(titulo: str) -> List[str]:
+    """
+    Respostas determinísticas a partir do título, para que execuções repetidas sejam comparáveis.
+    """
+    titulo = titulo.lower()
+    inflacao = "infla" in titulo or "preço" in titulo or "ipca" in titulo
+    alimentos = inflacao and any(p in titulo for p in ("aliment", "arroz", "café", "carne", "feijão", "leite"))
+    queda = any(p in titulo for p in ("queda", "baratos", "desacelera"))
+    return [
+        "Sim" if inflacao else "Não",
+        ("Sim" if queda else "Não") if inflacao else "Não se aplica",
+        "Sim" if alimentos else ("Não" if inflacao else "Não se aplica"),
+        ("Sim" if queda else "Não") if alimentos else "Não se aplica",
+    ]
+
+
+def _conteudo_resposta(mensagens: List[Dict[str, Any]]) -> str:
+    usuario = mensagens[-1]['content'] if mensagens else ""
+    if usuario.startswith(_PREFIXO_LOTE):
+        artigos = json.loads(usuario[len(_PREFIXO_LOTE):])
+        return json.dumps({"classificacoes": [
+            dict(id=artigo['id'], **{f"q{n}": r for n, r in enumerate(_respostas(artigo['titulo']), 1)})
+            for artigo in artigos
+        ]}, ensure_ascii=False)
+    return "\n".join(f"{n}. {r}" for n, r in enumerate(_respostas(usuario), 1))
+
+
+class ServidorLLMFalso:
+    """
+    Servidor de chat completions em uma thread de fundo.
+
+    Args:
+        latencia: Atraso fixo de cada resposta, em segundos.
+        jitter: Atraso adicional aleatório máximo, em segundos.
+        taxa_erro: Fração das requisições respondidas com 429 ou 500.
+    """
+
+    def __init__(self, latencia: float = 0.0, jitter: float = 0.0, taxa_erro: float = 0.0, porta: int = 0):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_erro = taxa_erro
+        self.requisicoes = 0
+        self.erros = 0
+        self._lock = threading.Lock()
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                corpo = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b"{}")
+                time.sleep(servidor.latencia + random.uniform(0, servidor.jitter))
+                with servidor._lock:
+                    servidor.requisicoes += 1
+                    falhar = random.random() < servidor.taxa_erro
+                    if falhar:
+                        servidor.erros += 1
+                if not self.path.endswith('/chat/completions'):
+                    self._responder(404, {"error": {"message": "not found"}})
+                elif falhar:
+                    status = random.choice((429, 500))
+                    self._responder(status, {"error": {"message": "erro simulado", "type": "server_error"}})
+                else:
+                    conteudo = _conteudo_resposta(corpo.get('messages', []))
+                    prompt = sum(len(m.get('content', '')) for m in corpo.get('messages', [])) // 4
+                    self._responder(200, {
+                        "id": "chatcmpl-falso",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": corpo.get('model', ''),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": conteudo},
+                            "finish_reason": "stop"
+                        }],
+                        "usage": {
+                            "prompt_tokens": prompt,
+                            "completion_tokens": len(conteudo) // 4,
+                            "total_tokens": prompt + len(conteudo) // 4
+                        }
+                    })
+
+            def _responder(self, status: int, dados: Dict[str, Any]) -> None:
+                saida = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(saida)))
+                self.end_headers()
+                self.wfile.write(saida)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url_base(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def iniciar(self) -> 'ServidorLLMFalso':
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Endpoint local de chat completions para benchmarks.")
+    arg_parser.add_argument('--latencia', type=float, default=0.2)
+    arg_parser.add_argument('--jitter', type=float, default=0.0)
+    arg_parser.add_argument('--taxa-erro', type=float, default=0.0)
+    arg_parser.add_argument('--porta', type=int, default=8002)
+    args = arg_parser.parse_args()
+
+    servidor = ServidorLLMFalso(args.latencia, args.jitter, args.taxa_erro, args.porta).iniciar()
+    print(f"Servindo em {servidor.url_base}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.parar()
@@ -0,0 +1,239 @@
+# pipeline.py
+"""
+Benchmark offline da rotina de atualização: coleta (busca -> parse -> keywords)
+-> gravação na base -> classificação, usando o servidor RSS local
+(benchmarks/servidor_rss.py) e o endpoint de chat falso (benchmarks/llm_falso.py).
+
+A coleta é o mesmo pipeline da rotina de atualização (encadear com
+pipeline.etapas_busca), com as etapas rodando ao mesmo tempo; o tempo de cada
+uma (download, parse e keywords) vem das métricas por feed (backend/metricas.py)
+e é o tempo gasto dentro da etapa, somado entre os feeds. A gravação usa
+update_noticias_csv, e a classificação as mesmas funções de
+processar_classificacao_csv (montar_lotes, classificar_em_paralelo,
+classificar_lote). Base, cache de feeds e cache de classificações ficam em um
+diretório temporário, descartado ao final.
+
+Relata, para cada carga: tempo e vazão de cada etapa, vazão total (itens/s) e
+pico de memória do processo. Com --memoria-por-etapa, mede também o pico de
+alocações da coleta, da gravação e da classificação via tracemalloc (mais
+lento; use só para memória).
+
+Exemplos:
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --itens 1000 10000 100000 --latencia-feed 0.3 --latencia-llm 0.5
+    python -m benchmarks.pipeline --itens 5000 --taxa-erro 0.05 --saida resultado.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Limites altos no limitador de taxa: o benchmark mede o pipeline, não a cota da conta
+# (lidos por backend/classificacao.py na importação; use --rpm/--tpm para simular a cota)
+os.environ.setdefault("OPENAI_RPM", "1000000")
+os.environ.setdefault("OPENAI_TPM", "1000000000")
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import openai
+
+from backend import classificacao, metricas
+from backend.atualiza_noticias import update_noticias_csv
+from backend.cache_classificacao import CacheClassificacao
+from backend.cache_feeds import CacheFeeds
+from backend.palavras_chave import CSV_PADRAO, RegistroPalavrasChave, obter_registro
+from backend.classificacao import classificar_em_paralelo, classificar_lote, montar_lotes
+from backend.pipeline import encadear, etapas_busca, reunir
+from backend.repositorio import PERGUNTAS, RepositorioNoticias
+
+from benchmarks.llm_falso import ServidorLLMFalso
+from benchmarks.servidor_rss import ServidorRSS
+
+CARGAS_PADRAO = [1000, 10000, 100000]
+
+
+def _pico_rss_mb() -> float:
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+class Medidor:
+    """
+    Acumula tempo (e, opcionalmente, pico de alocações) de cada etapa.
+    """
+
+    def __init__(self, memoria_por_etapa: bool = False):
+        self.memoria_por_etapa = memoria_por_etapa
+        self.etapas: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[Dict[str, Any]]:
+        registro = self.etapas.setdefault(nome, {'segundos': 0.0, 'itens': 0})
+        if self.memoria_por_etapa:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro['segundos'] += time.perf_counter() - inicio
+            if self.memoria_por_etapa:
+                registro['pico_alocacoes_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+                tracemalloc.stop()
+
+
+def executar_carga(
+    itens: int,
+    feeds: int = 9,
+    latencia_feed: float = 0.0,
+    latencia_llm: float = 0.0,
+    taxa_erro: float = 0.0,
+    max_workers_feeds: int = 8,
+    max_workers_llm: int = classificacao.MAX_WORKERS_PADRAO,
+    classificar: bool = True,
+    memoria_por_etapa: bool = False,
+    keywords: Optional[RegistroPalavrasChave] = None
+) -> Dict[str, Any]:
+    """
+    Executa o pipeline completo para uma carga de `itens` itens distribuídos em `feeds` feeds.
+    Sem `keywords`, usa o mesmo registro da rotina de atualização (obter_registro(CSV_PADRAO)).
+    """
+    if keywords is None:
+        keywords = obter_registro(CSV_PADRAO)
+    servidor_rss = ServidorRSS(feeds=feeds, itens_por_feed=max(1, itens // feeds), latencia=latencia_feed).iniciar()
+    servidor_llm = ServidorLLMFalso(latencia=latencia_llm, taxa_erro=taxa_erro).iniciar()
+    diretorio = tempfile.mkdtemp(prefix='bench_alerta_')
+    medidor = Medidor(memoria_por_etapa)
+    inicio_total = time.perf_counter()
+    try:
+        with metricas.execucao('benchmark', diretorio=None) as execucao:
+            with medidor.etapa('coleta') as registro:
+                etapas = etapas_busca(
+                    servidor_rss.urls(), keywords, max_workers_feeds, cache=CacheFeeds(os.path.join(diretorio, 'feeds'))
+                )
+                noticias, _ = reunir(encadear(*etapas), servidor_rss.urls())
+                registro['encontradas'] = len(noticias)
+
+        # Tempo dentro de cada etapa da coleta (as etapas se sobrepõem: a soma passa do tempo da coleta)
+        feeds_medidos = execucao.como_dict()['feeds'].values()
+
+        def somar(chave: str) -> float:
+            return sum(valores.get(chave, 0) for valores in feeds_medidos)
+
+        itens_lidos = int(somar('itens'))
+        medidor.etapas['coleta'].update(itens=itens_lidos, bytes=int(somar('bytes')))
+        medidor.etapas['  download'] = {'segundos': somar('busca_segundos'), 'itens': len(feeds_medidos)}
+        medidor.etapas['  parse'] = {'segundos': somar('parse_segundos'), 'itens': itens_lidos}
+        medidor.etapas['  keywords'] = {
+            'segundos': somar('keywords_segundos'), 'itens': itens_lidos, 'encontradas': int(somar('correspondencias'))
+        }
+
+        repositorio = RepositorioNoticias(os.path.join(diretorio, 'noticias.db'), csv_legado=None)
+        with medidor.etapa('gravacao') as registro:
+            registro['itens'] = len(noticias)
+            registro['inseridas'] = update_noticias_csv(noticias, repositorio)
+
+        if classificar:
+            client = openai.OpenAI(base_url=servidor_llm.url_base + "/v1", api_key="falso", max_retries=0)
+            cache = CacheClassificacao(os.path.join(diretorio, 'classificacoes.db'))
+            with medidor.etapa('classificacao') as registro:
+                pendentes = repositorio.pendentes()
+                lotes = montar_lotes(pendentes)
+                classificados = 0
+                for indice, resultados_lote in classificar_em_paralelo(
+                    lotes, lambda lote: classificar_lote(lote, client, cache=cache), max_workers_llm
+                ):
+                    gravar = [
+                        (artigo['id'], {pergunta: artigo[pergunta] for pergunta in PERGUNTAS})
+                        for artigo in resultados_lote if artigo
+                    ]
+                    repositorio.salvar_classificacoes(gravar)
+                    classificados += len(gravar)
+                registro['itens'] = len(pendentes)
+                registro['classificadas'] = classificados
+                registro['chamadas_api'] = servidor_llm.requisicoes
+                registro['erros_simulados'] = servidor_llm.erros
+    finally:
+        tempo_total = time.perf_counter() - inicio_total
+        servidor_rss.parar()
+        servidor_llm.parar()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    for registro in medidor.etapas.values():
+        registro['segundos'] = round(registro['segundos'], 3)
+        registro['itens_por_segundo'] = round(registro['itens'] / registro['segundos'], 1) if registro['segundos'] else None
+    return {
+        'itens': itens,
+        'feeds': feeds,
+        'segundos': round(tempo_total, 3),
+        'itens_por_segundo': round(itens / tempo_total, 1),
+        'pico_memoria_mb': round(_pico_rss_mb(), 1),
+        'etapas': medidor.etapas,
+    }
+
+
+def imprimir_resultado(resultado: Dict[str, Any]) -> None:
+    print(f"\n=== {resultado['itens']} itens em {resultado['feeds']} feeds ===")
+    print(f"{'etapa':<15}{'segundos':>10}{'itens':>10}{'itens/s':>12}  detalhes")
+    for nome, registro in resultado['etapas'].items():
+        detalhes = {k: v for k, v in registro.items() if k not in ('segundos', 'itens', 'itens_por_segundo')}
+        vazao = registro['itens_por_segundo']
+        print(
+            f"{nome:<15}{registro['segundos']:>10.3f}{registro['itens']:>10}"
+            f"{vazao if vazao is not None else '-':>12}  {detalhes or ''}"
+        )
+    print(
+        f"Total: {resultado['segundos']:.3f} s | {resultado['itens_por_segundo']} itens/s | "
+        f"pico de memória do processo: {resultado['pico_memoria_mb']} MB"
+    )
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Benchmark offline do pipeline de atualização de notícias.")
+    arg_parser.add_argument('--itens', type=int, nargs='+', default=CARGAS_PADRAO, help="Cargas (itens no total).")
+    arg_parser.add_argument('--feeds', type=int, default=9)
+    arg_parser.add_argument('--latencia-feed', type=float, default=0.0, help="Latência de cada feed (s).")
+    arg_parser.add_argument('--latencia-llm', type=float, default=0.0, help="Latência de cada chamada à IA (s).")
+    arg_parser.add_argument('--taxa-erro', type=float, default=0.0, help="Fração de chamadas à IA com erro 429/500.")
+    arg_parser.add_argument('--workers-feeds', type=int, default=8)
+    arg_parser.add_argument('--workers-llm', type=int, default=classificacao.MAX_WORKERS_PADRAO)
+    arg_parser.add_argument('--rpm', type=int, default=None, help="Limite de requisições por minuto simulado.")
+    arg_parser.add_argument('--tpm', type=int, default=None, help="Limite de tokens por minuto simulado.")
+    arg_parser.add_argument('--sem-classificacao', action='store_true')
+    arg_parser.add_argument('--memoria-por-etapa', action='store_true', help="Pico de alocações por etapa (tracemalloc).")
+    arg_parser.add_argument('--saida', default=None, help="Grava os resultados em JSON.")
+    args = arg_parser.parse_args()
+
+    if args.rpm or args.tpm:
+        classificacao._limitador = classificacao.LimitadorTaxa(
+            args.rpm or classificacao.RPM_PADRAO, args.tpm or classificacao.TPM_PADRAO
+        )
+
+    keywords = obter_registro(CSV_PADRAO)
+    resultados = []
+    for itens in args.itens:
+        resultado = executar_carga(
+            itens,
+            feeds=args.feeds,
+            latencia_feed=args.latencia_feed,
+            latencia_llm=args.latencia_llm,
+            taxa_erro=args.taxa_erro,
+            max_workers_feeds=args.workers_feeds,
+            max_workers_llm=args.workers_llm,
+            classificar=not args.sem_classificacao,
+            memoria_por_etapa=args.memoria_por_etapa,
+            keywords=keywords
+        )
+        imprimir_resultado(resultado)
+        resultados.append(resultado)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
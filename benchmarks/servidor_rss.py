@@ -0,0 +1,173 @@
+# servidor_rss.py
+"""
+Servidor HTTP local que simula os feeds RSS para benchmarks sem rede.
+
+Serve feeds sintéticos em /feed/<n>.xml (tamanho e latência configuráveis) ou,
+com `diretorio_fixtures`, reproduz arquivos XML gravados: /fixture/<arquivo>.
+Responde com ETag fixa por feed e devolve 304 para If-None-Match igual, como um
+servidor real, permitindo medir também o caminho do cache condicional.
+
+Uso isolado:
+    python -m benchmarks.servidor_rss --itens 500 --latencia 0.2 --porta 8001
+"""
+import os
+import time
+import random
+import hashlib
+import argparse
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+# Trechos usados para montar títulos; parte deles contém keywords da taxonomia
+_TRECHOS_RELEVANTES = [
+    "Alta da inflação pressiona o preço dos alimentos",
+    "IPCA de março mostra queda no preço do arroz",
+    "Preço do café dispara nos supermercados",
+    "Carnes e ovos puxam alta dos preços em São Paulo",
+    "Feijão e leite longa vida ficam mais baratos",
+    "Inflação de bebidas desacelera no trimestre",
+]
+_TRECHOS_NEUTROS = [
+    "Seleção vence amistoso e garante vaga",
+    "Chuvas causam alagamentos na capital",
+    "Congresso aprova projeto sobre educação",
+    "Nova vacina é testada em hospitais",
+    "Show reúne milhares de fãs no estádio",
+    "Polícia investiga assalto a banco",
+]
+
+
+def gerar_feed_rss(itens: int, semente: int = 0, fracao_relevante: float = 0.3, tamanho_descricao: int = 300) -> bytes:
+    """
+    Gera um feed RSS 2.0 sintético com `itens` itens; cerca de `fracao_relevante`
+    deles contém termos da taxonomia de alimentos e bebidas.
+    """
+    aleatorio = random.Random(semente)
+    base = datetime(2025, 3, 31, 12, 0, tzinfo=timezone(timedelta(hours=-3)))
+    partes = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Feed sintético</title>']
+    for i in range(itens):
+        trechos = _TRECHOS_RELEVANTES if aleatorio.random() < fracao_relevante else _TRECHOS_NEUTROS
+        titulo = f"{aleatorio.choice(trechos)} ({semente}-{i})"
+        descricao = " ".join(aleatorio.choice(_TRECHOS_NEUTROS) for _ in range(max(1, tamanho_descricao // 40)))
+        data = format_datetime(base - timedelta(minutes=i))
+        partes.append(
+            f"<item><title>{escape(titulo)}</title><link>https://exemplo.local/{semente}/{i}</link>"
+            f"<description>{escape(descricao)}</description><pubDate>{data}</pubDate></item>"
+        )
+    partes.append('</channel></rss>')
+    return "".join(partes).encode('utf-8')
+
+
+class ServidorRSS:
+    """
+    Servidor de feeds em uma thread de fundo.
+
+    Args:
+        feeds: Número de feeds sintéticos (/feed/0.xml ... /feed/<feeds-1>.xml).
+        itens_por_feed: Itens em cada feed sintético.
+        latencia: Atraso fixo de cada resposta, em segundos.
+        jitter: Atraso adicional aleatório máximo, em segundos.
+        diretorio_fixtures: Diretório com XMLs gravados, servidos em /fixture/<arquivo>.
+    """
+
+    def __init__(
+        self,
+        feeds: int = 9,
+        itens_por_feed: int = 100,
+        latencia: float = 0.0,
+        jitter: float = 0.0,
+        diretorio_fixtures: Optional[str] = None,
+        porta: int = 0
+    ):
+        self.feeds = feeds
+        self.latencia = latencia
+        self.jitter = jitter
+        self.diretorio_fixtures = diretorio_fixtures
+        self._corpos = {
+            f"/feed/{n}.xml": gerar_feed_rss(itens_por_feed, semente=n) for n in range(feeds)
+        }
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(servidor.latencia + random.uniform(0, servidor.jitter))
+                corpo = servidor._corpo(self.path)
+                if corpo is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha1(corpo).hexdigest()[:16] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def _corpo(self, caminho: str) -> Optional[bytes]:
+        if caminho in self._corpos:
+            return self._corpos[caminho]
+        if self.diretorio_fixtures and caminho.startswith('/fixture/'):
+            arquivo = os.path.join(self.diretorio_fixtures, os.path.basename(caminho))
+            if os.path.isfile(arquivo):
+                with open(arquivo, 'rb') as f:
+                    return f.read()
+        return None
+
+    @property
+    def url_base(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def urls(self) -> List[str]:
+        """
+        URLs de todos os feeds servidos (sintéticos e fixtures).
+        """
+        urls = [f"{self.url_base}/feed/{n}.xml" for n in range(self.feeds)]
+        if self.diretorio_fixtures and os.path.isdir(self.diretorio_fixtures):
+            urls += [
+                f"{self.url_base}/fixture/{nome}"
+                for nome in sorted(os.listdir(self.diretorio_fixtures)) if nome.endswith('.xml')
+            ]
+        return urls
+
+    def iniciar(self) -> 'ServidorRSS':
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Servidor local de feeds RSS sintéticos.")
+    arg_parser.add_argument('--feeds', type=int, default=9)
+    arg_parser.add_argument('--itens', type=int, default=100, help="Itens por feed.")
+    arg_parser.add_argument('--latencia', type=float, default=0.0)
+    arg_parser.add_argument('--jitter', type=float, default=0.0)
+    arg_parser.add_argument('--fixtures', default=None, help="Diretório com feeds XML gravados.")
+    arg_parser.add_argument('--porta', type=int, default=8001)
+    args = arg_parser.parse_args()
+
+    servidor = ServidorRSS(args.feeds, args.itens, args.latencia, args.jitter, args.fixtures, args.porta).iniciar()
+    print("Servindo:", *servidor.urls(), sep="\n  ")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.parar()
@@ -1,61 +1,115 @@
 import streamlit as st
 import pandas as pd
-import os
 from backend.utils import render_footer
+from backend.dados import buscar_noticias, contar_busca, intervalo_datas, noticias_periodo
+from backend.repositorio import DB_PADRAO, RepositorioNoticias
 
 st.set_page_config(page_title="Histórico de Inflação", layout="wide")
 st.title("Histórico de Inflação")
 
-csv_filepath = "data/noticias/noticias.csv"
+TAMANHOS_PAGINA = [10, 25, 50, 100]
 
-if os.path.exists(csv_filepath):
-    # Lê o CSV forçando todas as colunas como string
-    df = pd.read_csv(csv_filepath, dtype=str)
+PERGUNTA_2 = "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?"
+PERGUNTA_3 = "3. O artigo aborda especificamente a inflação de alimentos?"
+PERGUNTA_4 = "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?"
 
-    # Filtra apenas notícias onde "1. O artigo aborda o tema da inflação?" é "Sim"
-    col_inflacao = "1. O artigo aborda o tema da inflação?"
-    df = df[df[col_inflacao] == "Sim"]
 
-    # Conversão de datas e ordenação decrescente
-    df["pub_date"] = pd.to_datetime(df["pub_date"], errors="coerce", utc=True)
-    df["pub_date"] = df["pub_date"].dt.tz_convert("America/Sao_Paulo").dt.tz_localize(None)
-    df = df.sort_values(by="pub_date", ascending=False)
+# Abre a base (na primeira execução importa o antigo data/noticias/noticias.csv, se existir)
+repositorio = RepositorioNoticias(DB_PADRAO)
 
-    # Filtros de data (início e fim)
-    min_date = df["pub_date"].min()
-    max_date = df["pub_date"].max()
-    if pd.isna(min_date):
-        min_date = pd.to_datetime("2023-01-01")
-    if pd.isna(max_date):
-        max_date = pd.to_datetime("today")
+if repositorio.contar() > 0:
+    # Limites de datas sem carregar as notícias (metadados, no caso dos meses arquivados)
+    min_date, max_date = intervalo_datas(DB_PADRAO)
+    if min_date is None:
+        min_date = max_date = pd.Timestamp.today().date()
+
+    # Por padrão, só os meses ainda na base (os arquivados são lidos se o período os incluir)
+    inicio_quente = repositorio.inicio_quente()
+    padrao_inicio = max(min_date, inicio_quente) if inicio_quente else min_date
 
     st.write("### Filtrar por data de publicação")
-    start_date = st.date_input("Data de Início", value=min_date.date())
-    end_date = st.date_input("Data de Fim", value=max_date.date())
+    start_date = st.date_input("Data de Início", value=min(padrao_inicio, max_date))
+    end_date = st.date_input("Data de Fim", value=max_date)
+
+    st.write("### Buscar no histórico")
+    consulta = st.text_input(
+        "Palavras no título ou na descrição",
+        placeholder='ex.: arroz, "tarifa de energia", aliment*',
+        help="Acentos e maiúsculas são ignorados. Use aspas para frases e * para buscar por prefixo."
+    ).strip()
 
-    if start_date > end_date:
+    periodo_valido = start_date <= end_date
+    if not periodo_valido:
         st.warning("A data de início não pode ser maior que a data de fim.")
-    else:
-        mask = (df["pub_date"].dt.date >= start_date) & (df["pub_date"].dt.date <= end_date)
-        df = df[mask]
 
-    st.write(f"Exibindo {len(df)} notícias filtradas:")
+    # Paginação no servidor: só as notícias da página atual são enviadas ao navegador
+    col_tamanho, col_pagina, col_modo = st.columns([1, 1, 1])
+    with col_tamanho:
+        tamanho_pagina = st.selectbox("Notícias por página", TAMANHOS_PAGINA, index=1)
 
-    if len(df) == 0:
-        st.warning("Nenhuma notícia encontrada nesse intervalo de datas.")
+    if not periodo_valido:
+        # Nem a listagem nem a busca são feitas com um período inválido
+        total = 0
+    elif consulta:
+        # Busca no índice de texto completo, por relevância: só a página pedida é lida da base
+        total = contar_busca(consulta, start_date, end_date, DB_PADRAO)
+        st.write(f"{total} notícias encontradas para \"{consulta}\", da mais relevante para a menos relevante:")
     else:
-        for idx, row in df.iterrows():
-            with st.expander(f"{row['title']} ({row['pub_date']})", expanded=False):
-                st.markdown(f"**Título:** {row['title']}")
-                st.write(f"Data de publicação: {row['pub_date']}")
-                st.write(f"Link: {row['link']}")
-                st.write(f"Fonte: {row['feed_url']}")
-                st.write(f"Palavra-chave: {row['matched_keyword']}")
-                st.write(f"2. Perspectiva positiva (inflação geral)? {row.get('2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?', '')}")
-                st.write(f"3. Aborda especificamente inflação de alimentos? {row.get('3. O artigo aborda especificamente a inflação de alimentos?', '')}")
-                st.write(f"4. Perspectiva positiva (inflação alimentos)? {row.get('4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?', '')}")
+        # Visão já filtrada e ordenada, reaproveitada entre reruns com o mesmo período
+        # (trocar de página ou de modo de exibição não refaz a leitura)
+        df = noticias_periodo(start_date, end_date, DB_PADRAO)
+        total = len(df)
+        st.write(f"Exibindo {total} notícias filtradas:")
+
+    if total == 0:
+        if periodo_valido and consulta:
+            st.warning(f"Nenhuma notícia encontrada para \"{consulta}\" nesse intervalo de datas.")
+        elif periodo_valido:
+            st.warning("Nenhuma notícia encontrada nesse intervalo de datas.")
+    else:
+        total_paginas = max(1, -(-total // tamanho_pagina))
+        with col_pagina:
+            pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, value=1, step=1)
+        with col_modo:
+            modo_compacto = st.toggle("Modo compacto (tabela)", value=False)
+
+        inicio = (pagina - 1) * tamanho_pagina
+        if consulta:
+            df_pagina = buscar_noticias(consulta, start_date, end_date, pagina, tamanho_pagina, DB_PADRAO)
+        else:
+            df_pagina = df.iloc[inicio:inicio + tamanho_pagina].copy()
+        df_pagina["pub_date"] = df_pagina["pub_date"].dt.tz_localize(None)
+        st.caption(f"Notícias {inicio + 1} a {inicio + len(df_pagina)} de {total}")
+
+        if modo_compacto:
+            st.dataframe(
+                df_pagina[["pub_date", "title", "feed_url", "matched_keyword", PERGUNTA_2, PERGUNTA_3, PERGUNTA_4, "link"]],
+                column_config={
+                    "pub_date": st.column_config.DatetimeColumn("Data", format="DD/MM/YYYY HH:mm"),
+                    "title": "Título",
+                    "feed_url": "Fonte",
+                    "matched_keyword": "Palavra-chave",
+                    PERGUNTA_2: "2. Perspectiva geral",
+                    PERGUNTA_3: "3. Alimentos",
+                    PERGUNTA_4: "4. Perspectiva alimentos",
+                    "link": st.column_config.LinkColumn("Link"),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            for row in df_pagina.to_dict("records"):
+                with st.expander(f"{row['title']} ({row['pub_date']})", expanded=False):
+                    st.markdown(f"**Título:** {row['title']}")
+                    st.write(f"Data de publicação: {row['pub_date']}")
+                    st.write(f"Link: {row['link']}")
+                    st.write(f"Fonte: {row['feed_url']}")
+                    st.write(f"Palavra-chave: {row['matched_keyword']}")
+                    st.write(f"2. Perspectiva positiva (inflação geral)? {row.get(PERGUNTA_2, '')}")
+                    st.write(f"3. Aborda especificamente inflação de alimentos? {row.get(PERGUNTA_3, '')}")
+                    st.write(f"4. Perspectiva positiva (inflação alimentos)? {row.get(PERGUNTA_4, '')}")
 else:
-    st.error("Arquivo CSV de notícias não encontrado!")
+    st.error("Nenhuma notícia cadastrada na base!")
 
 
 # Exibe o rodapé chamando a função
@@ -1,12 +1,11 @@
 import streamlit as st
 from backend.services import (
-    load_keywords_from_csv, 
-    get_default_keywords, 
-    search_keywords_in_rss, 
-    classificar_artigo, 
+    buscar_e_classificar, 
     get_feed_name
 )
 
+from backend.palavras_chave import obter_registro
+from backend.pipeline import FimFeed
 from backend.utils import render_footer
 
 # Configura a página se necessário (opcional, pois o Streamlit configura automaticamente)
@@ -23,15 +22,10 @@ st.title("📰 Monitor de Notícias - Inflação de Alimentos")
 #     """
 # )
 
-# Carrega as keywords
+# Carrega as keywords (padrão + CSV da taxonomia); o matcher compilado é compartilhado
+# entre sessões e reruns, e só é remontado quando o conteúdo do CSV muda
 csv_path = "data/keywords/ipca_alimentacao_bebidas.csv"
-try:
-    additional_keywords = load_keywords_from_csv(csv_path)
-except Exception as e:
-    additional_keywords = []
-
-default_keywords = get_default_keywords()
-keywords = list(set(default_keywords + additional_keywords))
+keywords = obter_registro(csv_path)
 
 # Lista de Feeds
 rss_feeds = [
@@ -46,50 +40,68 @@ rss_feeds = [
     'https://economia.ig.com.br/rss.xml',
 ]
 
+PERGUNTA_1 = "1. O artigo aborda o tema da inflação?"
+
+
+def exibir_artigo(i):
+    st.markdown(f"**Título:** {i['title']}")
+    st.write(f"Link: {i['link']}")
+    st.write(f"Fonte: {i['feed_url']}")
+    st.write(f"Data de publicação: {i['pub_date']}")
+    palavras = (i.get('matched_keywords') or i['matched_keyword']).split("; ")
+    niveis = (i.get('matched_levels') or "").split("; ")
+    if len(niveis) == len(palavras):
+        palavras = [f"{palavra} ({nivel})" for palavra, nivel in zip(palavras, niveis)]
+    st.write(f"Palavras-chave: {'; '.join(palavras)}")
+    st.write(f"1. O artigo aborda o tema da inflação? {i['1. O artigo aborda o tema da inflação?']}")
+    st.write(f"2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral? {i['2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?']}")
+    st.write(f"3. O artigo aborda especificamente a inflação de alimentos? {i['3. O artigo aborda especificamente a inflação de alimentos?']}")
+    st.write(f"4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor? {i['4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?']}")
+    st.write("---")
+
+
 if st.button("🔍 Buscar Notícias"):
     message_placeholder = st.empty()
     message_placeholder.info("Buscando notícias, por favor aguarde...")
+    resumo_placeholder = st.empty()
+
+    # Os resultados chegam aos poucos (backend/pipeline.py): cada notícia é exibida no
+    # grupo do seu veículo assim que é classificada, sem esperar pelos demais feeds.
+    # A mesma matéria publicada em vários feeds é classificada uma única vez.
+    expanders = {}
+    encontrados = {}
+    total = 0
+    filtered_count = 0
+    for evento in buscar_e_classificar(rss_feeds, keywords):
+        if isinstance(evento, FimFeed):
+            feed_name = get_feed_name(evento.feed_url)
+            if feed_name in expanders and not encontrados[feed_name]:
+                with expanders[feed_name]:
+                    st.warning("Nenhuma notícia sobre inflação de alimentos encontrada.")
+                encontrados[feed_name] = None  # aviso já exibido
+            continue
+
+        total += 1
+        feed_name = get_feed_name(evento['feed_url'])
+        if feed_name not in expanders:
+            expanders[feed_name] = st.expander(feed_name, expanded=False)
+            encontrados[feed_name] = False
+        if evento.get(PERGUNTA_1) == "Sim":
+            filtered_count += 1
+            encontrados[feed_name] = True
+            with expanders[feed_name]:
+                exibir_artigo(evento)
+        resumo_placeholder.info(
+            f"{total} notícias relevantes encontradas até agora; {filtered_count} abordam a inflação de alimentos."
+        )
 
-    resultados = search_keywords_in_rss(rss_feeds, keywords)
-    
-    # Chamada da classificação para aprimorar os artigos
-    for item in resultados:
-        item = classificar_artigo(item)
-    
     message_placeholder.empty()
+    resumo_placeholder.empty()
 
-    if resultados:
-        total = len(resultados)
-        filtered_count = sum(1 for artigo in resultados if artigo.get("1. O artigo aborda o tema da inflação?") == "Sim")
-        st.success(
+    if total:
+        message_placeholder.success(
             f"Encontramos {total} notícias relevantes e nossa IA selecionou com precisão as {filtered_count} que realmente abordam a inflação de alimentos!"
         )
-        # Agrupamento por veículo
-        grouped_results = {}
-        for item in resultados:
-            feed_name = get_feed_name(item['feed_url'])
-            if feed_name not in grouped_results:
-                grouped_results[feed_name] = []
-            grouped_results[feed_name].append(item)
-        # Exibe os resultados de forma organizada
-        for feed_name, items in grouped_results.items():
-            with st.expander(feed_name, expanded=False):
-                found = False
-                for i in items:
-                    if i.get("1. O artigo aborda o tema da inflação?") == "Sim":
-                        found = True
-                        st.markdown(f"**Título:** {i['title']}")
-                        st.write(f"Link: {i['link']}")
-                        st.write(f"Fonte: {i['feed_url']}")
-                        st.write(f"Data de publicação: {i['pub_date']}")
-                        st.write(f"Palavra-chave: {i['matched_keyword']}")
-                        st.write(f"1. O artigo aborda o tema da inflação? {i['1. O artigo aborda o tema da inflação?']}")
-                        st.write(f"2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral? {i['2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?']}")
-                        st.write(f"3. O artigo aborda especificamente a inflação de alimentos? {i['3. O artigo aborda especificamente a inflação de alimentos?']}")
-                        st.write(f"4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor? {i['4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?']}")
-                        st.write("---")
-                if not found:
-                    st.warning("Nenhuma notícia sobre inflação de alimentos encontrada.")
 
 
 # Exibe o rodapé chamando a função
@@ -0,0 +1,92 @@
+import streamlit as st
+import pandas as pd
+from backend.utils import render_footer
+from backend.dados import agregados_sentimento, intervalo_datas
+from backend.repositorio import DB_PADRAO
+from backend.services import get_feed_name
+
+st.set_page_config(page_title="Tendências de Inflação", layout="wide")
+st.title("Tendências de Inflação")
+
+PERGUNTA_2 = "2. O artigo apresenta uma perspectiva positiva para a economia, indicando uma queda na inflação geral?"
+PERGUNTA_4 = "4. O artigo apresenta uma perspectiva positiva para a inflação dos alimentos, indicando uma queda nesse setor?"
+PERGUNTAS_TENDENCIA = {
+    "Inflação geral (pergunta 2)": PERGUNTA_2,
+    "Inflação de alimentos (pergunta 4)": PERGUNTA_4,
+}
+RESPOSTAS = ["Sim", "Não", "Não se aplica"]
+
+st.markdown(
+    "Respostas da IA às perguntas de perspectiva, ao longo do tempo. O **índice de perspectiva positiva** "
+    "é a fração de \"Sim\" entre as notícias que responderam \"Sim\" ou \"Não\" (as que não se aplicam ficam de fora)."
+)
+
+# Os gráficos leem só a tabela de agregados (uma linha por dia, feed e resposta),
+# nunca a tabela de notícias
+data_inicial, data_final = intervalo_datas(DB_PADRAO)
+
+if not data_inicial or not data_final:
+    st.info("Nenhuma notícia classificada na base.")
+else:
+    col_inicio, col_fim, col_periodo = st.columns(3)
+    with col_inicio:
+        data_inicio = st.date_input("Data inicial", value=data_inicial, min_value=data_inicial, max_value=data_final)
+    with col_fim:
+        data_fim = st.date_input("Data final", value=data_final, min_value=data_inicial, max_value=data_final)
+    with col_periodo:
+        semanal = st.radio("Agrupar por", ["Dia", "Semana"], index=1, horizontal=True) == "Semana"
+
+    if data_inicio > data_fim:
+        st.warning("A data de início não pode ser maior que a data de fim.")
+    else:
+        agregados = agregados_sentimento(data_inicio, data_fim, semanal, DB_PADRAO)
+        agregados["veiculo"] = agregados["feed_url"].map(get_feed_name)
+
+        col_pergunta, col_veiculos = st.columns([1, 2])
+        with col_pergunta:
+            rotulo = st.selectbox("Pergunta", list(PERGUNTAS_TENDENCIA))
+        veiculos = sorted(agregados["veiculo"].unique())
+        with col_veiculos:
+            selecionados = st.multiselect("Veículos", veiculos, default=veiculos)
+
+        df = agregados[(agregados["pergunta"] == PERGUNTAS_TENDENCIA[rotulo]) & agregados["veiculo"].isin(selecionados)]
+        if df.empty:
+            st.warning("Nenhuma notícia classificada nesse período.")
+        else:
+            # Período x resposta
+            contagens = (
+                df.pivot_table(index="data", columns="resposta", values="contagem", aggfunc="sum", fill_value=0)
+                .reindex(columns=RESPOSTAS, fill_value=0)
+            )
+            contagens.index = pd.to_datetime(contagens.index)
+            avaliadas = contagens["Sim"] + contagens["Não"]
+            indice = (contagens["Sim"] / avaliadas.where(avaliadas > 0)).rename("Índice de perspectiva positiva")
+
+            total_sim, total_avaliadas = contagens["Sim"].sum(), avaliadas.sum()
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("Notícias classificadas", int(contagens.to_numpy().sum()))
+            col_b.metric("Perspectiva positiva (Sim)", int(total_sim))
+            col_c.metric(
+                "Índice no período",
+                f"{total_sim / total_avaliadas:.0%}" if total_avaliadas else "—"
+            )
+
+            st.write("### Índice de perspectiva positiva")
+            st.line_chart(indice, y_label="Fração de \"Sim\"")
+
+            st.write("### Respostas por período")
+            st.bar_chart(contagens, y_label="Notícias")
+
+            st.write("### Índice por veículo")
+            por_veiculo = df.pivot_table(index="veiculo", columns="resposta", values="contagem", aggfunc="sum", fill_value=0)
+            por_veiculo = por_veiculo.reindex(columns=RESPOSTAS, fill_value=0)
+            avaliadas_veiculo = por_veiculo["Sim"] + por_veiculo["Não"]
+            por_veiculo["Índice"] = por_veiculo["Sim"] / avaliadas_veiculo.where(avaliadas_veiculo > 0)
+            st.dataframe(
+                por_veiculo.sort_values("Índice", ascending=False),
+                column_config={"Índice": st.column_config.ProgressColumn("Índice", min_value=0, max_value=1, format="%.2f")},
+                use_container_width=True
+            )
+
+# Exibe o rodapé chamando a função
+render_footer()
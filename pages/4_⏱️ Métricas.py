@@ -0,0 +1,99 @@
+import streamlit as st
+from backend.utils import render_footer
+from backend.metricas import ler_historico, tabelas_historico
+from backend.services import get_feed_name
+
+st.set_page_config(page_title="Métricas da Coleta", layout="wide")
+st.title("Métricas da Coleta")
+
+st.markdown(
+    "Tempo de cada etapa das execuções de `backend/atualiza_noticias.py` (coleta, inserção e classificação), "
+    "com os detalhes por feed e das chamadas à API. As métricas são gravadas em `data/metricas/` ao fim de cada execução."
+)
+
+COLUNAS_FEED = {
+    "busca_segundos": "Download (s)",
+    "bytes": "Bytes",
+    "status_http": "Status HTTP",
+    "itens": "Itens",
+    "parse_segundos": "Parse (s)",
+    "correspondencias": "Com keywords",
+    "keywords_segundos": "Keywords (s)",
+    "erros": "Erros",
+}
+COLUNAS_API = {
+    "llm_chamadas": "Chamadas",
+    "llm_novas_tentativas": "Novas tentativas",
+    "llm_erros": "Erros",
+    "llm_latencia_segundos": "Latência total (s)",
+    "llm_espera_limitador_segundos": "Espera no limitador (s)",
+    "llm_espera_backoff_segundos": "Espera entre tentativas (s)",
+    "llm_tokens_prompt": "Tokens de prompt",
+    "llm_tokens_resposta": "Tokens de resposta",
+}
+
+por_execucao, por_feed = tabelas_historico(ler_historico())
+
+if por_execucao.empty:
+    st.info("Nenhuma execução registrada ainda. Rode `python -m backend.atualiza_noticias` para gerar as métricas.")
+else:
+    tipos = sorted(por_execucao["execucao"].unique())
+    tipo = st.selectbox("Execução", tipos, index=tipos.index("atualizacao") if "atualizacao" in tipos else 0)
+    execucoes = por_execucao[por_execucao["execucao"] == tipo].set_index("inicio").sort_index()
+    feeds = por_feed[por_feed["execucao"] == tipo] if not por_feed.empty else por_feed
+
+    ultima = execucoes.iloc[-1]
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("Execuções registradas", len(execucoes))
+    col_b.metric("Duração da última (s)", f"{ultima['duracao_segundos']:.1f}")
+    col_c.metric("Duração mediana (s)", f"{execucoes['duracao_segundos'].median():.1f}")
+
+    # Onde cada execução gastou o tempo
+    etapas = [c for c in execucoes.columns if c.startswith("etapa:")]
+    if etapas:
+        st.write("### Tempo por etapa")
+        tempos = execucoes[etapas].fillna(0).rename(columns=lambda c: c.split(":", 1)[1])
+        st.bar_chart(tempos, y_label="Segundos")
+
+    colunas_api = [c for c in COLUNAS_API if c in execucoes.columns]
+    if colunas_api:
+        api = execucoes[colunas_api].fillna(0)
+        st.write("### Chamadas à API")
+        tokens = [c for c in ("llm_tokens_prompt", "llm_tokens_resposta") if c in api]
+        ultima_api = api.iloc[-1]
+        if ultima_api.get("llm_chamadas", 0) > 0:
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("Latência média na última (s)", f"{ultima_api['llm_latencia_segundos'] / ultima_api['llm_chamadas']:.2f}")
+            col_b.metric("Tokens na última", int(ultima_api[tokens].sum()))
+            col_c.metric("Novas tentativas na última", int(ultima_api.get("llm_novas_tentativas", 0)))
+        tempos_api = [c for c in ("llm_latencia_segundos", "llm_espera_limitador_segundos", "llm_espera_backoff_segundos") if c in api]
+        if tempos_api:
+            st.bar_chart(api[tempos_api].rename(columns=COLUNAS_API), y_label="Segundos")
+        if tokens:
+            st.bar_chart(api[tokens].rename(columns=COLUNAS_API), y_label="Tokens")
+        with st.expander("Tabela das chamadas por execução"):
+            st.dataframe(api.rename(columns=COLUNAS_API).sort_index(ascending=False), use_container_width=True)
+
+    if not feeds.empty:
+        feeds = feeds.assign(veiculo=feeds["feed_url"].map(get_feed_name))
+
+        ultimos = feeds[feeds["inicio"] == feeds["inicio"].max()].set_index("veiculo")
+        colunas = [c for c in COLUNAS_FEED if c in ultimos.columns]
+        # Sem nenhuma coluna conhecida (ex.: todos os feeds responderam 304), não há tabela
+        if colunas:
+            st.write("### Feeds na última execução")
+            st.dataframe(
+                ultimos[colunas].rename(columns=COLUNAS_FEED).sort_values(COLUNAS_FEED[colunas[0]], ascending=False),
+                use_container_width=True
+            )
+
+        if "busca_segundos" in feeds.columns:
+            st.write("### Latência do download por feed")
+            latencias = feeds.pivot_table(index="inicio", columns="veiculo", values="busca_segundos", aggfunc="sum")
+            st.line_chart(latencias, y_label="Segundos")
+
+    with st.expander("Totais por execução"):
+        st.dataframe(execucoes.drop(columns=["execucao"]).sort_index(ascending=False), use_container_width=True)
+
+# Exibe o rodapé chamando a função
+render_footer()
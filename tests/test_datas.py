@@ -0,0 +1,51 @@
+from datetime import timezone
+
+from dateutil import parser as date_parser
+
+from backend.datas import interpretar_data, normalizar
+
+DATAS = [
+    "Mon, 31 Mar 2025 16:30:00 -0300",
+    "Mon, 31 Mar 2025 16:30:00 +0000",
+    "Mon, 31 Mar 2025 16:30:00 GMT",
+    "31 Mar 2025 16:30:00 -0300",
+    "Tue, 1 Apr 2025 08:05:09 +0100",
+    "2025-03-31T16:30:00-03:00",
+    "2025-03-31T19:30:00Z",
+    "2025-03-31T16:30:00.123456-03:00",
+    "2025-03-31T16:30:00",
+    "2025-03-31 16:30:00",
+    "2025-03-31",
+    "31/03/2025 16:30",
+    "March 31, 2025 4:30 PM",
+    "Mon, 31 Mar 2025 4:30 PM -0300",
+    "Mon, 31 Mar 2025 16:30:00 -03:00",
+    "Monday, 31 March 2025 16:30:00",
+    "  Mon, 31 Mar 2025 16:30:00 -0300  ",
+]
+
+
+def _dateutil(texto):
+    # Implementação anterior: dateutil para todas as datas, sem fuso tratado como UTC
+    dt = date_parser.parse(texto)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def test_interpretar_data_equivale_ao_dateutil():
+    for texto in DATAS:
+        assert interpretar_data(texto) == _dateutil(texto), texto
+
+
+def test_formato_lembrado_por_feed_nao_altera_o_resultado():
+    # O mesmo feed alternando formatos: o formato lembrado só muda a ordem das tentativas
+    for texto in DATAS + DATAS[::-1]:
+        assert interpretar_data(texto, 'https://exemplo.com.br/rss') == _dateutil(texto), texto
+
+
+def test_normalizar():
+    data, pub_ts = normalizar("Mon, 31 Mar 2025 16:30:00 -0300")
+    assert data == "2025-03-31T16:30:00-03:00"
+    assert pub_ts == int(_dateutil("2025-03-31T19:30:00Z").timestamp())
+    assert normalizar("data inválida") == ("data inválida", None)
+    assert normalizar("") == ("", None)
+    assert normalizar(None) == ("", None)
@@ -0,0 +1,62 @@
+import random
+
+from backend.duplicatas import (
+    BITS, DISTANCIA_MAXIMA, AgrupadorDuplicatas, bandas, de_sqlite, distancia, para_sqlite, simhash
+)
+
+MATERIA = "IPCA sobe 0,5% em março puxado por alimentos e energia elétrica, aponta IBGE"
+REPUBLICADA = "IPCA sobe 0,5% em março, puxado por alimentos e energia, aponta o IBGE"
+OUTRAS = [
+    "Banco Central mantém taxa Selic em 10,5% ao ano pela terceira reunião seguida",
+    "Preço do café dispara no atacado e deve chegar às gôndolas em abril",
+]
+
+
+def test_simhash_aproxima_a_mesma_materia_e_separa_as_demais():
+    assert simhash(MATERIA) == simhash(MATERIA.upper())
+    assert distancia(simhash(MATERIA), simhash(REPUBLICADA)) <= DISTANCIA_MAXIMA
+    for outra in OUTRAS:
+        assert distancia(simhash(MATERIA), simhash(outra)) > DISTANCIA_MAXIMA
+    assert simhash("") == 0
+
+
+def test_impressoes_proximas_sempre_compartilham_uma_banda():
+    sorteio = random.Random(7)
+    for _ in range(2000):
+        impressao = sorteio.getrandbits(BITS)
+        vizinha = impressao
+        for bit in sorteio.sample(range(BITS), sorteio.randint(0, DISTANCIA_MAXIMA)):
+            vizinha ^= 1 << bit
+        assert set(bandas(impressao)) & set(bandas(vizinha))
+
+
+def test_bandas_cobrem_todos_os_bits():
+    impressao = random.Random(3).getrandbits(BITS)
+    remontada, deslocamento = 0, 0
+    for banda, valor in bandas(impressao):
+        remontada |= valor << deslocamento
+        deslocamento = (banda + 1) * (BITS // (DISTANCIA_MAXIMA + 1))
+    assert remontada == impressao
+
+
+def test_conversao_para_o_inteiro_com_sinal_do_sqlite():
+    for impressao in (0, 1, (1 << 63) - 1, 1 << 63, (1 << BITS) - 1):
+        valor = para_sqlite(impressao)
+        assert -(1 << 63) <= valor < 1 << 63
+        assert de_sqlite(valor) == impressao
+
+
+def test_agrupador_equivale_a_comparar_com_todas_as_representantes():
+    textos = [MATERIA, OUTRAS[0], REPUBLICADA, OUTRAS[1], MATERIA + " hoje", OUTRAS[0].replace("10,5%", "10,50%")]
+    agrupador = AgrupadorDuplicatas()
+    representantes = []
+    for posicao, texto in enumerate(textos):
+        impressao = simhash(texto)
+        # Força bruta: a primeira representante a até DISTANCIA_MAXIMA bits
+        esperado = next(
+            (r for r in representantes if distancia(impressao, simhash(textos[r])) <= DISTANCIA_MAXIMA), posicao
+        )
+        if esperado == posicao:
+            representantes.append(posicao)
+        assert agrupador.adicionar({'title': texto, 'description': ''}) == esperado
+    assert representantes == [0, 1, 3]
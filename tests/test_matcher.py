@@ -0,0 +1,51 @@
+import json
+import random
+import re
+
+from backend.matcher import MatcherPalavrasChave
+
+KEYWORDS = [
+    "inflação", "preço", "preço dos alimentos", "alimentos", "IPCA", "IPCA-15", "ipc",
+    "arroz", "arroz integral", "feijão", "c++", "juros", "taxa de juros", "a", "ação",
+]
+
+
+def _regex(keywords, texto):
+    # Implementação anterior: uma expressão regular com \b por keyword
+    return [
+        keyword for keyword in keywords
+        if re.search(rf'\b{re.escape(keyword.lower())}\b', texto, re.IGNORECASE)
+    ]
+
+
+def test_buscar_equivale_as_expressoes_regulares_com_fronteira_de_palavra():
+    matcher = MatcherPalavrasChave(KEYWORDS)
+    textos = [
+        "Alta da inflação pressiona o preço dos alimentos",
+        "IPCA-15 sobe; IPCA de março e IPC-Fipe recuam",
+        "Arroz integral e feijão: preços sobem (inflacionário?)",
+        "Taxa de juros e c++ em ação a partir de hoje",
+        "precificação, açãozinha e reação não são keywords",
+        "",
+    ]
+    # Textos aleatórios com pedaços das keywords, pontuação e espaços
+    pedacos = ["infla", "ção", "preço", " dos ", "alimentos", "IPCA", "-15", "ipc", "arroz", " integral",
+               "c++", "juros", "taxa de ", "a", "ação", " ", ", ", ".", "-", "_", "x", "1"]
+    sorteio = random.Random(42)
+    textos += ["".join(sorteio.choice(pedacos) for _ in range(sorteio.randint(1, 30))) for _ in range(500)]
+
+    for texto in textos:
+        assert matcher.buscar(texto) == _regex(matcher.keywords, texto), texto
+
+
+def test_dobrar_acentos():
+    matcher = MatcherPalavrasChave(["inflação", "feijão"], dobrar_acentos=True)
+    assert matcher.buscar("Inflacao do FEIJAO") == ["inflação", "feijão"]
+    assert MatcherPalavrasChave(["inflação"]).buscar("inflacao") == []
+
+
+def test_como_dict_e_de_dict_preservam_as_buscas():
+    matcher = MatcherPalavrasChave(KEYWORDS)
+    copia = MatcherPalavrasChave.de_dict(json.loads(json.dumps(matcher.como_dict())))
+    texto = "IPCA-15 e taxa de juros: preço dos alimentos sobe"
+    assert copia.buscar(texto) == matcher.buscar(texto)
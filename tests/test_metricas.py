@@ -0,0 +1,24 @@
+import threading
+import time
+
+from backend import metricas
+from backend.classificacao import classificar_em_paralelo
+
+
+def test_no_contexto_registra_na_mesma_execucao_em_varias_threads():
+    artigos = [{'id': i} for i in range(20)]
+    threads = set()
+
+    def classificar(artigo):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        metricas.somar(classificados=1)
+        return {'id': artigo['id']}
+
+    with metricas.execucao('teste', diretorio=None) as execucao:
+        resultados = dict(classificar_em_paralelo(artigos, classificar, max_workers=4))
+
+    assert sorted(resultados) == list(range(20))
+    assert all(resultados[i] == {'id': i} for i in resultados)
+    assert len(threads) > 1
+    assert execucao.totais['classificados'] == 20
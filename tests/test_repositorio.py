@@ -0,0 +1,109 @@
+import os
+from datetime import date
+
+from backend.arquivo import NOME_ARQUIVO
+from backend.repositorio import PERGUNTAS, RepositorioNoticias
+
+HOJE = date(2026, 10, 18)
+FEED = 'https://exemplo.com.br/rss'
+
+
+def _noticia(titulo, descricao, pub_date, respostas=("Sim", "Não", "Sim", "Não")):
+    noticia = {
+        'title': titulo,
+        'description': descricao,
+        'link': "https://exemplo.com.br/" + titulo.lower().replace(" ", "-"),
+        'pub_date': pub_date,
+        'feed_url': FEED,
+        'matched_keyword': 'inflação',
+        'matched_keywords': 'inflação',
+    }
+    noticia.update(zip(PERGUNTAS, respostas))
+    return noticia
+
+
+# Meses antigos (arquivados com 3 meses quentes em HOJE), um mês recente e uma pendente antiga
+NOTICIAS = [
+    _noticia("Inflação do arroz acelera em janeiro", "Preço do arroz sobe no IPCA", "Mon, 13 Jan 2025 10:00:00 -0300"),
+    _noticia("Feijão fica mais barato", "Queda no preço do feijão alivia a inflação", "Wed, 15 Jan 2025 09:00:00 -0300",
+             ("Sim", "Sim", "Sim", "Sim")),
+    _noticia("Campeonato começa no domingo", "Times se preparam", "Mon, 10 Feb 2025 20:00:00 -0300",
+             ("Não", "Não se aplica", "Não se aplica", "Não se aplica")),
+    _noticia("Energia pesa na inflação de fevereiro", "Conta de luz e IPCA", "Thu, 20 Feb 2025 11:00:00 -0300",
+             ("Sim", "Não", "Não", "Não se aplica")),
+    _noticia("Inflação de outubro desacelera", "IPCA de alimentos recua", "Wed, 14 Oct 2026 08:00:00 -0300",
+             ("Sim", "Sim", "Sim", "Sim")),
+    _noticia("Arroz volta a subir", "Inflação de alimentos pendente de análise", "Tue, 14 Jan 2025 12:00:00 -0300",
+             ("", "", "", "")),
+]
+
+
+def _estado(repositorio):
+    noticias = repositorio.consultar().sort_values('title', ignore_index=True)
+    busca = repositorio.buscar("inflação", limite=100)
+    return {
+        'contar': repositorio.contar(),
+        'noticias': noticias.drop(columns='pub_ts').to_dict('records'),
+        'busca': sorted(busca['title']),
+        'contar_busca': repositorio.contar_busca("inflação"),
+        'busca_arroz': sorted(repositorio.buscar("arroz")['title']),
+        'agregados': repositorio.agregados_sentimento().sort_values(
+            ['data', 'feed_url', 'pergunta', 'resposta'], ignore_index=True
+        ).to_dict('records'),
+        'frequencias': repositorio.frequencias_palavras(),
+        'intervalo': repositorio.intervalo_datas(),
+    }
+
+
+def _modificacoes(repositorio):
+    # Instante da última gravação de cada partição mensal do Parquet
+    return {
+        mes: os.stat(os.path.join(repositorio.arquivo.diretorio, f"mes={mes}", NOME_ARQUIVO)).st_mtime_ns
+        for mes in repositorio.arquivo.meses()
+    }
+
+
+def _repositorio(tmp_path):
+    repositorio = RepositorioNoticias(os.path.join(tmp_path, 'noticias.db'), csv_legado=None)
+    assert repositorio.inserir([dict(n) for n in NOTICIAS]) == len(NOTICIAS)
+    return repositorio
+
+
+def test_compactar_preserva_consultas_busca_e_agregados(tmp_path):
+    repositorio = _repositorio(tmp_path)
+    antes = _estado(repositorio)
+
+    # As quatro classificadas de 2025 vão para o Parquet; a pendente e a recente ficam na base
+    assert repositorio.compactar(meses_quentes=3, hoje=HOJE) == 4
+    assert repositorio.arquivo.meses() == ['2025-01', '2025-02']
+    assert repositorio.inicio_quente() == date(2026, 8, 1)
+
+    assert _estado(repositorio) == antes
+    assert antes['contar'] == 6 and antes['contar_busca'] == 5
+
+
+def test_consultar_periodo_arquivado_le_do_parquet(tmp_path):
+    repositorio = _repositorio(tmp_path)
+    repositorio.compactar(meses_quentes=3, hoje=HOJE)
+
+    fevereiro = repositorio.consultar(date(2025, 2, 1), date(2025, 2, 28))
+    assert list(fevereiro['title']) == ["Energia pesa na inflação de fevereiro", "Campeonato começa no domingo"]
+    apenas_inflacao = repositorio.consultar(date(2025, 1, 1), date(2025, 2, 28), apenas_inflacao=True)
+    assert sorted(apenas_inflacao['title']) == [
+        "Energia pesa na inflação de fevereiro", "Feijão fica mais barato", "Inflação do arroz acelera em janeiro",
+    ]
+
+
+def test_inserir_noticias_arquivadas_e_compactar_de_novo_nao_alteram_nada(tmp_path):
+    repositorio = _repositorio(tmp_path)
+    repositorio.compactar(meses_quentes=3, hoje=HOJE)
+    depois = _estado(repositorio)
+    arquivos = _modificacoes(repositorio)
+
+    # As notícias arquivadas voltam nos feeds (ou na migração do CSV): não são reinseridas
+    assert repositorio.inserir([dict(n) for n in NOTICIAS[:4]]) == 0
+    # A segunda compactação não tem o que mover
+    assert repositorio.compactar(meses_quentes=3, hoje=HOJE) == 0
+
+    assert _estado(repositorio) == depois
+    assert _modificacoes(repositorio) == arquivos